@@ -29,6 +29,7 @@ from wagtail.test.testapp.models import (
 )
 from wagtail.test.utils import Page, PageFixturesMixin
 from wagtail.users.models import UserProfile
+from wagtail.view_restriction_table import invalidate_view_restriction_table
 
 from .utils import AdminAPITestCase
 
@@ -142,6 +143,9 @@ class TestAdminPageListing(AdminAPITestCase, TestPageListing):
     # Not applicable to the admin API
     test_unpublished_pages_dont_appear_in_list = None
     test_private_pages_dont_appear_in_list = None
+    test_private_pages_with_password_passed = None
+    test_private_pages_after_restriction_change = None
+    test_private_pages_without_restriction_table_invalidation = None
 
     def test_unpublished_pages_appear_in_list(self):
         total_count = get_total_page_count()
@@ -187,6 +191,9 @@ class TestAdminPageListing(AdminAPITestCase, TestPageListing):
     # Not applicable to the admin API
     test_parent_field_gives_error = None
 
+    # The admin API's own meta fields (such as status) are fetched per page
+    test_fields_related_objects_fetched_in_bulk = None
+
     def test_fields(self):
         response = self.get_response(
             type="demosite.BlogEntryPage", fields="title,date,feed_image"
@@ -1204,6 +1211,21 @@ class TestAdminPageListingSearch(AdminAPITestCase, TestPageListingSearch):
     def get_homepage(self):
         return Page.objects.get(slug="home-page")
 
+    def test_search_with_multiple_private_sections(self):
+        # The restrictions are deleted without signals when the test ends
+        self.addCleanup(invalidate_view_restriction_table)
+        for page_id in [16, 19]:
+            Page.objects.get(id=page_id).view_restrictions.create(
+                restriction_type="login"
+            )
+
+        response = self.get_response(search="blog")
+        content = json.loads(response.content.decode("UTF-8"))
+        page_id_list = self.get_page_id_list(content)
+
+        # Private pages are listed in the admin API
+        self.assertEqual(set(page_id_list), {5, 16, 18, 19})
+
 
 class TestAdminPageDetailWithStreamField(PageFixturesMixin, AdminAPITestCase, TestCase):
     fixtures = ["test.json"]
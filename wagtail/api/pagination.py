@@ -0,0 +1,200 @@
+import datetime
+import decimal
+import uuid
+
+from django.core import signing
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import F, Q, QuerySet
+
+
+class KeysetPaginator:
+    """
+    Paginates a queryset by keyset (also known as cursor pagination).
+
+    Rather than skipping over all the items before the requested page with
+    an offset, each page is found by filtering on the position of the last
+    item of the previous page, which is passed between requests as an opaque,
+    signed cursor. This costs the same at any depth as long as the queryset
+    is ordered by an indexed field.
+
+    The queryset must be ordered by a single indexed field, optionally
+    followed by its primary key, or by nothing (which orders by the primary
+    key). Items with the same value for the field are ordered by their primary
+    key, and null values are ordered after all others.
+
+    Shared by the v2 and v3 APIs.
+    """
+
+    salt = "wagtail.api.pagination.KeysetPaginator"
+
+    def __init__(self, queryset):
+        if not isinstance(queryset, QuerySet):
+            raise ValueError("cursor pagination is not supported with search")
+
+        self.queryset = queryset
+        self.model = queryset.model
+        self.pk_field = self.model._meta.pk
+        self.field, self.descending = self.get_ordering()
+
+    def get_ordering(self):
+        """
+        Return the field that the queryset is ordered by and whether it is in
+        descending order, or raise ``ValueError`` if the ordering can't be used
+        for cursor pagination.
+        """
+        query = self.queryset.query
+        ordering = list(query.order_by)
+        if not ordering and query.default_ordering:
+            ordering = list(self.model._meta.ordering)
+
+        if any(item == "?" for item in ordering):
+            raise ValueError("random ordering with a cursor is not supported")
+
+        fields = []
+        for item in ordering:
+            if not isinstance(item, str):
+                raise ValueError(
+                    "cursor pagination is not supported with this ordering"
+                )
+
+            descending = item.startswith("-")
+            name = item.lstrip("-")
+            try:
+                field = (
+                    self.pk_field if name == "pk" else self.model._meta.get_field(name)
+                )
+            except FieldDoesNotExist as e:
+                raise ValueError(
+                    f"cannot use a cursor when ordering by '{item}'"
+                ) from e
+            fields.append((field, descending))
+
+        if not fields:
+            return self.pk_field, False
+
+        # Allow the primary key as a tie-breaker, as long as it's in the same
+        # direction as the one it would be given anyway
+        field, descending = fields[0]
+        if len(fields) > 2 or (
+            len(fields) == 2
+            and not (fields[1][0].primary_key and fields[1][1] == descending)
+        ):
+            raise ValueError(
+                "cursor pagination only supports ordering by a single field"
+            )
+
+        if not self.is_indexed(field):
+            raise ValueError(
+                f"cannot use a cursor when ordering by '{field.name}' "
+                "(field is not indexed)"
+            )
+
+        return field, descending
+
+    def is_indexed(self, field):
+        if not field.concrete or field.is_relation:
+            return False
+        if field.primary_key or field.unique or field.db_index:
+            return True
+        return any(
+            index.fields and index.fields[0].lstrip("-") == field.name
+            for index in field.model._meta.indexes
+        )
+
+    @property
+    def order_key(self):
+        return ("-" if self.descending else "") + self.field.name
+
+    def get_ordered_queryset(self):
+        name = self.field.name
+        pk_ordering = "-pk" if self.descending else "pk"
+
+        if self.field.primary_key:
+            return self.queryset.order_by(pk_ordering)
+
+        if self.field.null:
+            # Put null values last, so that they can be picked up after all
+            # the others whichever database is used
+            if self.descending:
+                ordering = F(name).desc(nulls_first=True)
+            else:
+                ordering = F(name).asc(nulls_last=True)
+        else:
+            ordering = ("-" if self.descending else "") + name
+
+        return self.queryset.order_by(ordering, pk_ordering)
+
+    def get_position_q(self, value, pk):
+        """
+        Return a ``Q`` object matching the items after the item with the given
+        field value and primary key.
+        """
+        lookup = "lt" if self.descending else "gt"
+        after_pk = Q(**{f"pk__{lookup}": pk})
+
+        if self.field.primary_key:
+            return after_pk
+
+        name = self.field.name
+        if value is None:
+            # Only nulls remain in ascending order, but in descending order
+            # the nulls come first
+            q = Q(**{f"{name}__isnull": True}) & after_pk
+            if self.descending:
+                q |= Q(**{f"{name}__isnull": False})
+            return q
+
+        q = Q(**{f"{name}__{lookup}": value}) | (Q(**{name: value}) & after_pk)
+        if self.field.null and not self.descending:
+            q |= Q(**{f"{name}__isnull": True})
+        return q
+
+    def encode_cursor(self, item):
+        value = (
+            None
+            if self.field.primary_key
+            else self.encode_value(getattr(item, self.field.attname))
+        )
+        return signing.dumps(
+            [self.order_key, value, self.encode_value(item.pk)], salt=self.salt
+        )
+
+    def decode_cursor(self, cursor):
+        try:
+            order_key, value, pk = signing.loads(cursor, salt=self.salt)
+        except (signing.BadSignature, TypeError, ValueError) as e:
+            raise ValueError("invalid cursor") from e
+
+        if order_key != self.order_key:
+            raise ValueError("cursor does not match the requested ordering")
+
+        if value is not None:
+            value = self.field.to_python(value)
+        return value, self.pk_field.to_python(pk)
+
+    def encode_value(self, value):
+        # Serialise to JSON without losing precision, unlike DjangoJSONEncoder,
+        # which truncates times to milliseconds
+        if isinstance(value, (datetime.date, datetime.time)):
+            return value.isoformat()
+        if isinstance(value, (decimal.Decimal, uuid.UUID)):
+            return str(value)
+        return value
+
+    def get_page(self, cursor, limit):
+        """
+        Return a list of up to ``limit`` items following the position in the
+        given cursor (or from the start, if the cursor is empty), and the
+        cursor for the next page, or ``None`` if this is the last page.
+        """
+        queryset = self.get_ordered_queryset()
+        if cursor:
+            queryset = queryset.filter(self.get_position_q(*self.decode_cursor(cursor)))
+
+        # Fetch one more item than needed to find out if there's another page
+        items = list(queryset[: limit + 1])
+        if len(items) <= limit:
+            return items, None
+
+        items = items[:limit]
+        return items, self.encode_cursor(items[-1])
@@ -1,11 +1,106 @@
+import threading
+from collections import OrderedDict
+from functools import partial
+
 import swapper
 from django.conf import settings
+from taggit.managers import TaggableManager
 
+from wagtail.api.conf import APIField
 from wagtail.api.validators import SiteFilterValidator
-from wagtail.models import PageViewRestriction
+from wagtail.models import PageViewRestriction, Site
+from wagtail.view_restriction_table import get_view_restriction_table
 
 Page = swapper.load_model("wagtailcore", "Page")
 
+# The tree paths of the pages to include in and exclude from the public pages
+# of a site, recently resolved by this process when WAGTAIL_VIEW_RESTRICTION_CACHE
+# is enabled. Keys include the site's root page and paths and the version of
+# the view restrictions, so entries for sites or restrictions that have since
+# changed are never returned, and are eventually evicted.
+_public_page_scopes = OrderedDict()
+_public_page_scopes_lock = threading.Lock()
+
+# The maximum number of public page scopes to keep in memory per process
+PUBLIC_PAGE_SCOPES_SIZE = 128
+
+
+def get_site_paths(site):
+    """
+    Return the tree paths of the root page of the given site and, with
+    internationalisation enabled, each translation of it.
+    """
+    root_pages = Page.objects.filter(id=site.root_page_id)
+    if getattr(settings, "WAGTAIL_I18N_ENABLED", False):
+        root_pages = Page.objects.filter(
+            translation_key__in=root_pages.values("translation_key")
+        )
+    return tuple(root_pages.order_by("path").values_list("path", flat=True))
+
+
+def get_public_page_scope(site, request):
+    """
+    Return the tree paths of the pages that contain the public pages of the
+    given site (its root page, and with internationalisation enabled, each
+    translation of it), and of the pages that contain the pages that the
+    request doesn't have access to, as a pair of tuples.
+
+    If ``WAGTAIL_VIEW_RESTRICTION_CACHE`` is enabled, the restrictions come
+    from the in-memory view restriction table and the scope is memoised per
+    process. Otherwise they are queried on every call, as the version of the
+    view restrictions is only kept up to date for the table.
+    """
+    if not getattr(settings, "WAGTAIL_VIEW_RESTRICTION_CACHE", False):
+        restricted_page_paths = {
+            restriction.page.path
+            for restriction in PageViewRestriction.objects.select_related(
+                "page"
+            ).prefetch_related("groups")
+            if not restriction.accept_request(request)
+        }
+        return get_site_paths(site), tuple(restricted_page_paths)
+
+    # The site root paths are cached, and change if the site's root page (or
+    # a translation of it) is moved, renamed or translated
+    root_url_paths = tuple(
+        sorted(
+            site_root_path.root_path
+            for site_root_path in Site.get_site_root_paths()
+            if site_root_path.site_id == site.pk
+        )
+    )
+
+    table = get_view_restriction_table()
+    rejected_restrictions = []
+    for restriction, path in table.restricted_page_paths:
+        if not restriction.accept_request(request):
+            rejected_restrictions.append((restriction.pk, path))
+
+    key = (
+        site.root_page_id,
+        root_url_paths,
+        table.version,
+        frozenset(rejected_restrictions),
+    )
+
+    with _public_page_scopes_lock:
+        scope = _public_page_scopes.get(key)
+        if scope is not None:
+            _public_page_scopes.move_to_end(key)
+            return scope
+
+    scope = (
+        get_site_paths(site),
+        tuple({path for _, path in rejected_restrictions}),
+    )
+
+    with _public_page_scopes_lock:
+        _public_page_scopes[key] = scope
+        while len(_public_page_scopes) > PUBLIC_PAGE_SCOPES_SIZE:
+            _public_page_scopes.popitem(last=False)
+
+    return scope
+
 
 def get_public_pages_queryset(request, model=Page):
     """
@@ -16,31 +111,79 @@ def get_public_pages_queryset(request, model=Page):
     """
     queryset = model._default_manager.all().live()
 
-    # Exclude pages that the user doesn't have access to
-    restricted_pages = [
-        restriction.page
-        for restriction in PageViewRestriction.objects.all().select_related("page")
-        if not restriction.accept_request(request)
-    ]
-
-    # Exclude the restricted pages and their descendants from the queryset
-    for restricted_page in restricted_pages:
-        queryset = queryset.not_descendant_of(restricted_page, inclusive=True)
-
     # Check if we have a specific site to look for
     site = SiteFilterValidator(site=request.GET.get("site"), request=request).site_obj
 
-    if site:
-        base_queryset = queryset
-        queryset = base_queryset.descendant_of(site.root_page, inclusive=True)
+    if not site:
+        # No sites configured
+        return queryset.none()
 
-        # If internationalisation is enabled, include pages from other language trees
-        if getattr(settings, "WAGTAIL_I18N_ENABLED", False):
-            for translation in site.root_page.get_translations():
-                queryset |= base_queryset.descendant_of(translation, inclusive=True)
+    # Include the pages within the site's root page (and its translations),
+    # and exclude the restricted pages that the user doesn't have access to
+    # and their descendants
+    site_paths, restricted_paths = get_public_page_scope(site, request)
+    queryset = queryset.filter(queryset.descendant_of_paths_q(site_paths))
+    if restricted_paths:
+        queryset = queryset.exclude(queryset.descendant_of_paths_q(restricted_paths))
 
-    else:
-        # No sites configured
-        queryset = queryset.none()
+    return queryset
+
+
+def get_api_fields_queryset(queryset, field_names, defer=True):
+    """
+    Adapt a listing queryset to the API fields that will be serialised from
+    it, given as the names of the model fields they read.
+
+    The columns of the model's declared API fields that aren't needed are
+    deferred (unless ``defer`` is ``False``), so that listings don't load
+    large values such as StreamField content that weren't asked for. The
+    related objects of the declared API fields that are needed are fetched
+    in bulk, rather than once per item.
+
+    For specific querysets, this is applied to the query for each specific
+    model, according to that model's API fields.
+
+    Shared by the v2 and v3 APIs.
+    """
+    if getattr(queryset, "is_specific", False):
+        return queryset.transform_specific_subqueries(
+            partial(get_api_fields_queryset, field_names=field_names, defer=defer)
+        )
+
+    model = queryset.model
+    deferred = []
+    undeferred = []
+    select_related = []
+    prefetch_related = []
+
+    for api_field in APIField.get_fields_for_model(model, db_fields_only=True):
+        field = model._meta.get_field(api_field.name)
+
+        if field.name not in field_names:
+            if defer and field.concrete and not field.primary_key:
+                deferred.append(field.name)
+            continue
+
+        undeferred.append(field.name)
+        if isinstance(field, TaggableManager):
+            # Tags are ordered by name when serialised, so can't be prefetched
+            continue
+        elif field.many_to_one or field.one_to_one:
+            select_related.append(field.name)
+        elif field.one_to_many or field.many_to_many:
+            prefetch_related.append(field.name)
+
+    # Load the fields that are needed, even if they were deferred before (for
+    # example by defer_streamfields()), rather than once per item
+    already_deferred, is_deferred = queryset.query.deferred_loading
+    if is_deferred and already_deferred & set(undeferred):
+        deferred.extend(already_deferred - set(undeferred))
+        queryset = queryset.defer(None)
 
+    if deferred:
+        queryset = queryset.defer(*deferred)
+    if select_related:
+        queryset = queryset.select_related(*select_related)
+    if prefetch_related:
+        queryset = queryset.prefetch_related(*prefetch_related)
     return queryset
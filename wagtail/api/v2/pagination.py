@@ -4,7 +4,9 @@ from django.conf import settings
 from rest_framework.pagination import BasePagination
 from rest_framework.response import Response
 
-from .utils import BadRequestError
+from wagtail.api.pagination import KeysetPaginator
+
+from .utils import BadRequestError, parse_boolean
 
 
 class WagtailPagination(BasePagination):
@@ -29,24 +31,48 @@ class WagtailPagination(BasePagination):
         if limit_max and limit > limit_max:
             raise BadRequestError("limit cannot be higher than %d" % limit_max)
 
-        start = offset
-        stop = offset + limit
-
         self.view = view
-        self.total_count = queryset.count()
-        return queryset[start:stop]
+        self.cursor = cursor = request.GET.get("cursor")
+        self.next_cursor = None
+
+        try:
+            count = parse_boolean(
+                request.GET.get("count", "false" if cursor is not None else "true")
+            )
+        except ValueError as e:
+            raise BadRequestError("count must be either 'true' or 'false'") from e
+
+        if cursor is None:
+            self.total_count = queryset.count() if count else None
+            return queryset[offset : offset + limit]
+
+        # Keyset pagination: ?cursor (empty for the first page) gives the
+        # position to continue from, so the cost of each page doesn't depend
+        # on how deep into the results it is
+        if "offset" in request.GET:
+            raise BadRequestError("cursor cannot be combined with offset")
+        if limit == 0:
+            raise BadRequestError("limit must be at least 1 when using a cursor")
+
+        try:
+            paginator = KeysetPaginator(queryset)
+            items, self.next_cursor = paginator.get_page(cursor, limit)
+        except ValueError as e:
+            raise BadRequestError(str(e)) from e
+
+        self.total_count = queryset.count() if count else None
+        return items
 
     def get_paginated_response(self, data):
+        meta = OrderedDict()
+        if self.total_count is not None:
+            meta["total_count"] = self.total_count
+        if self.cursor is not None:
+            meta["next_cursor"] = self.next_cursor
+
         data = OrderedDict(
             [
-                (
-                    "meta",
-                    OrderedDict(
-                        [
-                            ("total_count", self.total_count),
-                        ]
-                    ),
-                ),
+                ("meta", meta),
                 ("items", data),
             ]
         )
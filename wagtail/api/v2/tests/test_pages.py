@@ -5,14 +5,16 @@ from io import StringIO
 from unittest import mock
 
 import swapper
-from django.contrib.auth.models import Group
+from django.contrib.auth.models import AnonymousUser, Group
 from django.contrib.contenttypes.models import ContentType
 from django.core import management
-from django.test import TestCase, TransactionTestCase, tag
-from django.test.utils import override_settings
+from django.db import connection
+from django.test import RequestFactory, TestCase, TransactionTestCase, tag
+from django.test.utils import CaptureQueriesContext, override_settings
 from django.urls import reverse
 from rest_framework.test import APIClient
 
+from wagtail.api.querysets import get_public_page_scope
 from wagtail.api.v2 import signal_handlers
 from wagtail.api.v2.views import PagesAPIViewSet
 from wagtail.models import Locale, Site
@@ -20,6 +22,7 @@ from wagtail.models.view_restrictions import BaseViewRestriction
 from wagtail.test.demosite import models
 from wagtail.test.testapp.models import StreamPage
 from wagtail.test.utils import Page, PageFixturesMixin, WagtailTestUtils
+from wagtail.view_restriction_table import invalidate_view_restriction_table
 
 
 def get_total_page_count():
@@ -142,6 +145,87 @@ class TestPageListing(PageFixturesMixin, WagtailTestUtils, TestCase):
         ]
         self.assertEqual(new_total_count, old_total_count)
 
+    def test_private_pages_with_password_passed(self):
+        old_total_count = get_total_page_count()
+        page = models.BlogIndexPage.objects.get(id=5)
+        restriction = page.view_restrictions.create(
+            restriction_type=BaseViewRestriction.PASSWORD, password="test"
+        )
+        response = self.get_response()
+        content = json.loads(response.content.decode("UTF-8"))
+        self.assertNotEqual(content["meta"]["total_count"], old_total_count)
+
+        session = self.client.session
+        session[restriction.passed_view_restrictions_session_key] = [restriction.id]
+        session.save()
+
+        response = self.get_response()
+        content = json.loads(response.content.decode("UTF-8"))
+        self.assertEqual(content["meta"]["total_count"], old_total_count)
+
+    def test_private_pages_after_restriction_change(self):
+        self.get_response()
+
+        page = models.BlogIndexPage.objects.get(id=5)
+        with self.captureOnCommitCallbacks(execute=True):
+            page.view_restrictions.create(restriction_type="login")
+
+        response = self.get_response()
+        content = json.loads(response.content.decode("UTF-8"))
+        self.assertEqual(content["meta"]["total_count"], get_total_page_count())
+        self.assertNotIn(5, self.get_page_id_list(content))
+
+    def test_private_pages_without_restriction_table_invalidation(self):
+        self.get_response()
+
+        # Another process may not see the change of the restrictions version
+        # in a local memory cache, so the restrictions are queried each time
+        page = models.BlogIndexPage.objects.get(id=5)
+        with mock.patch("wagtail.signal_handlers.invalidate_view_restriction_table"):
+            page.view_restrictions.create(restriction_type="login")
+
+        response = self.get_response()
+        content = json.loads(response.content.decode("UTF-8"))
+        self.assertNotIn(5, self.get_page_id_list(content))
+
+    def test_public_page_scope_uses_site_root_page(self):
+        # A root-level page in another locale with the same URL path as the
+        # site's root page
+        homepage = self.get_homepage()
+        other_page = Page.get_first_root_node().add_child(
+            instance=Page(
+                title="Other home page",
+                slug="other-home-page",
+                locale=Locale.objects.create(language_code="fr"),
+            )
+        )
+        Page.objects.filter(id=other_page.id).update(
+            slug=homepage.slug, url_path=homepage.url_path
+        )
+
+        site = Site.objects.get(is_default_site=True)
+        request = RequestFactory().get("/")
+        request.user = AnonymousUser()
+        self.assertEqual(get_public_page_scope(site, request), ((homepage.path,), ()))
+
+    @override_settings(WAGTAIL_VIEW_RESTRICTION_CACHE=True)
+    def test_public_page_scope_is_memoised(self):
+        page = models.BlogIndexPage.objects.get(id=5)
+        page.view_restrictions.create(restriction_type="login")
+        site = Site.objects.get(is_default_site=True)
+        request = RequestFactory().get("/")
+        request.user = AnonymousUser()
+
+        scope = get_public_page_scope(site, request)
+        self.assertEqual(scope, ((self.get_homepage().path,), (page.path,)))
+        self.assertIs(get_public_page_scope(site, request), scope)
+
+        # The scope depends on the restrictions that the request is accepted by
+        request.user = self.create_user(username="alice", password="password")
+        self.assertEqual(
+            get_public_page_scope(site, request), ((self.get_homepage().path,), ())
+        )
+
     def test_page_listing_with_missing_page_model(self):
         # Create a ContentType that doesn't correspond to a real model
         missing_page_content_type = ContentType.objects.create(
@@ -518,6 +602,42 @@ class TestPageListing(PageFixturesMixin, WagtailTestUtils, TestCase):
             self.assertEqual(set(page.keys()), {"id", "meta", "tags", "title"})
             self.assertIsInstance(page["tags"], list)
 
+    def get_listing_queries(self, **params):
+        with CaptureQueriesContext(connection) as context:
+            response = self.get_response(**params)
+
+        self.assertEqual(response.status_code, 200)
+        return [query["sql"] for query in context.captured_queries]
+
+    def test_fields_not_requested_are_not_loaded(self):
+        queries = self.get_listing_queries(
+            type="demosite.BlogEntryPage", fields="title,date"
+        )
+
+        body_column = connection.ops.quote_name("body")
+        self.assertFalse(any(body_column in sql for sql in queries))
+
+    def test_fields_requested_are_loaded(self):
+        queries = self.get_listing_queries(
+            type="demosite.BlogEntryPage", fields="title,body"
+        )
+
+        body_column = connection.ops.quote_name("body")
+        self.assertTrue(any(body_column in sql for sql in queries))
+
+    def test_fields_related_objects_fetched_in_bulk(self):
+        params = {
+            "type": "demosite.BlogEntryPage",
+            # The html_url is found from the cached site root paths for each page
+            "fields": "title,feed_image,related_links,-html_url",
+        }
+        # Populate caches, such as the site root paths
+        self.get_listing_queries(**params)
+        num_queries = len(self.get_listing_queries(limit=1, **params))
+
+        queries = self.get_listing_queries(**params)
+        self.assertEqual(len(queries), num_queries)
+
     def test_fields_ordering(self):
         response = self.get_response(
             type="demosite.BlogEntryPage", fields="date,title,feed_image,related_links"
@@ -1127,6 +1247,161 @@ class TestPageListing(PageFixturesMixin, WagtailTestUtils, TestCase):
         self.assertEqual(response.status_code, 400)
         self.assertEqual(content, {"message": "offset must be a positive integer"})
 
+    # CURSOR
+
+    def get_pages_by_cursor(self, **params):
+        page_ids = []
+        cursor = ""
+        while cursor is not None:
+            response = self.get_response(cursor=cursor, **params)
+            content = json.loads(response.content.decode("UTF-8"))
+            self.assertEqual(response.status_code, 200)
+            page_ids.extend(self.get_page_id_list(content))
+            cursor = content["meta"]["next_cursor"]
+        return page_ids
+
+    @override_settings(WAGTAILAPI_LIMIT_MAX=None)
+    def test_cursor_returns_all_pages(self):
+        response = self.get_response(limit=1000)
+        content = json.loads(response.content.decode("UTF-8"))
+
+        # Pages are ordered by tree path by default
+        self.assertEqual(
+            self.get_pages_by_cursor(limit=3), self.get_page_id_list(content)
+        )
+
+    def test_cursor_first_page(self):
+        response = self.get_response(cursor="", limit=2)
+        content = json.loads(response.content.decode("UTF-8"))
+
+        self.assertEqual(len(content["items"]), 2)
+        # The total count isn't calculated unless requested
+        self.assertEqual(list(content["meta"].keys()), ["next_cursor"])
+
+    @override_settings(WAGTAILAPI_LIMIT_MAX=None)
+    def test_cursor_last_page(self):
+        response = self.get_response()
+        total_count = json.loads(response.content.decode("UTF-8"))["meta"][
+            "total_count"
+        ]
+
+        response = self.get_response(cursor="", limit=total_count)
+        content = json.loads(response.content.decode("UTF-8"))
+
+        self.assertEqual(len(content["items"]), total_count)
+        self.assertIsNone(content["meta"]["next_cursor"])
+
+    def test_cursor_with_count(self):
+        response = self.get_response()
+        total_count = json.loads(response.content.decode("UTF-8"))["meta"][
+            "total_count"
+        ]
+
+        response = self.get_response(cursor="", limit=2, count="true")
+        content = json.loads(response.content.decode("UTF-8"))
+
+        self.assertEqual(content["meta"]["total_count"], total_count)
+
+    def test_offset_without_count(self):
+        response = self.get_response(count="false")
+        content = json.loads(response.content.decode("UTF-8"))
+
+        self.assertEqual(content["meta"], {})
+
+    def test_cursor_ordering_by_nullable_field(self):
+        Page.objects.filter(id__in=[4, 5, 8]).update(first_published_at=None)
+        pages = Page.objects.filter(id__in=self.get_pages_by_cursor())
+        expected_ascending = [
+            page.id
+            for page in sorted(
+                pages,
+                key=lambda page: (
+                    page.first_published_at is None,
+                    page.first_published_at,
+                    page.id,
+                ),
+            )
+        ]
+
+        self.assertEqual(
+            self.get_pages_by_cursor(limit=2, order="first_published_at"),
+            expected_ascending,
+        )
+        self.assertEqual(
+            self.get_pages_by_cursor(limit=2, order="-first_published_at"),
+            expected_ascending[::-1],
+        )
+
+    def test_cursor_ordering_by_field_with_pk(self):
+        self.assertEqual(
+            self.get_pages_by_cursor(limit=2, order="-slug,-id"),
+            self.get_pages_by_cursor(limit=2, order="-slug"),
+        )
+
+    def test_cursor_ordering_by_unindexed_field_gives_error(self):
+        response = self.get_response(cursor="", order="title")
+        content = json.loads(response.content.decode("UTF-8"))
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            content,
+            {
+                "message": "cannot use a cursor when ordering by 'title' (field is not indexed)"
+            },
+        )
+
+    def test_cursor_ordering_by_multiple_fields_gives_error(self):
+        response = self.get_response(cursor="", order="slug,first_published_at")
+        content = json.loads(response.content.decode("UTF-8"))
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            content,
+            {"message": "cursor pagination only supports ordering by a single field"},
+        )
+
+    def test_cursor_ordering_by_random_gives_error(self):
+        response = self.get_response(cursor="", order="random")
+        content = json.loads(response.content.decode("UTF-8"))
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            content, {"message": "random ordering with a cursor is not supported"}
+        )
+
+    def test_cursor_with_offset_gives_error(self):
+        response = self.get_response(cursor="", offset=2)
+        content = json.loads(response.content.decode("UTF-8"))
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(content, {"message": "cursor cannot be combined with offset"})
+
+    def test_invalid_cursor_gives_error(self):
+        response = self.get_response(cursor="abc")
+        content = json.loads(response.content.decode("UTF-8"))
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(content, {"message": "invalid cursor"})
+
+    def test_cursor_for_other_ordering_gives_error(self):
+        response = self.get_response(cursor="", limit=2, order="slug")
+        cursor = json.loads(response.content.decode("UTF-8"))["meta"]["next_cursor"]
+
+        response = self.get_response(cursor=cursor, limit=2, order="-slug")
+        content = json.loads(response.content.decode("UTF-8"))
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            content, {"message": "cursor does not match the requested ordering"}
+        )
+
+    def test_count_not_boolean_gives_error(self):
+        response = self.get_response(count="abc")
+        content = json.loads(response.content.decode("UTF-8"))
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(content, {"message": "count must be either 'true' or 'false'"})
+
     # REGRESSION TESTS
 
     def test_issue_3967(self):
@@ -1210,6 +1485,20 @@ class TestPageListingSearch(PageFixturesMixin, WagtailTestUtils, TransactionTest
 
         self.assertEqual(set(page_id_list), {16, 18, 19})
 
+    def test_search_with_multiple_private_sections(self):
+        # The restrictions are deleted without signals when the test ends
+        self.addCleanup(invalidate_view_restriction_table)
+        for page_id in [16, 19]:
+            Page.objects.get(id=page_id).view_restrictions.create(
+                restriction_type="login"
+            )
+
+        response = self.get_response(search="blog")
+        content = json.loads(response.content.decode("UTF-8"))
+        page_id_list = self.get_page_id_list(content)
+
+        self.assertEqual(set(page_id_list), {5, 18})
+
     def test_search_with_invalid_type(self):
         # Check that a 400 error is returned when the type doesn't exist
         response = self.get_response(type="demosite.InvalidPageType", search="blog")
@@ -2186,6 +2475,22 @@ class TestAPIDetailQueryCount(PageFixturesMixin, WagtailTestUtils, TestCase):
 
     def test_detail_view_does_not_duplicate_queries(self):
         response = self.client.get("/api/main/pages/2/")
-        with self.assertNumQueries(10):
+        with self.assertNumQueries(9):
             response = self.client.get("/api/main/pages/2/")
             self.assertEqual(response.status_code, 200)
+
+    def test_listing_view_scopes_public_pages_once(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/main/pages/")
+            self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(
+            len(
+                [
+                    query
+                    for query in queries.captured_queries
+                    if 'FROM "wagtailcore_pageviewrestriction" ' in query["sql"]
+                ]
+            ),
+            1,
+        )
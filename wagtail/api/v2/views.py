@@ -15,7 +15,7 @@ from rest_framework.response import Response
 from rest_framework.viewsets import GenericViewSet
 
 from wagtail.api import APIField
-from wagtail.api.querysets import get_public_pages_queryset
+from wagtail.api.querysets import get_api_fields_queryset, get_public_pages_queryset
 from wagtail.api.rich_text import APIRichText, RichTextFormatError
 from wagtail.models import Site
 
@@ -62,6 +62,8 @@ class BaseAPIViewSet(GenericViewSet):
         [
             "limit",
             "offset",
+            "cursor",
+            "count",
             "fields",
             "order",
             "search",
@@ -96,11 +98,39 @@ class BaseAPIViewSet(GenericViewSet):
     def listing_view(self, request):
         queryset = self.get_queryset()
         self.check_query_parameters(queryset)
+        queryset = self.get_listing_fields_queryset(queryset)
         queryset = self.filter_queryset(queryset)
         queryset = self.paginate_queryset(queryset)
         serializer = self.get_serializer(queryset, many=True)
         return self.get_paginated_response(serializer.data)
 
+    def get_listing_fields_queryset(self, queryset):
+        """
+        Adapt the listing queryset to the fields in the ``?fields`` parameter,
+        so that the columns of API fields that weren't asked for aren't loaded,
+        and the related objects of those that were are fetched in bulk.
+        """
+        model = queryset.model
+        declared_field_names = {
+            field.name for field in APIField.get_fields_for_model(model)
+        }
+        field_names = set()
+        defer = True
+
+        for field in self.get_serializer_class()().fields.values():
+            source = field.source_attrs[0] if field.source_attrs else None
+            field_names.update([field.field_name, source])
+
+            if field.field_name in declared_field_names:
+                try:
+                    model._meta.get_field(source)
+                except FieldDoesNotExist:
+                    # Fields read from properties or methods could use any
+                    # column, so don't defer any
+                    defer = False
+
+        return get_api_fields_queryset(queryset, field_names, defer=defer)
+
     def get_object(self):
         if not hasattr(self, "_cached_object"):
             self._cached_object = super().get_object()
@@ -552,10 +582,14 @@ class PagesAPIViewSet(BaseAPIViewSet):
         This is used as the base for get_queryset and is also used to find the
         parent pages when using the child_of and descendant_of filters as well.
         """
-        try:
-            return get_public_pages_queryset(self.request)
-        except ValueError as e:
-            raise BadRequestError(str(e)) from e
+        # The public pages are scoped with queries for the site's root pages
+        # and view restrictions, which needn't be repeated within a request
+        if not hasattr(self, "_cached_base_queryset"):
+            try:
+                self._cached_base_queryset = get_public_pages_queryset(self.request)
+            except ValueError as e:
+                raise BadRequestError(str(e)) from e
+        return self._cached_base_queryset.all()
 
     def get_queryset(self):
         request = self.request
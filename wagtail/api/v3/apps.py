@@ -9,5 +9,7 @@ class WagtailAPIV3AppConfig(AppConfig):
 
     def ready(self):
         from wagtail.api.rich_text import APIRichText
+        from wagtail.api.v3.signal_handlers import register_signal_handlers
 
         APIRichText.check_setting()
+        register_signal_handlers()
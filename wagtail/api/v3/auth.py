@@ -1,10 +1,149 @@
+import threading
+
 from django.conf import settings
+from django.contrib.auth import get_user_model
 from django.contrib.auth.models import AnonymousUser
+from django.core.cache import caches
 from django.utils import timezone
+from django.utils.functional import SimpleLazyObject
 from ninja.security import HttpBearer
 from ninja.security.http import HttpAuthBase
 
 from wagtail.models import APIToken
+from wagtail.tasks import update_api_token_last_used_task
+
+
+class APITokenCache:
+    """
+    A short-lived cache of verified API tokens, keyed by token digest, so that
+    requests with a recently used token need no database query to verify it.
+
+    Each entry holds the token's fields and whether its user is active. When
+    a token is revoked, its entry is replaced by a revocation marker so that
+    the token is rejected at once, even by requests that looked it up before
+    the revocation. Entries are only ever added (not overwritten) for the same
+    reason.
+    """
+
+    KEY_PREFIX = "wagtail-api-token-"
+
+    # How long, in seconds, a token is trusted without checking the database
+    TIMEOUT = 60
+
+    def __init__(self, cache):
+        self.cache = cache
+
+    @classmethod
+    def get_for_settings(cls):
+        """
+        Return an ``APITokenCache`` for the cache alias configured in the
+        ``WAGTAILAPI_TOKEN_CACHE`` setting, or ``None`` if it is not configured.
+        """
+        alias = getattr(settings, "WAGTAILAPI_TOKEN_CACHE", None)
+        if not alias:
+            return None
+        return cls(caches[alias])
+
+    def get_key(self, key_hash):
+        return self.KEY_PREFIX + key_hash
+
+    def get(self, key_hash):
+        """
+        Return a ``(token, user_is_active)`` pair for the token with the given
+        digest, ``(None, False)`` if it has been revoked, or ``None`` if it is
+        not cached.
+        """
+        entry = self.cache.get(self.get_key(key_hash))
+        if entry is None:
+            return None
+        if entry.get("revoked"):
+            return None, False
+        return APIToken(**entry["token"]), entry["user_is_active"]
+
+    def add(self, api_token, user_is_active):
+        self.cache.add(
+            self.get_key(api_token.key_hash),
+            {
+                "token": {
+                    field.attname: getattr(api_token, field.attname)
+                    for field in APIToken._meta.concrete_fields
+                },
+                "user_is_active": user_is_active,
+            },
+            self.TIMEOUT,
+        )
+
+    def revoke(self, key_hash):
+        self.cache.set(self.get_key(key_hash), {"revoked": True}, self.TIMEOUT)
+
+    def delete_many(self, key_hashes):
+        self.cache.delete_many([self.get_key(key_hash) for key_hash in key_hashes])
+
+
+class LastUsedBuffer:
+    """
+    Collects the times that API tokens are used in this process, and writes
+    them to the database in a single batch at most once per
+    ``WAGTAILAPI_TOKEN_LAST_USED_INTERVAL``.
+
+    Uses recorded within the interval after a write are written by the first
+    request to authenticate or finish once the interval has passed, so that
+    writes are only made from request threads, whose database connections
+    Django manages.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # Token id -> the time it was used, yet to be written
+        self.pending = {}
+        # Token id -> the last time it was recorded as used by this process
+        self.recorded = {}
+        self.flushed_at = None
+
+    def add(self, api_token, interval):
+        now = timezone.now()
+        with self.lock:
+            last_used_at = max(
+                filter(None, [api_token.last_used_at, self.recorded.get(api_token.pk)]),
+                default=None,
+            )
+            if last_used_at is None or (now - last_used_at).total_seconds() >= interval:
+                self.pending[api_token.pk] = self.recorded[api_token.pk] = now
+
+        self.flush(interval)
+
+    def flush(self, interval=None):
+        """
+        Write all pending uses, unless they were last written less than
+        ``interval`` seconds ago.
+        """
+        now = timezone.now()
+        with self.lock:
+            if not self.pending:
+                return
+            if (
+                interval is not None
+                and self.flushed_at is not None
+                and (now - self.flushed_at).total_seconds() < interval
+            ):
+                return
+
+            pending = self.pending
+            self.pending = {}
+            self.flushed_at = now
+
+        update_api_token_last_used_task.enqueue(
+            [[pk, used_at.isoformat()] for pk, used_at in pending.items()]
+        )
+
+    def clear(self):
+        with self.lock:
+            self.pending = {}
+            self.recorded = {}
+            self.flushed_at = None
+
+
+last_used_buffer = LastUsedBuffer()
 
 
 class BearerTokenAuth(HttpBearer):
@@ -15,6 +154,24 @@ class BearerTokenAuth(HttpBearer):
     """
 
     def authenticate(self, request, token: str):
+        token_cache = APITokenCache.get_for_settings()
+        if token_cache:
+            key_hash = APIToken.hash_token(token)
+            cached = token_cache.get(key_hash)
+            if cached is not None:
+                api_token, user_is_active = cached
+                if not user_is_active:
+                    request.user = AnonymousUser()
+                    return None
+
+                # Only fetch the user if it is needed
+                user_id = api_token.user_id
+                request.user = SimpleLazyObject(
+                    lambda: get_user_model()._default_manager.get(pk=user_id)
+                )
+                self._touch_last_used(api_token)
+                return api_token
+
         try:
             api_token = APIToken.objects.select_related("user").get(
                 key_hash__in=APIToken.candidate_key_hashes(token),
@@ -25,6 +182,11 @@ class BearerTokenAuth(HttpBearer):
         else:
             user = api_token.user
 
+            # Tokens matched by a SECRET_KEY_FALLBACKS digest aren't cached, so
+            # that each cache entry can be found from the token's stored digest
+            if token_cache and api_token.key_hash == key_hash:
+                token_cache.add(api_token, user.is_active)
+
         # is_active may be a plain class attribute (AbstractBaseUser) rather
         # than a database field, so check in Python instead of the queryset.
         if not (user and user.is_active):
@@ -43,12 +205,7 @@ class BearerTokenAuth(HttpBearer):
         interval = getattr(settings, "WAGTAILAPI_TOKEN_LAST_USED_INTERVAL", 60)
         if interval is None:
             return
-        now = timezone.now()
-        if (
-            api_token.last_used_at is None
-            or (now - api_token.last_used_at).total_seconds() >= interval
-        ):
-            APIToken.objects.filter(pk=api_token.pk).update(last_used_at=now)
+        last_used_buffer.add(api_token, interval)
 
 
 class AllowAnonymous(HttpAuthBase):
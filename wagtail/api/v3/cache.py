@@ -0,0 +1,168 @@
+import hashlib
+import json
+import time
+import uuid
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from wagtail.api.rich_text import APIRichText
+from wagtail.coreutils import on_commit_once
+from wagtail.models import PageViewRestriction
+
+
+class APIResponseCache:
+    """
+    A cache of the responses to anonymous requests to the public API
+    endpoints, holding the serialised JSON of each response along with its
+    ETag and the time it was generated.
+
+    Responses are keyed by the requested path, site hostname and port, the
+    query parameters (in a normalised order) and the default rich text
+    format. Every key also includes the current content generation, which is
+    changed whenever public content is published, unpublished, moved or
+    deleted, or view restrictions or sites are changed, so that no response
+    from before the change is returned once it has been committed.
+    """
+
+    KEY_PREFIX = "wagtail-api-response-"
+    GENERATION_KEY = "wagtail-api-response-generation"
+
+    # How long, in seconds, a response is kept, which bounds how stale it can
+    # get after changes that aren't published (for example to images)
+    DEFAULT_TIMEOUT = 300
+
+    def __init__(self, cache, timeout=DEFAULT_TIMEOUT):
+        self.cache = cache
+        self.timeout = timeout
+
+    @classmethod
+    def get_for_settings(cls):
+        """
+        Return an ``APIResponseCache`` for the cache alias configured in the
+        ``WAGTAILAPI_RESPONSE_CACHE`` setting, or ``None`` if it is not
+        configured.
+        """
+        alias = getattr(settings, "WAGTAILAPI_RESPONSE_CACHE", None)
+        if not alias:
+            return None
+        return cls(
+            caches[alias],
+            getattr(settings, "WAGTAILAPI_RESPONSE_CACHE_TIMEOUT", cls.DEFAULT_TIMEOUT),
+        )
+
+    def get_generation(self):
+        generation = self.cache.get(self.GENERATION_KEY)
+        if generation is None:
+            generation = uuid.uuid4().hex
+            if not self.cache.add(self.GENERATION_KEY, generation, None):
+                # Another process has just set the generation
+                generation = self.cache.get(self.GENERATION_KEY, generation)
+        return generation
+
+    def invalidate(self):
+        """
+        Change the content generation once the current transaction is
+        committed, so that all cached responses are discarded.
+        """
+        on_commit_once(
+            "wagtail-api-response-cache-invalidation", self._set_new_generation
+        )
+
+    def _set_new_generation(self):
+        self.cache.set(self.GENERATION_KEY, uuid.uuid4().hex, None)
+
+    def get_key(self, request, generation):
+        query = sorted((key, sorted(values)) for key, values in request.GET.lists())
+        request_key = json.dumps(
+            [
+                request.path,
+                request.get_host(),
+                request.get_port(),
+                query,
+                APIRichText.get_default_format(),
+            ]
+        )
+        digest = hashlib.sha256(request_key.encode()).hexdigest()
+        return f"{self.KEY_PREFIX}{generation}-{digest}"
+
+    def get(self, key):
+        """
+        Return the cached response entry for the given key, or ``None`` if
+        there isn't one.
+        """
+        return self.cache.get(key)
+
+    def add(self, key, response):
+        """
+        Cache the given response, and return its entry.
+        """
+        content = response.content
+        entry = {
+            "content": content,
+            "content_type": response["Content-Type"],
+            "etag": quote_etag(hashlib.md5(content, usedforsecurity=False).hexdigest()),
+            "last_modified": int(time.time()),
+        }
+        self.cache.add(key, entry, self.timeout)
+        return entry
+
+
+def cache_public_response(run):
+    """
+    Cache the successful responses of a public API operation to anonymous
+    ``GET`` requests in the ``APIResponseCache``, if one is configured, and
+    answer conditional requests from the ``ETag`` and ``Last-Modified`` of the
+    cached response.
+
+    Apply with ``ninja.decorators.decorate_view``. Requests with an
+    ``Authorization`` header are never cached, as their response depends on
+    the user, and nor are requests from sessions that have passed a page
+    view restriction (such as a password), as their response includes pages
+    that other clients can't see.
+    """
+
+    @wraps(run)
+    def wrapper(request, *args, **kwargs):
+        response_cache = APIResponseCache.get_for_settings()
+        if (
+            response_cache is None
+            or request.method != "GET"
+            or "HTTP_AUTHORIZATION" in request.META
+            or has_passed_view_restrictions(request)
+        ):
+            return run(request, *args, **kwargs)
+
+        key = response_cache.get_key(request, response_cache.get_generation())
+        entry = response_cache.get(key)
+        if entry is None:
+            response = run(request, *args, **kwargs)
+            if response.status_code != 200 or response.streaming:
+                return response
+            entry = response_cache.add(key, response)
+        else:
+            response = HttpResponse(
+                entry["content"], content_type=entry["content_type"]
+            )
+
+        response["ETag"] = entry["etag"]
+        response["Last-Modified"] = http_date(entry["last_modified"])
+        return get_conditional_response(
+            request,
+            etag=entry["etag"],
+            last_modified=entry["last_modified"],
+            response=response,
+        )
+
+    return wrapper
+
+
+def has_passed_view_restrictions(request):
+    session = getattr(request, "session", None)
+    return session is not None and bool(
+        session.get(PageViewRestriction.passed_view_restrictions_session_key)
+    )
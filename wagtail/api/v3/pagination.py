@@ -1,5 +1,5 @@
 from math import inf
-from typing import Any
+from typing import Any, Optional
 
 from django.conf import settings
 from django.db.models import QuerySet
@@ -8,6 +8,8 @@ from ninja import Field
 from ninja.errors import HttpError
 from ninja.pagination import LimitOffsetPagination
 
+from wagtail.api.pagination import KeysetPaginator
+
 
 def _get_max_limit() -> float | int:
     limit_max = getattr(settings, "WAGTAILAPI_LIMIT_MAX", 20)
@@ -20,16 +22,35 @@ class WagtailLimitOffsetPagination(LimitOffsetPagination):
     """
     Ninja limit/offset pagination with ``WAGTAILAPI_LIMIT_MAX`` enforcement.
 
-    Responses use Ninja's native envelope: ``{"count": N, "items": [...]}``.
+    Responses use Ninja's native envelope: ``{"count": N, "items": [...]}``,
+    plus ``next_cursor`` for keyset pagination.
 
     Default ``limit`` is 20 (Wagtail's API default), not Ninja's 100. When
     ``limit`` exceeds ``WAGTAILAPI_LIMIT_MAX`` we raise 400 to match the v2
     API; Ninja's base paginator would silently cap the limit instead.
+
+    Passing ``cursor`` (empty for the first page) switches to keyset
+    pagination, which costs the same at any depth. The total ``count`` is
+    then only computed if requested with ``count=true``.
     """
 
     class Input(LimitOffsetPagination.Input):
         limit: int = Field(default=20, ge=1)
         offset: int = Field(default=0, ge=0)
+        cursor: Optional[str] = Field(
+            default=None,
+            description="Position to continue from, as returned in "
+            "next_cursor. Pass an empty value to start from the first page.",
+        )
+        count: Optional[bool] = Field(
+            default=None,
+            description="Whether to return the total count of results. "
+            "Defaults to true, or false when paginating with a cursor.",
+        )
+
+    class Output(LimitOffsetPagination.Output):
+        count: Optional[int] = None
+        next_cursor: Optional[str] = None
 
     def paginate_queryset(
         self,
@@ -41,4 +62,27 @@ class WagtailLimitOffsetPagination(LimitOffsetPagination):
         max_limit = _get_max_limit()
         if max_limit != inf and pagination.limit > int(max_limit):
             raise HttpError(400, f"limit cannot be higher than {int(max_limit)}")
-        return super().paginate_queryset(queryset, pagination, request, **params)
+
+        if pagination.cursor is None:
+            if pagination.count is False:
+                offset = pagination.offset
+                return {
+                    self.items_attribute: queryset[offset : offset + pagination.limit],
+                    "count": None,
+                }
+            return super().paginate_queryset(queryset, pagination, request, **params)
+
+        if pagination.offset:
+            raise HttpError(400, "cursor cannot be combined with offset")
+
+        try:
+            paginator = KeysetPaginator(queryset)
+            items, next_cursor = paginator.get_page(pagination.cursor, pagination.limit)
+        except ValueError as e:
+            raise HttpError(400, str(e)) from e
+
+        return {
+            self.items_attribute: items,
+            "count": self._items_count(queryset) if pagination.count else None,
+            "next_cursor": next_cursor,
+        }
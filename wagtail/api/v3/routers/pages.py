@@ -9,6 +9,7 @@ from django.http import Http404, HttpRequest
 from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse
 from ninja import Body, FilterSchema, Query, Router, Schema, Status
+from ninja.decorators import decorate_view
 from ninja.pagination import paginate
 from pydantic import PositiveInt, field_validator, model_validator
 
@@ -18,8 +19,10 @@ from wagtail.actions.copy_for_translation import ParentNotTranslatedError
 from wagtail.actions.copy_page import CopyPageIntegrityError
 from wagtail.actions.create_alias import CreatePageAliasIntegrityError
 from wagtail.actions.publish_page_revision import PublishPagePermissionError
+from wagtail.api.querysets import get_api_fields_queryset
 from wagtail.api.rich_text import RichTextOutputFormat
 from wagtail.api.v3.auth import AllowAnonymous, BearerTokenAuth
+from wagtail.api.v3.cache import cache_public_response
 from wagtail.api.v3.errors import as_validation_error
 from wagtail.api.v3.form_data import build_page_form, build_page_update_form
 from wagtail.api.v3.pagination import WagtailLimitOffsetPagination
@@ -195,6 +198,7 @@ class PageFilterSchema(FilterSchema):
     operation_id="pages_list",
     auth=[BearerTokenAuth(), AllowAnonymous()],
 )
+@decorate_view(cache_public_response)
 @paginate(
     WagtailLimitOffsetPagination,
     pass_parameter="pagination_info",  # noqa: S106 not a password
@@ -218,6 +222,9 @@ def list_pages(
         base_fields=BASE_PAGE_READ_FIELDS,
     )
     queryset = get_pages_queryset(request, model)
+    # The listing schema only has the base page fields, so don't load the
+    # specific page type's own API fields
+    queryset = get_api_fields_queryset(queryset, BASE_PAGE_READ_FIELDS)
     queryset = filters.filter(queryset, request)
     queryset = field_filter.filter_queryset(queryset)
     queryset = ordering.order_queryset(
@@ -281,6 +288,7 @@ def find_page(
     operation_id="pages_detail",
     auth=[BearerTokenAuth(), AllowAnonymous()],
 )
+@decorate_view(cache_public_response)
 def get_page(
     request: HttpRequest,
     page_id: int,
@@ -0,0 +1,72 @@
+import swapper
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.signals import request_finished
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from wagtail.models import APIToken, PageViewRestriction, Site
+from wagtail.signals import page_published, page_unpublished, post_page_move
+
+from .auth import APITokenCache, last_used_buffer
+from .cache import APIResponseCache
+
+Page = swapper.load_model("wagtailcore", "Page")
+
+
+def revoke_cached_api_token(instance, **kwargs):
+    # Reject revoked or deleted tokens straight away, rather than once the
+    # cached token expires
+    if (token_cache := APITokenCache.get_for_settings()) and (
+        instance.revoked_at or kwargs["signal"] is post_delete
+    ):
+        token_cache.revoke(instance.key_hash)
+
+
+def invalidate_cached_api_tokens_for_user(instance, update_fields=None, **kwargs):
+    # The cached tokens of a user record whether the user is active
+    if (token_cache := APITokenCache.get_for_settings()) and (
+        update_fields is None or "is_active" in update_fields
+    ):
+        token_cache.delete_many(
+            APIToken.objects.filter(user=instance).values_list("key_hash", flat=True)
+        )
+
+
+def write_api_token_last_used(**kwargs):
+    # Write the uses of API tokens buffered by this process once the interval
+    # has passed, even if no further requests are authenticated with a token
+    interval = getattr(settings, "WAGTAILAPI_TOKEN_LAST_USED_INTERVAL", 60)
+    if interval is not None:
+        last_used_buffer.flush(interval)
+
+
+def invalidate_cached_api_responses(**kwargs):
+    # Public content has changed, so discard all cached responses rather than
+    # work out which listings and pages include it
+    if response_cache := APIResponseCache.get_for_settings():
+        response_cache.invalidate()
+
+
+def invalidate_cached_api_responses_on_page_delete(instance, **kwargs):
+    # Deleting a page doesn't send page_unpublished
+    if instance.live:
+        invalidate_cached_api_responses()
+
+
+def register_signal_handlers():
+    post_save.connect(revoke_cached_api_token, sender=APIToken)
+    post_delete.connect(revoke_cached_api_token, sender=APIToken)
+    post_save.connect(invalidate_cached_api_tokens_for_user, sender=get_user_model())
+    request_finished.connect(write_api_token_last_used)
+
+    page_published.connect(invalidate_cached_api_responses)
+    page_unpublished.connect(invalidate_cached_api_responses)
+    post_page_move.connect(invalidate_cached_api_responses)
+    post_delete.connect(invalidate_cached_api_responses_on_page_delete, sender=Page)
+    post_save.connect(invalidate_cached_api_responses, sender=PageViewRestriction)
+    post_delete.connect(invalidate_cached_api_responses, sender=PageViewRestriction)
+    m2m_changed.connect(
+        invalidate_cached_api_responses, sender=PageViewRestriction.groups.through
+    )
+    post_save.connect(invalidate_cached_api_responses, sender=Site)
+    post_delete.connect(invalidate_cached_api_responses, sender=Site)
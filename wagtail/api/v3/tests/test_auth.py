@@ -1,12 +1,18 @@
+from datetime import timedelta
+
 from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import request_finished
 from django.test import TestCase, override_settings
 from django.test.client import RequestFactory
 from django.urls import reverse
+from django.utils import timezone
 from ninja.constants import NOT_SET
 
-from wagtail.api.v3.auth import AllowAnonymous, BearerTokenAuth
+from wagtail.api.v3.auth import AllowAnonymous, BearerTokenAuth, last_used_buffer
 from wagtail.api.v3.tests.base import TestV3Base
 from wagtail.models import APIToken
+from wagtail.tasks import update_api_token_last_used_task
 from wagtail.test.utils import WagtailTestUtils
 
 
@@ -16,6 +22,10 @@ class TestBearerTokenAuth(TestCase):
         cls.user = WagtailTestUtils.create_superuser("apiuser")
         cls.token, cls.plaintext = APIToken.create_token(user=cls.user, name="t")
 
+    def setUp(self):
+        last_used_buffer.clear()
+        self.addCleanup(last_used_buffer.clear)
+
     def authenticate(self, header):
         request = RequestFactory().get("/", HTTP_AUTHORIZATION=header)
         return request, BearerTokenAuth()(request)
@@ -72,6 +82,74 @@ class TestBearerTokenAuth(TestCase):
         self.token.refresh_from_db()
         self.assertEqual(self.token.last_used_at, first)
 
+    def test_last_used_at_buffered(self):
+        other_token, other_plaintext = APIToken.create_token(
+            user=self.user, name="other"
+        )
+        self.authenticate(f"Bearer {self.plaintext}")
+
+        # Within the interval, uses of other tokens are buffered...
+        with self.assertNumQueries(1):
+            self.authenticate(f"Bearer {other_plaintext}")
+        other_token.refresh_from_db()
+        self.assertIsNone(other_token.last_used_at)
+
+        # ...and written together once it has passed
+        last_used_buffer.flushed_at -= timedelta(seconds=60)
+        self.authenticate(f"Bearer {self.plaintext}")
+        other_token.refresh_from_db()
+        self.assertIsNotNone(other_token.last_used_at)
+
+    def test_last_used_at_flushed_when_request_finishes(self):
+        other_token, other_plaintext = APIToken.create_token(
+            user=self.user, name="other"
+        )
+        self.authenticate(f"Bearer {self.plaintext}")
+        self.authenticate(f"Bearer {other_plaintext}")
+
+        # Within the interval, finishing a request doesn't write the uses...
+        request_finished.send(sender=self.__class__)
+        other_token.refresh_from_db()
+        self.assertIsNone(other_token.last_used_at)
+
+        # ...but the first to finish once it has passed does
+        last_used_buffer.flushed_at -= timedelta(seconds=60)
+        request_finished.send(sender=self.__class__)
+        other_token.refresh_from_db()
+        self.assertIsNotNone(other_token.last_used_at)
+        self.assertEqual(last_used_buffer.pending, {})
+
+    def test_flush_writes_pending_uses(self):
+        other_token, other_plaintext = APIToken.create_token(
+            user=self.user, name="other"
+        )
+        self.authenticate(f"Bearer {self.plaintext}")
+        self.authenticate(f"Bearer {other_plaintext}")
+
+        last_used_buffer.flush()
+        other_token.refresh_from_db()
+        self.assertIsNotNone(other_token.last_used_at)
+
+    def test_last_used_at_not_moved_backwards(self):
+        used_at = timezone.now()
+        self.token.last_used_at = used_at
+        self.token.save(update_fields=["last_used_at"])
+        other_token, _ = APIToken.create_token(user=self.user, name="other")
+
+        # A use recorded by another process before the one already written
+        with self.assertNumQueries(1):
+            update_api_token_last_used_task.enqueue(
+                [
+                    [self.token.pk, (used_at - timedelta(seconds=5)).isoformat()],
+                    [other_token.pk, used_at.isoformat()],
+                ]
+            )
+
+        self.token.refresh_from_db()
+        self.assertEqual(self.token.last_used_at, used_at)
+        other_token.refresh_from_db()
+        self.assertEqual(other_token.last_used_at, used_at)
+
     @override_settings(WAGTAILAPI_TOKEN_LAST_USED_INTERVAL=None)
     def test_last_used_at_disabled(self):
         request = RequestFactory().get(
@@ -92,6 +170,87 @@ class TestBearerTokenAuth(TestCase):
         self.assertFalse(request.user.is_authenticated)
 
 
+@override_settings(
+    CACHES={
+        "default": {
+            "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+            "LOCATION": "cache",
+        },
+        "tokens": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        },
+    },
+    WAGTAILAPI_TOKEN_CACHE="tokens",
+    WAGTAILAPI_TOKEN_LAST_USED_INTERVAL=None,
+)
+class TestBearerTokenAuthCache(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = WagtailTestUtils.create_superuser("apiuser")
+        cls.token, cls.plaintext = APIToken.create_token(user=cls.user, name="t")
+
+    def setUp(self):
+        caches["tokens"].clear()
+
+    def authenticate(self):
+        request = RequestFactory().get(
+            "/", HTTP_AUTHORIZATION=f"Bearer {self.plaintext}"
+        )
+        return request, BearerTokenAuth()(request)
+
+    def test_cached_token_resolves_without_queries(self):
+        self.authenticate()
+
+        with self.assertNumQueries(0):
+            request, result = self.authenticate()
+        self.assertEqual(result, self.token)
+        self.assertEqual(result.name, "t")
+
+        # The user is only fetched when used
+        with self.assertNumQueries(1):
+            self.assertEqual(request.user, self.user)
+
+    def test_revoked_token_rejected_immediately(self):
+        self.authenticate()
+        self.token.revoke()
+
+        with self.assertNumQueries(0):
+            request, result = self.authenticate()
+        self.assertIsNone(result)
+        self.assertFalse(request.user.is_authenticated)
+
+    def test_deleted_token_rejected_immediately(self):
+        self.authenticate()
+        self.token.delete()
+
+        _, result = self.authenticate()
+        self.assertIsNone(result)
+
+    def test_inactive_user_rejected(self):
+        self.authenticate()
+        self.user.is_active = False
+        self.user.save()
+
+        request, result = self.authenticate()
+        self.assertIsNone(result)
+        self.assertFalse(request.user.is_authenticated)
+
+        # The inactive user is cached too
+        with self.assertNumQueries(0):
+            _, result = self.authenticate()
+        self.assertIsNone(result)
+
+    def test_fallback_secret_key_not_cached(self):
+        original_key = settings.SECRET_KEY
+        with override_settings(
+            SECRET_KEY="rotated", SECRET_KEY_FALLBACKS=[original_key]
+        ):
+            self.authenticate()
+            with self.assertNumQueries(1):
+                _, result = self.authenticate()
+        self.assertEqual(result, self.token)
+
+
 class TestAuthWiring(TestV3Base, TestCase):
     def test_every_operation_declares_auth_explicitly(self):
 
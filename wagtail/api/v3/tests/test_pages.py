@@ -3,7 +3,9 @@ from io import StringIO
 
 import swapper
 from django.core import management
+from django.db import connection
 from django.test import TestCase, TransactionTestCase, override_settings, tag
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from wagtail.api.v3.tests.base import TestV3Base
@@ -173,6 +175,59 @@ class TestV3PageListing(TestV3PageListingBase, TestCase):
         content = self.get_response(limit=5).json()
         self.assertLessEqual(len(content["items"]), 5)
 
+    def get_page_ids_by_cursor(self, **params):
+        page_ids = []
+        cursor = ""
+        while cursor is not None:
+            response = self.get_response(cursor=cursor, **params)
+            self.assertEqual(response.status_code, 200)
+            content = response.json()
+            page_ids.extend(self.get_page_id_list(content))
+            cursor = content["next_cursor"]
+        return page_ids
+
+    def test_cursor_returns_all_pages(self):
+        self.assertEqual(self.get_page_ids_by_cursor(limit=3), self.get_all_page_ids())
+
+    def test_cursor_ordering(self):
+        page_ids = self.get_page_ids_by_cursor(limit=3, order="-first_published_at")
+        pages = Page.objects.in_bulk(page_ids)
+        self.assertEqual(
+            page_ids,
+            sorted(
+                page_ids,
+                key=lambda page_id: (pages[page_id].first_published_at, page_id),
+                reverse=True,
+            ),
+        )
+
+    def test_cursor_skips_count(self):
+        content = self.get_response(cursor="", limit=2).json()
+        self.assertEqual(len(content["items"]), 2)
+        self.assertIsNone(content["count"])
+        self.assertIsNotNone(content["next_cursor"])
+
+    def test_cursor_with_count(self):
+        content = self.get_response(cursor="", limit=2, count=True).json()
+        self.assertEqual(content["count"], get_total_page_count())
+
+    def test_offset_without_count(self):
+        content = self.get_response(count=False).json()
+        self.assertIsNone(content["count"])
+        self.assertIsNone(content["next_cursor"])
+
+    def test_cursor_with_offset(self):
+        response = self.get_response(cursor="", offset=2)
+        self.assert_problem_response(response, status_code=400)
+
+    def test_cursor_ordering_by_unindexed_field(self):
+        response = self.get_response(cursor="", order="title")
+        self.assert_problem_response(response, status_code=400)
+
+    def test_invalid_cursor(self):
+        response = self.get_response(cursor="abc")
+        self.assert_problem_response(response, status_code=400)
+
 
 class TestV3PageListingFilters(TestV3PageListingBase, TestCase):
     def test_type_filter_items_are_all_blog_entries(self):
@@ -183,6 +238,15 @@ class TestV3PageListingFilters(TestV3PageListingBase, TestCase):
         for page in content["items"]:
             self.assertEqual(page["meta"]["type"], "demosite.BlogEntryPage")
 
+    def test_type_filter_does_not_load_api_fields(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.get_response(type="demosite.BlogEntryPage")
+
+        self.assertEqual(response.status_code, 200)
+        body_column = connection.ops.quote_name("body")
+        for query in context.captured_queries:
+            self.assertNotIn(body_column, query["sql"])
+
     def test_type_filter_total_count(self):
         expected_count = models.BlogEntryPage.objects.live().public().count()
         response = self.get_response(type="demosite.BlogEntryPage")
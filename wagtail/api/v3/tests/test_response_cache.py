@@ -0,0 +1,218 @@
+from unittest import mock
+
+from django.contrib.auth.models import Group
+from django.core.cache import caches
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from wagtail.api.v3.cache import APIResponseCache
+from wagtail.api.v3.tests.base import TestV3Base
+from wagtail.coreutils import pending_on_commit_once
+from wagtail.models import PageViewRestriction
+from wagtail.test.demosite import models
+from wagtail.test.utils import PageFixturesMixin, WagtailTestUtils
+
+
+@override_settings(
+    CACHES={
+        "default": {
+            "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+            "LOCATION": "cache",
+        },
+        "responses": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        },
+    },
+    WAGTAILAPI_RESPONSE_CACHE="responses",
+)
+class TestAPIResponseCache(PageFixturesMixin, TestV3Base, WagtailTestUtils, TestCase):
+    fixtures = ["demosite.json"]
+
+    def setUp(self):
+        # The invalidation queued while loading the fixtures is never committed
+        pending_on_commit_once.callbacks = {}
+        caches["responses"].clear()
+        self.blog_entry = models.BlogEntryPage.objects.get(id=16)
+
+    def get_listing(self, **kwargs):
+        return self.client.get(reverse("wagtailapi_v3:list_pages"), **kwargs)
+
+    def get_detail(self, page_id=16, **kwargs):
+        return self.client.get(
+            reverse("wagtailapi_v3:detail_page", kwargs={"page_id": page_id}),
+            **kwargs,
+        )
+
+    def test_anonymous_response_cached(self):
+        response = self.get_listing()
+        self.assertEqual(response.status_code, 200)
+
+        with self.assertNumQueries(0):
+            cached_response = self.get_listing()
+        self.assertEqual(cached_response.status_code, 200)
+        self.assertEqual(cached_response.content, response.content)
+        self.assertEqual(cached_response["Content-Type"], response["Content-Type"])
+        self.assertEqual(cached_response["ETag"], response["ETag"])
+        self.assertEqual(cached_response["Last-Modified"], response["Last-Modified"])
+
+    def test_query_parameters_normalised(self):
+        url = reverse("wagtailapi_v3:list_pages")
+        self.client.get(f"{url}?limit=2&offset=1")
+
+        with self.assertNumQueries(0):
+            response = self.client.get(f"{url}?offset=1&limit=2")
+        self.assertEqual(len(response.json()["items"]), 2)
+
+        # Different parameters give a different response
+        other_response = self.client.get(f"{url}?offset=2&limit=2")
+        self.assertNotEqual(other_response.content, response.content)
+
+    def test_rich_text_format_cached_separately(self):
+        db_html = self.get_detail().json()["body"]
+        html = self.get_detail(query_params={"rich_text_format": "html"}).json()["body"]
+        self.assertNotEqual(db_html, html)
+
+        with override_settings(WAGTAILAPI_RICH_TEXT_FORMAT="html"):
+            self.assertEqual(self.get_detail().json()["body"], html)
+
+    def test_site_cached_separately(self):
+        self.get_listing()
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.get_listing(HTTP_HOST="other.example.com")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(queries.captured_queries)
+
+    def test_conditional_requests(self):
+        response = self.get_detail()
+
+        with self.assertNumQueries(0):
+            not_modified = self.get_detail(HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified.content, b"")
+
+        not_modified = self.get_detail(HTTP_IF_MODIFIED_SINCE=response["Last-Modified"])
+        self.assertEqual(not_modified.status_code, 304)
+
+        modified = self.get_detail(HTTP_IF_NONE_MATCH='"other"')
+        self.assertEqual(modified.status_code, 200)
+
+    def test_authenticated_response_not_cached(self):
+        user = self.login()
+        self.get_detail()
+        response = self.get_detail()
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("ETag", response)
+
+        # Authenticated requests don't get the anonymous response either
+        self.unauthorize()
+        self.get_detail()
+        self.login(user)
+        self.assertNotIn("ETag", self.get_detail())
+
+    def test_password_restricted_response_not_cached(self):
+        restriction = PageViewRestriction.objects.create(
+            page=self.blog_entry,
+            restriction_type=PageViewRestriction.PASSWORD,
+            password="password",  # noqa: S106
+        )
+        session = self.client.session
+        session[PageViewRestriction.passed_view_restrictions_session_key] = [
+            restriction.id
+        ]
+        session.save()
+
+        response = self.get_detail()
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("ETag", response)
+        self.assertIn(16, [item["id"] for item in self.get_listing().json()["items"]])
+
+        # Another client doesn't get the response of the client that passed
+        # the password
+        other_client = self.client_class()
+        self.assertEqual(
+            other_client.get(
+                reverse("wagtailapi_v3:detail_page", kwargs={"page_id": 16})
+            ).status_code,
+            404,
+        )
+        response = other_client.get(reverse("wagtailapi_v3:list_pages"))
+        self.assertNotIn(16, [item["id"] for item in response.json()["items"]])
+
+    def test_error_response_not_cached(self):
+        self.assertEqual(self.get_detail(page_id=100_000).status_code, 404)
+        response = self.get_detail(page_id=100_000)
+        self.assertEqual(response.status_code, 404)
+        self.assertNotIn("ETag", response)
+
+    def test_publish_invalidates_cache(self):
+        self.get_detail()
+
+        self.blog_entry.title = "Updated title"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.blog_entry.save_revision().publish()
+
+        self.assertEqual(self.get_detail().json()["title"], "Updated title")
+
+    def test_unpublish_invalidates_cache(self):
+        self.assertIn(16, [item["id"] for item in self.get_listing().json()["items"]])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.blog_entry.unpublish()
+
+        self.assertNotIn(
+            16, [item["id"] for item in self.get_listing().json()["items"]]
+        )
+        self.assertEqual(self.get_detail().status_code, 404)
+
+    def test_delete_invalidates_cache(self):
+        self.assertEqual(self.get_detail().status_code, 200)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.blog_entry.delete()
+
+        self.assertEqual(self.get_detail().status_code, 404)
+        self.assertNotIn(
+            16, [item["id"] for item in self.get_listing().json()["items"]]
+        )
+
+    def test_invalidated_once_per_transaction(self):
+        with mock.patch.object(
+            APIResponseCache, "_set_new_generation"
+        ) as set_new_generation:
+            with self.captureOnCommitCallbacks(execute=True):
+                for page in models.BlogEntryPage.objects.live():
+                    page.save_revision().publish()
+
+        set_new_generation.assert_called_once()
+
+    def test_view_restriction_invalidates_cache(self):
+        self.assertEqual(self.get_detail().status_code, 200)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            restriction = PageViewRestriction.objects.create(
+                page=self.blog_entry,
+                restriction_type=PageViewRestriction.GROUPS,
+            )
+            restriction.groups.add(Group.objects.first())
+
+        self.assertEqual(self.get_detail().status_code, 404)
+
+    def test_invalidated_on_commit(self):
+        self.get_detail()
+
+        with self.captureOnCommitCallbacks(execute=False):
+            self.blog_entry.title = "Updated title"
+            self.blog_entry.save_revision().publish()
+
+        # The change isn't visible to other connections until it's committed
+        self.assertNotEqual(self.get_detail().json()["title"], "Updated title")
+
+    @override_settings(WAGTAILAPI_RESPONSE_CACHE=None)
+    def test_disabled(self):
+        self.get_detail()
+        response = self.get_detail()
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("ETag", response)
@@ -754,6 +754,49 @@ class StreamValue(MutableSequence):
                 child_block, value, id=self._raw_data[i].get("id")
             )
 
+    @staticmethod
+    def bulk_prefetch_blocks(stream_values):
+        """
+        Populate _bound_blocks for all items across the given StreamValues that exist in
+        _raw_data but do not already exist in _bound_blocks.
+
+        This works like _prefetch_blocks, but batches the bulk_to_python calls across all of the
+        given values, so that (for example) the pages, images and documents referenced by chooser
+        blocks in a listing of many StreamValues are each fetched with a single query, rather
+        than one query per StreamValue.
+        """
+        # Group the values by their StreamBlock, as values from different StreamFields
+        # have different child block definitions
+        values_by_stream_block = defaultdict(list)
+        for stream_value in stream_values:
+            if isinstance(stream_value, StreamValue):
+                values_by_stream_block[id(stream_value.stream_block)].append(
+                    stream_value
+                )
+
+        for values in values_by_stream_block.values():
+            child_blocks = values[0].stream_block.child_blocks
+            # mapping of block type => list of (stream value, index within the stream)
+            # for all items that have not been converted yet
+            pending_items = defaultdict(list)
+            for stream_value in values:
+                for i, raw_item in enumerate(stream_value._raw_data):
+                    if (
+                        stream_value._bound_blocks[i] is None
+                        and raw_item["type"] in child_blocks
+                    ):
+                        pending_items[raw_item["type"]].append((stream_value, i))
+
+            for type_name, items in pending_items.items():
+                child_block = child_blocks[type_name]
+                converted_values = child_block.bulk_to_python(
+                    [stream_value._raw_data[i]["value"] for stream_value, i in items]
+                )
+                for (stream_value, i), value in zip(items, converted_values):
+                    stream_value._bound_blocks[i] = StreamValue.StreamChild(
+                        child_block, value, id=stream_value._raw_data[i].get("id")
+                    )
+
     def get_prep_value(self):
         prep_value = []
 
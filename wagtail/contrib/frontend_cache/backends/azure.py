@@ -15,6 +15,8 @@ __all__ = ["AzureBaseBackend", "AzureFrontDoorBackend", "AzureCdnBackend"]
 
 
 class AzureBaseBackend(BaseBackend):
+    CHUNK_SIZE = 100
+
     _package_name = ""
     _required_version = ""
     _installed_version = ""
@@ -48,7 +50,11 @@ class AzureBaseBackend(BaseBackend):
         return version_ver < required_ver
 
     def purge_batch(self, urls):
-        self._purge_content([self._get_path(url) for url in urls])
+        paths = [self._get_path(url) for url in urls]
+        # Break the paths in to chunks to fit within Azure's maximum number of
+        # content paths per purge request
+        for i in range(0, len(paths), self.CHUNK_SIZE):
+            self._purge_content(paths[i : i + self.CHUNK_SIZE])
 
     def purge(self, url):
         self.purge_batch([url])
@@ -1,11 +1,16 @@
 import logging
+from collections import namedtuple
 
 from django.http.request import validate_host
 
 logger = logging.getLogger("wagtail.frontendcache")
 
 
-__all__ = ["BaseBackend"]
+__all__ = ["BaseBackend", "PurgeFailure"]
+
+
+# A URL that a backend could not purge, along with a description of the error
+PurgeFailure = namedtuple("PurgeFailure", "url reason")
 
 
 class BaseBackend:
@@ -16,11 +21,20 @@ class BaseBackend:
     def purge(self, url) -> None:
         raise NotImplementedError
 
-    def purge_batch(self, urls) -> None:
-        # Fallback for backends that do not support batch purging
+    def purge_batch(self, urls) -> list[PurgeFailure] | None:
+        # Fallback for backends that do not support batch purging.
+        # Backends may return a list of PurgeFailure instances for the URLs
+        # that could not be purged.
         for url in urls:
             self.purge(url)
 
+    def purge_tags(self, tags) -> list[PurgeFailure] | None:
+        """
+        Purge all responses tagged with any of the given cache tags. Backends
+        that do not support tag-based invalidation only purge URLs, so this
+        does nothing by default.
+        """
+
     def invalidates_hostname(self, hostname) -> bool:
         """
         Can `hostname` be invalidated by this backend?
@@ -46,7 +46,7 @@ class CloudflareBackend(BaseBackend):
                 "The setting 'WAGTAILFRONTENDCACHE' requires both 'EMAIL' and 'API_KEY', or 'BEARER_TOKEN' to be specified."
             )
 
-    def _purge_urls(self, urls):
+    def _send_purge_request(self, data, items):
         try:
             purge_url = (
                 "https://api.cloudflare.com/client/v4/zones/{}/purge_cache".format(
@@ -62,8 +62,6 @@ class CloudflareBackend(BaseBackend):
                 headers["X-Auth-Email"] = self.cloudflare_email
                 headers["X-Auth-Key"] = self.cloudflare_api_key
 
-            data = {"files": urls}
-
             response = requests.post(purge_url, json=data, headers=headers, timeout=30)
 
             try:
@@ -72,17 +70,17 @@ class CloudflareBackend(BaseBackend):
                 if response.status_code != 200:
                     response.raise_for_status()
                 else:
-                    for url in urls:
+                    for item in items:
                         logger.error(
                             "Couldn't purge '%s' from Cloudflare. Unexpected JSON parse error.",
-                            url,
+                            item,
                         )
 
         except requests.exceptions.HTTPError as e:
-            for url in urls:
+            for item in items:
                 logging.exception(
                     "Couldn't purge '%s' from Cloudflare. HTTPError: %d",
-                    url,
+                    item,
                     e.response.status_code,
                 )
             return
@@ -91,14 +89,20 @@ class CloudflareBackend(BaseBackend):
             error_messages = ", ".join(
                 [str(err["message"]) for err in response_json["errors"]]
             )
-            for url in urls:
+            for item in items:
                 logger.error(
                     "Couldn't purge '%s' from Cloudflare. Cloudflare errors '%s'",
-                    url,
+                    item,
                     error_messages,
                 )
             return
 
+    def _purge_urls(self, urls):
+        self._send_purge_request({"files": urls}, urls)
+
+    def _purge_tags(self, tags):
+        self._send_purge_request({"tags": tags}, tags)
+
     def purge_batch(self, urls):
         # Break the batched URLs in to chunks to fit within Cloudflare's maximum size for
         # the purge_cache call (https://api.cloudflare.com/#zone-purge-files-by-url)
@@ -108,3 +112,9 @@ class CloudflareBackend(BaseBackend):
 
     def purge(self, url):
         self._purge_urls([url])
+
+    def purge_tags(self, tags):
+        tags = list(tags)
+        for i in range(0, len(tags), self.CHUNK_SIZE):
+            chunk = tags[i : i + self.CHUNK_SIZE]
+            self._purge_tags(chunk)
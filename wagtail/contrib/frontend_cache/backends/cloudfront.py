@@ -14,6 +14,10 @@ __all__ = ["CloudfrontBackend"]
 
 
 class CloudfrontBackend(BaseBackend):
+    # The maximum number of paths in a single invalidation
+    # (https://docs.aws.amazon.com/AmazonCloudFront/latest/DeveloperGuide/cloudfront-limits.html#limits-invalidations)
+    CHUNK_SIZE = 3000
+
     def __init__(self, params):
         import boto3
 
@@ -49,7 +53,11 @@ class CloudfrontBackend(BaseBackend):
                     paths_by_distribution_id[distribution_id].add(path)
 
         for distribution_id, paths in paths_by_distribution_id.items():
-            self._create_invalidation(distribution_id, list(paths))
+            paths = list(paths)
+            for i in range(0, len(paths), self.CHUNK_SIZE):
+                self._create_invalidation(
+                    distribution_id, paths[i : i + self.CHUNK_SIZE]
+                )
 
     def purge(self, url):
         self.purge_batch([url])
@@ -1,11 +1,14 @@
 import logging
-from urllib.error import HTTPError, URLError
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.client import HTTPConnection, HTTPException, HTTPSConnection
 from urllib.parse import urlsplit, urlunsplit
-from urllib.request import Request, urlopen
+from urllib.request import Request
 
 from wagtail import __version__
 
-from .base import BaseBackend
+from .base import BaseBackend, PurgeFailure
 
 logger = logging.getLogger("wagtail.frontendcache")
 
@@ -18,14 +21,89 @@ class PurgeRequest(Request):
         return "PURGE"
 
 
+class PurgeError(Exception):
+    """
+    Raised when a purge request could not be completed. ``retryable``
+    indicates whether sending the same request again may succeed.
+    """
+
+    def __init__(self, reason, retryable=True):
+        super().__init__(reason)
+        self.reason = reason
+        self.retryable = retryable
+
+
 class HTTPBackend(BaseBackend):
+    """
+    Sends a ``PURGE`` request for each URL to each of the cache servers given
+    in ``LOCATION``.
+
+    Requests are sent over keep-alive connections, which are pooled per cache
+    server and shared between up to ``WORKERS`` threads. Requests that fail
+    due to a connection error or a 5xx response are retried up to ``RETRIES``
+    times, waiting ``RETRY_BACKOFF`` seconds before the first retry and
+    doubling the wait for each subsequent one.
+    """
+
+    # The maximum number of tags to send in a single purge request
+    TAG_CHUNK_SIZE = 100
+
     def __init__(self, params):
         super().__init__(params)
-        location_url_parsed = urlsplit(params.pop("LOCATION"))
+        locations = params.pop("LOCATION")
+        if isinstance(locations, str):
+            locations = [locations]
+        self.cache_locations = [urlsplit(location) for location in locations]
+
+        location_url_parsed = self.cache_locations[0]
         self.cache_scheme = location_url_parsed.scheme
         self.cache_netloc = location_url_parsed.netloc
 
-    def purge(self, url):
+        self.timeout = params.pop("TIMEOUT", 10)
+        self.workers = params.pop("WORKERS", 4)
+        self.retries = params.pop("RETRIES", 2)
+        self.retry_backoff = params.pop("RETRY_BACKOFF", 0.5)
+        self.tag_header = params.pop("TAG_HEADER", "xkey-purge")
+
+        # Idle connections, keyed by (scheme, netloc) of the cache server
+        self._connections = {}
+
+    def _get_connection(self, location):
+        """
+        Return a ``(connection, reused)`` pair, taking an idle connection to the
+        given cache server from the pool if there is one.
+        """
+        idle_connections = self._connections.setdefault(
+            (location.scheme, location.netloc), queue.LifoQueue()
+        )
+        try:
+            return idle_connections.get_nowait(), True
+        except queue.Empty:
+            pass
+
+        connection_class = (
+            HTTPSConnection if location.scheme == "https" else HTTPConnection
+        )
+        return connection_class(location.netloc, timeout=self.timeout), False
+
+    def _release_connection(self, location, connection):
+        self._connections[(location.scheme, location.netloc)].put(connection)
+
+    def close(self):
+        """
+        Close all idle connections to the cache servers.
+        """
+        for idle_connections in self._connections.values():
+            while True:
+                try:
+                    idle_connections.get_nowait().close()
+                except queue.Empty:
+                    break
+
+    def _get_url_purge_request(self, url):
+        """
+        Return the ``(path, headers)`` of the purge request for the given URL.
+        """
         url_parsed = urlsplit(url)
         host = url_parsed.hostname
 
@@ -33,32 +111,141 @@ class HTTPBackend(BaseBackend):
         if url_parsed.port:
             host += ":" + str(url_parsed.port)
 
-        request = PurgeRequest(
-            url=urlunsplit(
-                [
-                    self.cache_scheme,
-                    self.cache_netloc,
-                    url_parsed.path,
-                    url_parsed.query,
-                    url_parsed.fragment,
-                ]
-            ),
-            headers={
-                "Host": host,
-                "User-Agent": "Wagtail-frontendcache/" + __version__,
-            },
-        )
+        path = urlunsplit(["", "", url_parsed.path or "/", url_parsed.query, ""])
+        headers = {
+            "Host": host,
+            "User-Agent": "Wagtail-frontendcache/" + __version__,
+        }
+        return path, headers
 
+    def _send_purge_request(self, location, path, headers):
+        connection, reused = self._get_connection(location)
         try:
-            urlopen(request)  # noqa: S310 - scheme is controlled through configured backend LOCATION
-        except HTTPError as e:
-            logger.error(
-                "Couldn't purge '%s' from HTTP cache. HTTPError: %d %s",
-                url,
-                e.code,
-                e.reason,
+            try:
+                connection.request("PURGE", path, headers=headers)
+                response = connection.getresponse()
+            except (OSError, HTTPException):
+                if not reused:
+                    raise
+
+                # The cache server may have closed the idle connection, so
+                # retry once on a new one
+                connection.close()
+                connection, reused = self._get_connection(location)
+                connection.request("PURGE", path, headers=headers)
+                response = connection.getresponse()
+
+            response.read()
+        except (OSError, HTTPException) as e:
+            connection.close()
+            raise PurgeError("URLError: %s" % e) from e
+
+        if response.will_close:
+            connection.close()
+        else:
+            self._release_connection(location, connection)
+
+        if response.status >= 400:
+            raise PurgeError(
+                "HTTPError: %d %s" % (response.status, response.reason),
+                retryable=response.status >= 500,
             )
-        except URLError as e:
+
+    def _purge_from_location(self, location, item, path, headers):
+        """
+        Send a purge request for the given URL or tags to one cache server,
+        retrying if necessary, and return a ``PurgeFailure`` if it failed.
+        """
+        for attempt in range(self.retries + 1):
+            if attempt:
+                time.sleep(self.retry_backoff * 2 ** (attempt - 1))
+
+            try:
+                self._send_purge_request(location, path, headers)
+                return None
+            except PurgeError as e:
+                if not e.retryable or attempt == self.retries:
+                    logger.error(
+                        "Couldn't purge '%s' from HTTP cache. %s", item, e.reason
+                    )
+                    return PurgeFailure(item, e.reason)
+
+    def _send_purge_requests(self, purge_requests):
+        """
+        Send each of the given ``(location, item, path, headers)`` purge
+        requests, and return a list of ``PurgeFailure`` instances for those
+        that failed.
+        """
+        try:
+            if self.workers > 1 and len(purge_requests) > 1:
+                with ThreadPoolExecutor(
+                    max_workers=min(self.workers, len(purge_requests))
+                ) as executor:
+                    results = list(
+                        executor.map(
+                            lambda purge_request: self._purge_from_location(
+                                *purge_request
+                            ),
+                            purge_requests,
+                        )
+                    )
+            else:
+                results = [
+                    self._purge_from_location(*purge_request)
+                    for purge_request in purge_requests
+                ]
+        finally:
+            self.close()
+
+        failures = [failure for failure in results if failure is not None]
+        if failures:
             logger.error(
-                "Couldn't purge '%s' from HTTP cache. URLError: %s", url, e.reason
+                "Couldn't purge %d of %d item(s) from HTTP cache",
+                len(failures),
+                len(purge_requests),
             )
+        return failures
+
+    def _get_url_purge_requests(self, urls):
+        return [
+            (location, url, *self._get_url_purge_request(url))
+            for url in urls
+            for location in self.cache_locations
+        ]
+
+    def purge(self, url):
+        self._send_purge_requests(self._get_url_purge_requests([url]))
+
+    def purge_batch(self, urls):
+        """
+        Purge all the URLs from each cache server, and return a list of
+        ``PurgeFailure`` instances for those that could not be purged.
+        """
+        if getattr(self.purge, "__func__", None) is not _default_purge:
+            # purge() has been overridden, so keep calling it for each URL
+            return super().purge_batch(urls)
+
+        return self._send_purge_requests(self._get_url_purge_requests(urls))
+
+    def purge_tags(self, tags):
+        """
+        Purge all responses tagged with any of the given tags from each cache
+        server, by sending ``PURGE`` requests with the tags in the
+        ``TAG_HEADER`` header (as expected by the Varnish ``xkey`` module).
+        """
+        tags = list(tags)
+        purge_requests = []
+        for i in range(0, len(tags), self.TAG_CHUNK_SIZE):
+            chunk = " ".join(tags[i : i + self.TAG_CHUNK_SIZE])
+            headers = {
+                self.tag_header: chunk,
+                "User-Agent": "Wagtail-frontendcache/" + __version__,
+            }
+            purge_requests.extend(
+                (location, chunk, "/", headers) for location in self.cache_locations
+            )
+
+        return self._send_purge_requests(purge_requests)
+
+
+_default_purge = HTTPBackend.purge
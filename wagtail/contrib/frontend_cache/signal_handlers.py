@@ -1,16 +1,81 @@
 import swapper
 from django.apps import apps
+from django.core.signals import request_started
+from django.db.models.signals import post_delete, post_init, post_save
 
-from wagtail.contrib.frontend_cache.utils import purge_page_from_cache
+from wagtail.contrib.frontend_cache.utils import (
+    cache_tags_enabled,
+    collect_cache_tag,
+    get_cache_tag,
+    get_page_cache_tags,
+    is_collecting_cache_tags,
+    purge_page_from_cache,
+    purge_tags_from_cache,
+    stop_collecting_cache_tags,
+)
 from wagtail.signals import page_published, page_unpublished
 
 
 def page_published_signal_handler(instance, **kwargs):
     purge_page_from_cache(instance)
+    if cache_tags_enabled():
+        purge_tags_from_cache(get_page_cache_tags(instance))
 
 
 def page_unpublished_signal_handler(instance, **kwargs):
     purge_page_from_cache(instance)
+    if cache_tags_enabled():
+        purge_tags_from_cache(get_page_cache_tags(instance))
+
+
+def is_cache_tagged_model(model):
+    Page = apps.get_model(swapper.get_model_name("wagtailcore", "Page"))
+    return issubclass(model, Page) or hasattr(model, "snippet_viewset")
+
+
+def snippet_changed_signal_handler(sender, instance, **kwargs):
+    # Don't purge while loading fixtures
+    if kwargs.get("raw", False):
+        return
+
+    if (
+        cache_tags_enabled()
+        and hasattr(sender, "snippet_viewset")
+        and instance.pk is not None
+    ):
+        purge_tags_from_cache([get_cache_tag(sender, instance.pk)])
+
+
+def post_init_cache_tag_handler(sender, instance, **kwargs):
+    # Record the pages and snippets loaded while a page is being served
+    if (
+        is_collecting_cache_tags()
+        and instance.pk is not None
+        and is_cache_tagged_model(sender)
+    ):
+        collect_cache_tag(sender, instance.pk)
+
+
+def request_started_cache_tag_handler(**kwargs):
+    # A template response that failed to render never stops the collection of
+    # its page's tags, so make sure nothing is left collecting from it
+    stop_collecting_cache_tags()
+
+
+def register_cache_tag_collection():
+    """
+    Start recording the cache tags of the pages and snippets loaded while
+    serving pages. This is only connected once cache tags are first used, to
+    avoid running a handler for every model instance otherwise.
+    """
+    post_init.connect(
+        post_init_cache_tag_handler,
+        dispatch_uid="wagtailfrontendcache_post_init_cache_tag",
+    )
+    request_started.connect(
+        request_started_cache_tag_handler,
+        dispatch_uid="wagtailfrontendcache_request_started_cache_tag",
+    )
 
 
 def register_signal_handlers():
@@ -22,3 +87,8 @@ def register_signal_handlers():
     for model in indexed_models:
         page_published.connect(page_published_signal_handler, sender=model)
         page_unpublished.connect(page_unpublished_signal_handler, sender=model)
+
+    # Snippets may be registered after this app is ready, so check for them
+    # in the handler instead
+    post_save.connect(snippet_changed_signal_handler)
+    post_delete.connect(snippet_changed_signal_handler)
@@ -81,3 +81,15 @@ def purge_urls_from_cache_task(urls, backend_settings=None, backends=None):
                 logger.info("[%s] Purging URL: %s", backend_name, url)
 
             backend.purge_batch(urls)
+
+
+@task()
+def purge_tags_from_cache_task(tags, backend_settings=None, backends=None):
+    if not tags:
+        return
+
+    backends = get_backends(backend_settings, backends)
+
+    for backend_name, backend in backends.items():
+        logger.info("[%s] Purging tags: %s", backend_name, ", ".join(tags))
+        backend.purge_tags(tags)
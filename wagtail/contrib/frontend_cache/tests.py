@@ -1,10 +1,10 @@
 from unittest import mock
-from urllib.error import HTTPError, URLError
 
 import requests
 from azure.mgmt.cdn import CdnManagementClient
 from azure.mgmt.frontdoor import FrontDoorManagementClient
 from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
 from django.test import SimpleTestCase, TestCase
 from django.test.utils import override_settings
 
@@ -15,16 +15,20 @@ from wagtail.contrib.frontend_cache.backends import (
     CloudflareBackend,
     CloudfrontBackend,
     HTTPBackend,
+    PurgeFailure,
 )
 from wagtail.contrib.frontend_cache.utils import get_backends
-from wagtail.test.testapp.models import EventIndex, EventPage
+from wagtail.models import ReferenceIndex
+from wagtail.test.testapp.models import Advert, EventIndex, EventPage
 from wagtail.test.utils import Page, PageFixturesMixin
 from wagtail.utils.deprecation import RemovedInWagtail90Warning
 
 from .utils import (
     PurgeBatch,
+    is_collecting_cache_tags,
     purge_page_from_cache,
     purge_pages_from_cache,
+    purge_tags_from_cache,
     purge_url_from_cache,
     purge_urls_from_cache,
 )
@@ -329,20 +333,16 @@ class TestBackendConfiguration(SimpleTestCase):
         self.assertEqual(call_args[1], ["/home/events/christmas/?test=1", "/blog/"])
 
     def test_http(self):
-        """Test that `HTTPBackend.purge` works when urlopen succeeds"""
-        self._test_http_with_side_effect(urlopen_side_effect=None)
+        """Test that `HTTPBackend.purge` works when the cache server responds with 200"""
+        self._test_http_with_side_effect(request_side_effect=None)
 
     def test_http_httperror(self):
-        """Test that `HTTPBackend.purge` can handle `HTTPError`"""
-        http_error = HTTPError(
-            url="http://localhost:8000/home/events/christmas/",
-            code=500,
-            msg="Internal Server Error",
-            hdrs={},
-            fp=None,
-        )
+        """Test that `HTTPBackend.purge` can handle an error response"""
         with self.assertLogs(level="ERROR") as log_output:
-            self._test_http_with_side_effect(urlopen_side_effect=http_error)
+            self._test_http_with_side_effect(
+                request_side_effect=None,
+                response_status=(500, "Internal Server Error"),
+            )
 
         self.assertIn(
             "Couldn't purge 'http://www.wagtail.org/home/events/christmas/' from HTTP cache. HTTPError: 500 Internal Server Error",
@@ -350,40 +350,54 @@ class TestBackendConfiguration(SimpleTestCase):
         )
 
     def test_http_urlerror(self):
-        """Test that `HTTPBackend.purge` can handle `URLError`"""
-        url_error = URLError(reason="just for tests")
+        """Test that `HTTPBackend.purge` can handle connection errors"""
+        url_error = ConnectionRefusedError("just for tests")
         with self.assertLogs(level="ERROR") as log_output:
-            self._test_http_with_side_effect(urlopen_side_effect=url_error)
+            self._test_http_with_side_effect(request_side_effect=url_error)
         self.assertIn(
             "Couldn't purge 'http://www.wagtail.org/home/events/christmas/' from HTTP cache. URLError: just for tests",
             log_output.output[0],
         )
 
-    @mock.patch("wagtail.contrib.frontend_cache.backends.http.urlopen")
-    def _test_http_with_side_effect(self, urlopen_mock, urlopen_side_effect):
+    @mock.patch("wagtail.contrib.frontend_cache.backends.http.HTTPConnection")
+    def _test_http_with_side_effect(
+        self, connection_mock, request_side_effect, response_status=(200, "OK")
+    ):
         # given a backends configuration with one HTTP backend
         backends = get_backends(
             backend_settings={
                 "varnish": {
                     "BACKEND": "wagtail.contrib.frontend_cache.backends.HTTPBackend",
                     "LOCATION": "http://localhost:8000",
+                    "RETRIES": 0,
                 },
             }
         )
         self.assertEqual(set(backends.keys()), {"varnish"})
         self.assertIsInstance(backends["varnish"], HTTPBackend)
-        # and mocked urlopen that may or may not raise network-related exception
-        urlopen_mock.side_effect = urlopen_side_effect
+        # and a mocked connection that may or may not raise network-related exception
+        connection = connection_mock.return_value
+        connection.request.side_effect = request_side_effect
+        connection.getresponse.return_value.status = response_status[0]
+        connection.getresponse.return_value.reason = response_status[1]
 
         # when making a purge request
         backends.get("varnish").purge("http://www.wagtail.org/home/events/christmas/")
 
         # then no exception is raised
-        # and mocked urlopen is called with a proper purge request
-        self.assertEqual(urlopen_mock.call_count, 1)
-        (purge_request,), _call_kwargs = urlopen_mock.call_args
+        # and the mocked connection is sent a proper purge request
+        connection_mock.assert_called_once_with("localhost:8000", timeout=10)
+        self.assertEqual(connection.request.call_count, 1)
         self.assertEqual(
-            purge_request.full_url, "http://localhost:8000/home/events/christmas/"
+            connection.request.call_args,
+            mock.call(
+                "PURGE",
+                "/home/events/christmas/",
+                headers={
+                    "Host": "www.wagtail.org",
+                    "User-Agent": mock.ANY,
+                },
+            ),
         )
 
     def test_cloudfront_validate_distribution_id(self):
@@ -468,6 +482,39 @@ class TestBackendConfiguration(SimpleTestCase):
             ["/?root=query", "/another/path", "/path/to/page?query=value"],
         )
 
+    @mock.patch(
+        "wagtail.contrib.frontend_cache.backends.cloudfront.CloudfrontBackend._create_invalidation"
+    )
+    def test_cloudfront_purge_batch_chunked(self, mock_create_invalidation):
+        backends = get_backends(
+            backend_settings={
+                "cloudfront": {
+                    "BACKEND": "wagtail.contrib.frontend_cache.backends.CloudfrontBackend",
+                    "DISTRIBUTION_ID": "frontend",
+                    "AWS_ACCESS_KEY_ID": "test-access-key",
+                    "AWS_SECRET_ACCESS_KEY": "test-secret-key",
+                },
+            }
+        )
+        backends["cloudfront"].CHUNK_SIZE = 2
+
+        backends["cloudfront"].purge_batch(
+            [f"http://www.example.com/page-{i}/" for i in range(5)]
+        )
+
+        self.assertEqual(
+            [len(call.args[1]) for call in mock_create_invalidation.call_args_list],
+            [2, 2, 1],
+        )
+        self.assertEqual(
+            {
+                path
+                for call in mock_create_invalidation.call_args_list
+                for path in call.args[1]
+            },
+            {f"/page-{i}/" for i in range(5)},
+        )
+
     def test_multiple(self):
         backends = get_backends(
             backend_settings={
@@ -515,13 +562,197 @@ class TestBackendConfiguration(SimpleTestCase):
         self.assertEqual(backends["default"].cache_netloc, "localhost:8000")
 
 
+@mock.patch("wagtail.contrib.frontend_cache.backends.http.time.sleep")
+@mock.patch("wagtail.contrib.frontend_cache.backends.http.HTTPConnection")
+class TestHTTPBackend(SimpleTestCase):
+    def get_backend(self, **params):
+        return HTTPBackend({"LOCATION": "http://localhost:8000", **params})
+
+    def mock_connections(self, connection_mock, get_status=lambda path: 200):
+        """
+        Make each connection created by the backend a separate mock, which
+        responds to requests with the status returned by ``get_status``.
+        """
+        connections = []
+
+        def create_connection(netloc, timeout):
+            connection = mock.MagicMock(netloc=netloc)
+
+            def request(method, path, headers):
+                status = get_status(path)
+                connection.getresponse.return_value = mock.Mock(
+                    status=status, reason="Error", will_close=False
+                )
+
+            connection.request.side_effect = request
+            connections.append(connection)
+            return connection
+
+        connection_mock.side_effect = create_connection
+        return connections
+
+    def test_connections_are_reused(self, connection_mock, sleep_mock):
+        connections = self.mock_connections(connection_mock)
+
+        failures = self.get_backend(WORKERS=1).purge_batch(
+            [
+                "http://localhost/",
+                "http://localhost/events/",
+                "http://localhost/events/christmas/",
+            ]
+        )
+
+        self.assertEqual(failures, [])
+        self.assertEqual(len(connections), 1)
+        self.assertEqual(
+            [call.args[1] for call in connections[0].request.call_args_list],
+            ["/", "/events/", "/events/christmas/"],
+        )
+        # Connections are closed once the batch has been purged
+        connections[0].close.assert_called_once()
+
+    def test_purge_from_multiple_locations(self, connection_mock, sleep_mock):
+        connections = self.mock_connections(connection_mock)
+
+        failures = self.get_backend(
+            LOCATION=["http://varnish-1:8000", "http://varnish-2:8000"], WORKERS=1
+        ).purge_batch(["http://localhost/", "http://localhost/events/"])
+
+        self.assertEqual(failures, [])
+        self.assertEqual(
+            {
+                (connection.netloc, call.args[1])
+                for connection in connections
+                for call in connection.request.call_args_list
+            },
+            {
+                ("varnish-1:8000", "/"),
+                ("varnish-1:8000", "/events/"),
+                ("varnish-2:8000", "/"),
+                ("varnish-2:8000", "/events/"),
+            },
+        )
+
+    def test_purge_concurrently(self, connection_mock, sleep_mock):
+        urls = [f"http://localhost/page-{i}/" for i in range(20)]
+        connections = self.mock_connections(
+            connection_mock,
+            get_status=lambda path: 500 if path == "/page-5/" else 200,
+        )
+
+        with self.assertLogs("wagtail.frontendcache", level="ERROR"):
+            failures = self.get_backend(WORKERS=4, RETRIES=0).purge_batch(urls)
+
+        self.assertEqual(
+            failures,
+            [PurgeFailure("http://localhost/page-5/", "HTTPError: 500 Error")],
+        )
+        self.assertLessEqual(len(connections), 4)
+        self.assertEqual(
+            sum(connection.request.call_count for connection in connections), 20
+        )
+
+    def test_retry_with_backoff(self, connection_mock, sleep_mock):
+        statuses = [503, 502, 200]
+        connections = self.mock_connections(
+            connection_mock, get_status=lambda path: statuses.pop(0)
+        )
+
+        failures = self.get_backend(RETRIES=2, RETRY_BACKOFF=0.5).purge_batch(
+            ["http://localhost/"]
+        )
+
+        self.assertEqual(failures, [])
+        self.assertEqual(connections[0].request.call_count, 3)
+        self.assertEqual(sleep_mock.call_args_list, [mock.call(0.5), mock.call(1.0)])
+
+    def test_client_errors_are_not_retried(self, connection_mock, sleep_mock):
+        connections = self.mock_connections(
+            connection_mock, get_status=lambda path: 405
+        )
+
+        with self.assertLogs("wagtail.frontendcache", level="ERROR"):
+            failures = self.get_backend(RETRIES=2).purge_batch(["http://localhost/"])
+
+        self.assertEqual(
+            failures, [PurgeFailure("http://localhost/", "HTTPError: 405 Error")]
+        )
+        self.assertEqual(connections[0].request.call_count, 1)
+        sleep_mock.assert_not_called()
+
+    def test_purge_tags(self, connection_mock, sleep_mock):
+        connections = self.mock_connections(connection_mock)
+        backend = self.get_backend(
+            LOCATION=["http://varnish-1:8000", "http://varnish-2:8000"], WORKERS=1
+        )
+        backend.TAG_CHUNK_SIZE = 2
+
+        failures = backend.purge_tags(
+            ["wagtailcore.page-1", "wagtailcore.page-2", "tests.advert-1"]
+        )
+
+        self.assertEqual(failures, [])
+        self.assertEqual(
+            {
+                (connection.netloc, call.args[1], call.kwargs["headers"]["xkey-purge"])
+                for connection in connections
+                for call in connection.request.call_args_list
+            },
+            {
+                ("varnish-1:8000", "/", "wagtailcore.page-1 wagtailcore.page-2"),
+                ("varnish-1:8000", "/", "tests.advert-1"),
+                ("varnish-2:8000", "/", "wagtailcore.page-1 wagtailcore.page-2"),
+                ("varnish-2:8000", "/", "tests.advert-1"),
+            },
+        )
+
+    def test_reconnect_if_idle_connection_was_closed(self, connection_mock, sleep_mock):
+        def get_status(path):
+            # The cache server closes the first connection after one request
+            if path == "/events/" and len(connections) == 1:
+                raise ConnectionResetError
+            return 200
+
+        connections = self.mock_connections(connection_mock, get_status=get_status)
+
+        failures = self.get_backend(RETRIES=0, WORKERS=1).purge_batch(
+            ["http://localhost/", "http://localhost/events/"]
+        )
+
+        self.assertEqual(failures, [])
+        self.assertEqual(len(connections), 2)
+        self.assertEqual(connections[1].request.call_args.args[1], "/events/")
+
+    def test_purge_batch_calls_overridden_purge(self, connection_mock, sleep_mock):
+        connections = self.mock_connections(connection_mock)
+        purged_urls = []
+
+        class LoggingHTTPBackend(HTTPBackend):
+            def purge(self, url):
+                purged_urls.append(url)
+                super().purge(url)
+
+        LoggingHTTPBackend({"LOCATION": "http://localhost:8000"}).purge_batch(
+            ["http://localhost/", "http://localhost/events/"]
+        )
+
+        self.assertEqual(purged_urls, ["http://localhost/", "http://localhost/events/"])
+        self.assertEqual(
+            sum(connection.request.call_count for connection in connections), 2
+        )
+
+
 PURGED_URLS = set()
+PURGED_TAGS = set()
 
 
 class MockBackend(BaseBackend):
     def purge(self, url):
         PURGED_URLS.add(url)
 
+    def purge_tags(self, tags):
+        PURGED_TAGS.update(tags)
+
 
 class MockCloudflareBackend(CloudflareBackend):
     def _purge_urls(self, urls):
@@ -530,6 +761,12 @@ class MockCloudflareBackend(CloudflareBackend):
 
         PURGED_URLS.update(urls)
 
+    def _purge_tags(self, tags):
+        if len(tags) > self.CHUNK_SIZE:
+            raise Exception("Cloudflare backend is not chunking requests as expected")
+
+        PURGED_TAGS.update(tags)
+
 
 @override_settings(
     WAGTAILFRONTENDCACHE={
@@ -726,6 +963,26 @@ class TestCloudflareCachePurgingFunctions(TestCase):
 
         self.assertCountEqual(PURGED_URLS, set(urls))
 
+    def test_cloudflare_purge_tags_chunked(self):
+        PURGED_TAGS.clear()
+        tags = [f"wagtailcore.page-{i}" for i in range(1, 65)]
+        with self.captureOnCommitCallbacks(execute=True):
+            purge_tags_from_cache(tags)
+
+        self.assertEqual(PURGED_TAGS, set(tags))
+
+    @mock.patch("wagtail.contrib.frontend_cache.backends.cloudflare.requests.post")
+    def test_cloudflare_purge_tags_request(self, requests_post_mock):
+        requests_post_mock.return_value.json.return_value = {"success": True}
+        backend = CloudflareBackend({"ZONEID": "zone", "BEARER_TOKEN": "token"})
+
+        backend.purge_tags(["wagtailcore.page-1", "tests.advert-1"])
+
+        self.assertEqual(
+            requests_post_mock.call_args.kwargs["json"],
+            {"tags": ["wagtailcore.page-1", "tests.advert-1"]},
+        )
+
 
 @override_settings(
     WAGTAILFRONTENDCACHE={
@@ -824,6 +1081,213 @@ class TestCachePurgingSignals(PageFixturesMixin, TestCase):
         )
 
 
+@override_settings(
+    WAGTAILFRONTENDCACHE={
+        "varnish": {
+            "BACKEND": "wagtail.contrib.frontend_cache.tests.MockBackend",
+        },
+    },
+    WAGTAILFRONTENDCACHE_CACHE_TAGS=True,
+)
+class TestCacheTags(PageFixturesMixin, TestCase):
+    fixtures = ["test.json"]
+
+    def setUp(self):
+        PURGED_URLS.clear()
+        PURGED_TAGS.clear()
+
+    def get_response_tags(self, path):
+        response = self.client.get(path)
+        self.assertEqual(response.status_code, 200)
+        tags = set(response["Surrogate-Key"].split(" "))
+        self.assertEqual(set(response["Cache-Tag"].split(",")), tags)
+        return tags
+
+    def test_page_response_tags(self):
+        christmas_page = EventPage.objects.get(url_path="/home/events/christmas/")
+        ReferenceIndex.create_or_update_for_object(christmas_page)
+
+        tags = self.get_response_tags("/events/christmas/")
+
+        # The page itself and the image it refers to
+        self.assertIn(f"wagtailcore.page-{christmas_page.pk}", tags)
+        self.assertIn(f"wagtailimages.image-{christmas_page.feed_image_id}", tags)
+
+    def test_page_response_tags_include_pages_loaded_while_rendering(self):
+        events_index = EventIndex.objects.get(url_path="/home/events/")
+
+        tags = self.get_response_tags("/events/")
+
+        self.assertIn(f"wagtailcore.page-{events_index.pk}", tags)
+        for event_page in events_index.get_events():
+            self.assertIn(f"wagtailcore.page-{event_page.pk}", tags)
+
+    def test_page_loaded_outside_of_serving_is_not_tagged(self):
+        self.get_response_tags("/events/")
+
+        self.assertFalse(is_collecting_cache_tags())
+
+    def test_failed_render_does_not_leave_tags_collecting(self):
+        with mock.patch(
+            "django.template.response.SimpleTemplateResponse.rendered_content",
+            new_callable=mock.PropertyMock,
+            side_effect=ValueError,
+        ):
+            with self.assertRaises(ValueError):
+                self.client.get("/events/")
+
+        # Objects loaded by the next request aren't added to the failed
+        # page's tags
+        self.client.get("/admin/login/")
+        self.assertFalse(is_collecting_cache_tags())
+
+    @override_settings(WAGTAILFRONTENDCACHE_CACHE_TAGS=False)
+    def test_no_tags_if_disabled(self):
+        response = self.client.get("/events/")
+
+        self.assertNotIn("Surrogate-Key", response)
+        self.assertNotIn("Cache-Tag", response)
+
+    def test_purge_tags_on_publish(self):
+        page = EventPage.objects.get(url_path="/home/events/christmas/")
+        with self.captureOnCommitCallbacks(execute=True):
+            page.save_revision().publish()
+
+        self.assertEqual(
+            PURGED_TAGS,
+            {
+                f"wagtailcore.page-{page.pk}",
+                f"wagtailcore.page-{page.get_parent().pk}",
+            },
+        )
+        self.assertIn("http://localhost/events/christmas/", PURGED_URLS)
+
+    def test_purge_tags_on_unpublish(self):
+        page = EventPage.objects.get(url_path="/home/events/christmas/")
+        with self.captureOnCommitCallbacks(execute=True):
+            page.unpublish()
+
+        self.assertIn(f"wagtailcore.page-{page.pk}", PURGED_TAGS)
+
+    def test_purge_tags_on_snippet_save_and_delete(self):
+        advert = Advert.objects.create(text="Buy now")
+        self.assertEqual(PURGED_TAGS, {f"tests.advert-{advert.pk}"})
+
+        PURGED_TAGS.clear()
+        advert_pk = advert.pk
+        advert.delete()
+        self.assertEqual(PURGED_TAGS, {f"tests.advert-{advert_pk}"})
+
+    @override_settings(WAGTAILFRONTENDCACHE_CACHE_TAGS=False)
+    def test_no_tags_purged_if_disabled(self):
+        Advert.objects.create(text="Buy now")
+        page = EventPage.objects.get(url_path="/home/events/christmas/")
+        with self.captureOnCommitCallbacks(execute=True):
+            page.save_revision().publish()
+
+        self.assertEqual(PURGED_TAGS, set())
+
+
+@override_settings(
+    WAGTAILFRONTENDCACHE={
+        "varnish": {
+            "BACKEND": "wagtail.contrib.frontend_cache.tests.MockBackend",
+        },
+    },
+    WAGTAILFRONTENDCACHE_COALESCE_PURGES=True,
+    WAGTAILFRONTENDCACHE_CACHE_TAGS=True,
+)
+class TestCoalescedPurges(PageFixturesMixin, TestCase):
+    fixtures = ["test.json"]
+
+    def setUp(self):
+        PURGED_URLS.clear()
+        PURGED_TAGS.clear()
+
+    def test_purges_are_coalesced_per_transaction(self):
+        pages = EventPage.objects.live().specific()
+        with (
+            mock.patch(
+                "wagtail.contrib.frontend_cache.tasks.purge_urls_from_cache_task"
+            ) as url_task,
+            mock.patch(
+                "wagtail.contrib.frontend_cache.tasks.purge_tags_from_cache_task"
+            ) as tag_task,
+        ):
+            with self.captureOnCommitCallbacks(execute=True):
+                for page in pages:
+                    page.save_revision().publish()
+                purge_url_from_cache("http://localhost/events/")
+
+                url_task.enqueue.assert_not_called()
+
+        url_task.enqueue.assert_called_once()
+        urls, backend_settings, backends = url_task.enqueue.call_args.args
+        self.assertEqual(
+            set(urls),
+            {page.full_url for page in pages} | {"http://localhost/events/"},
+        )
+        self.assertIsNone(backend_settings)
+        self.assertIsNone(backends)
+
+        tag_task.enqueue.assert_called_once()
+        self.assertEqual(
+            set(tag_task.enqueue.call_args.args[0]),
+            {f"wagtailcore.page-{page.pk}" for page in pages}
+            | {f"wagtailcore.page-{page.get_parent().pk}" for page in pages},
+        )
+
+    def test_coalesced_purges_are_sent(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            purge_urls_from_cache(["http://localhost/foo", "http://localhost/bar"])
+            purge_url_from_cache("http://localhost/foo")
+            purge_tags_from_cache(["tests.advert-1"])
+
+            self.assertEqual(PURGED_URLS, set())
+
+        self.assertEqual(PURGED_URLS, {"http://localhost/foo", "http://localhost/bar"})
+        self.assertEqual(PURGED_TAGS, {"tests.advert-1"})
+
+    def test_purges_are_coalesced_per_backends(self):
+        with mock.patch(
+            "wagtail.contrib.frontend_cache.tasks.purge_urls_from_cache_task"
+        ) as url_task:
+            with self.captureOnCommitCallbacks(execute=True):
+                purge_url_from_cache("http://localhost/foo")
+                purge_url_from_cache("http://localhost/bar", backends=["varnish"])
+
+        self.assertCountEqual(
+            [call.args for call in url_task.enqueue.call_args_list],
+            [
+                (["http://localhost/foo"], None, None),
+                (["http://localhost/bar"], None, ["varnish"]),
+            ],
+        )
+
+    def test_purges_are_discarded_on_rollback(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    purge_url_from_cache("http://localhost/foo")
+                    raise ValueError
+            except ValueError:
+                pass
+
+            purge_url_from_cache("http://localhost/bar")
+
+        self.assertEqual(PURGED_URLS, {"http://localhost/bar"})
+
+    @override_settings(WAGTAILFRONTENDCACHE_COALESCE_PURGES=False)
+    def test_purges_are_not_coalesced_if_disabled(self):
+        with mock.patch(
+            "wagtail.contrib.frontend_cache.tasks.purge_urls_from_cache_task"
+        ) as url_task:
+            purge_url_from_cache("http://localhost/foo")
+            purge_url_from_cache("http://localhost/bar")
+
+        self.assertEqual(url_task.enqueue.call_count, 2)
+
+
 class TestPurgeBatchClass(PageFixturesMixin, TestCase):
     # Tests the .add_*() methods on PurgeBatch. The .purge() method is tested
     # by TestCachePurgingFunctions.test_purge_batch above
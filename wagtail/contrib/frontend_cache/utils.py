@@ -1,9 +1,15 @@
 import logging
+from contextvars import ContextVar
+from functools import partial
 
+from asgiref.local import Local
 from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
 from django.utils.module_loading import import_string
 
+from wagtail.coreutils import on_commit_once
+
 logger = logging.getLogger("wagtail.frontendcache")
 
 
@@ -102,9 +108,165 @@ def purge_urls_from_cache(urls, backend_settings=None, backends=None):
     if not urls:
         return
 
+    if should_coalesce_purges(backend_settings):
+        get_pending_purges(backends)["urls"].update(urls)
+        return
+
     purge_urls_from_cache_task.enqueue(list(urls), backend_settings, backends)
 
 
+def purge_tags_from_cache(tags, backend_settings=None, backends=None):
+    """
+    Purge all responses tagged with any of the given cache tags from the frontend cache.
+
+    :param tags: An iterable of cache tags, as returned by ``get_cache_tag``.
+    :type tags: iterable of str
+    :param backend_settings: Optional custom backend settings to use instead of those defined in ``settings.WAGTAILFRONTENDCACHE``.
+    :type backend_settings: dict, optional
+    :param backends: Optional list of strings referencing specific backends from ``settings.WAGTAILFRONTENDCACHE`` or provided as ``backend_settings``. Can be used to limit purge operations to specific backends.
+    :type backends: list, optional
+
+    Backends that do not support tag-based invalidation will ignore this.
+    """
+    from .tasks import purge_tags_from_cache_task
+
+    if not tags:
+        return
+
+    if should_coalesce_purges(backend_settings):
+        get_pending_purges(backends)["tags"].update(tags)
+        return
+
+    purge_tags_from_cache_task.enqueue(sorted(tags), backend_settings, backends)
+
+
+# The URLs and tags to be purged when the current transaction is committed
+pending_purges = Local()
+
+
+def should_coalesce_purges(backend_settings=None):
+    """
+    Return whether purges should be collected until the current transaction
+    is committed, rather than being enqueued immediately.
+    """
+    return (
+        getattr(settings, "WAGTAILFRONTENDCACHE_COALESCE_PURGES", False)
+        and backend_settings is None
+        and transaction.get_connection().in_atomic_block
+    )
+
+
+def get_pending_purges(backends=None):
+    """
+    Return a dict of the sets of ``"urls"`` and ``"tags"`` to be purged from
+    the given backends when the current transaction is committed, starting a
+    new one if there is no pending flush (for example, if a previous
+    transaction was rolled back).
+    """
+    backends_key = tuple(sorted(backends)) if backends is not None else None
+
+    pending_by_backends = {}
+    if on_commit_once(
+        "wagtail-frontend-cache-purges",
+        partial(flush_pending_purges, pending_by_backends),
+    ):
+        pending_purges.value = pending_by_backends
+    return pending_purges.value.setdefault(backends_key, {"urls": set(), "tags": set()})
+
+
+def flush_pending_purges(pending_by_backends):
+    """
+    Enqueue a single purge task for all the URLs, and one for all the tags,
+    collected for each set of backends.
+    """
+    from .tasks import purge_tags_from_cache_task, purge_urls_from_cache_task
+
+    for backends_key, pending in pending_by_backends.items():
+        backends = list(backends_key) if backends_key is not None else None
+        if pending["urls"]:
+            purge_urls_from_cache_task.enqueue(sorted(pending["urls"]), None, backends)
+        if pending["tags"]:
+            purge_tags_from_cache_task.enqueue(sorted(pending["tags"]), None, backends)
+
+
+def cache_tags_enabled():
+    return getattr(settings, "WAGTAILFRONTENDCACHE_CACHE_TAGS", False)
+
+
+def get_cache_tag(model, pk):
+    """
+    Return the cache tag identifying the object of the given model with the
+    given primary key, for example ``wagtailcore.page-3``. Objects of models
+    using multi-table inheritance are identified by their base model, so all
+    pages are tagged as ``wagtailcore.page``.
+    """
+    parents = model._meta.get_parent_list()
+    if parents:
+        model = parents[-1]
+    return f"{model._meta.label_lower}-{pk}"
+
+
+def get_page_cache_tags(page):
+    """
+    Return the cache tags of the responses that should be purged when the
+    given page is published or unpublished: those of the page itself and of
+    its parent, which may list it.
+    """
+    tags = {get_cache_tag(type(page), page.pk)}
+    if page.depth > 1:
+        parent = page.get_parent()
+        tags.add(get_cache_tag(type(parent), parent.pk))
+    return tags
+
+
+def get_reference_cache_tags(obj):
+    """
+    Return the cache tags of all the objects that the given object refers to,
+    according to the reference index.
+    """
+    from django.contrib.contenttypes.models import ContentType
+
+    from wagtail.models import ReferenceIndex
+
+    tags = set()
+    for content_type_id, object_id in (
+        ReferenceIndex.get_references_for_object(obj)
+        .values_list("to_content_type_id", "to_object_id")
+        .distinct()
+    ):
+        content_type = ContentType.objects.get_for_id(content_type_id)
+        tags.add(f"{content_type.app_label}.{content_type.model}-{object_id}")
+    return tags
+
+
+# The cache tags collected while serving the current request, if any
+_collected_cache_tags = ContextVar("wagtail_frontend_cache_tags", default=None)
+
+
+def start_collecting_cache_tags(tags=None):
+    """
+    Start collecting the cache tags of the objects loaded in the current
+    context, adding them to the given set of tags.
+    """
+    tags = set() if tags is None else tags
+    _collected_cache_tags.set(tags)
+    return tags
+
+
+def stop_collecting_cache_tags():
+    _collected_cache_tags.set(None)
+
+
+def is_collecting_cache_tags():
+    return _collected_cache_tags.get() is not None
+
+
+def collect_cache_tag(model, pk):
+    tags = _collected_cache_tags.get()
+    if tags is not None:
+        tags.add(get_cache_tag(model, pk))
+
+
 def _get_page_cached_urls(page, cache_object=None):
     page_url = page.get_full_url(cache_object)
     if page_url is None:  # nothing to be done if the page has no routable URL
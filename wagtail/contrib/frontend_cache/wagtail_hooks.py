@@ -0,0 +1,59 @@
+from django.template.response import SimpleTemplateResponse
+
+from wagtail import hooks
+from wagtail.contrib.frontend_cache.signal_handlers import (
+    register_cache_tag_collection,
+)
+from wagtail.contrib.frontend_cache.utils import (
+    cache_tags_enabled,
+    get_cache_tag,
+    get_reference_cache_tags,
+    start_collecting_cache_tags,
+    stop_collecting_cache_tags,
+)
+
+
+def add_cache_tag_headers(response, tags):
+    tags = sorted(tags)
+    # Surrogate-Key is used by Fastly and Varnish (xkey), Cache-Tag by Cloudflare
+    response["Surrogate-Key"] = " ".join(tags)
+    response["Cache-Tag"] = ",".join(tags)
+
+
+@hooks.register("on_serve_page")
+def add_cache_tags(callback):
+    def inner(page, request, serve_args, serve_kwargs):
+        """
+        Tag the response with the cache tags of the page, the objects it refers
+        to and the pages and snippets loaded while it is being rendered, so that
+        it can be purged from the frontend cache when any of them change.
+        """
+        if not cache_tags_enabled():
+            return callback(page, request, serve_args, serve_kwargs)
+
+        register_cache_tag_collection()
+        tags = start_collecting_cache_tags(
+            {get_cache_tag(type(page), page.pk)} | get_reference_cache_tags(page)
+        )
+
+        try:
+            response = callback(page, request, serve_args, serve_kwargs)
+        except Exception:
+            stop_collecting_cache_tags()
+            raise
+
+        if isinstance(response, SimpleTemplateResponse) and not response.is_rendered:
+            # Template responses are rendered after the view returns, so keep
+            # collecting tags until then
+            def post_render(response):
+                stop_collecting_cache_tags()
+                add_cache_tag_headers(response, tags)
+
+            response.add_post_render_callback(post_render)
+        else:
+            stop_collecting_cache_tags()
+            add_cache_tag_headers(response, tags)
+
+        return response
+
+    return inner
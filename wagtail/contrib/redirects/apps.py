@@ -15,15 +15,20 @@ class WagtailRedirectsAppConfig(AppConfig):
 
         register_permission_policy(Redirect)
 
+        from django.db.models.signals import post_delete, post_save
+
         from wagtail.signals import page_slug_changed, post_page_move
 
         from .signal_handlers import (
             autocreate_redirects_on_page_move,
             autocreate_redirects_on_slug_change,
+            invalidate_redirect_table_on_change,
         )
 
         post_page_move.connect(autocreate_redirects_on_page_move)
         page_slug_changed.connect(autocreate_redirects_on_slug_change)
+        post_save.connect(invalidate_redirect_table_on_change, sender=Redirect)
+        post_delete.connect(invalidate_redirect_table_on_change, sender=Redirect)
 
         from wagtail.api.v3.api import api
 
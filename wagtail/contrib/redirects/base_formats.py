@@ -44,6 +44,13 @@ class CSV:
         """
         return Dataset(csv.reader(StringIO(data), delimiter=delimiter))
 
+    def iter_rows(self, file, delimiter=","):
+        """
+        Yield each row (including the header row) of a csv file opened in
+        text mode, without reading the whole file into memory.
+        """
+        yield from csv.reader(file, delimiter=delimiter)
+
 
 class TSV(CSV):
     def create_dataset(self, data):
@@ -52,6 +59,13 @@ class TSV(CSV):
         """
         return super().create_dataset(data, delimiter="\t")
 
+    def iter_rows(self, file):
+        """
+        Yield each row (including the header row) of a tsv file opened in
+        text mode, without reading the whole file into memory.
+        """
+        yield from super().iter_rows(file, delimiter="\t")
+
 
 class XLSX:
     def is_binary(self):
@@ -73,6 +87,21 @@ class XLSX:
         finally:
             workbook.close()
 
+    def iter_rows(self, file):
+        """
+        Yield each row (including the header row) of the first sheet of a xlsx
+        workbook opened in binary mode, without loading the whole sheet.
+        """
+        import openpyxl
+
+        workbook = openpyxl.load_workbook(file, read_only=True, data_only=True)
+        sheet = workbook.worksheets[0]
+        try:
+            for row in sheet.rows:
+                yield tuple(cell.value for cell in row)
+        finally:
+            workbook.close()
+
 
 DEFAULT_FORMATS = [
     CSV,
@@ -0,0 +1,260 @@
+from io import BytesIO, StringIO, TextIOWrapper
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import ValidationError
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.encoding import force_str
+from django.utils.translation import gettext as _
+
+from wagtail.log_actions import get_active_log_context
+from wagtail.log_actions import registry as log_registry
+
+from .forms import RedirectForm
+from .models import Redirect
+from .redirect_table import invalidate_redirect_table
+
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def iter_file_storage_rows(
+    file_storage, input_format, skip_header=True, from_encoding="utf-8"
+):
+    """
+    Yield the rows of an uploaded import file, excluding the header row unless
+    ``skip_header`` is False. Text files are decoded with ``from_encoding``.
+    Files in temporary folder storage are read as they are parsed, rather
+    than all at once.
+    """
+    if hasattr(file_storage, "open"):
+        file = file_storage.open(mode="rb")
+        if not input_format.is_binary():
+            file = TextIOWrapper(file, encoding=from_encoding, newline="")
+    else:
+        data = file_storage.read(input_format.get_read_mode())
+        if input_format.is_binary():
+            file = BytesIO(data)
+        else:
+            file = StringIO(force_str(data, from_encoding), newline="")
+
+    with file:
+        rows = input_format.iter_rows(file)
+        if skip_header:
+            next(rows, None)
+        yield from rows
+
+
+class BulkRedirectImporter:
+    """
+    Creates redirects from the rows of an import file, a chunk of rows at a
+    time. Each chunk is validated against the existing redirects without
+    querying them again, then saved with ``bulk_create`` (and ``bulk_update``
+    for existing redirects, if ``update_existing`` is set) along with their
+    audit log entries, in a single transaction.
+    """
+
+    def __init__(
+        self,
+        *,
+        from_index=0,
+        to_index=1,
+        permanent=True,
+        site=None,
+        update_existing=False,
+        user=None,
+        chunk_size=DEFAULT_CHUNK_SIZE,
+        dry_run=False,
+    ):
+        self.from_index = from_index
+        self.to_index = to_index
+        self.permanent = permanent
+        self.site = site
+        self.update_existing = update_existing
+        self.user = user
+        self.chunk_size = chunk_size
+        self.dry_run = dry_run
+
+        self.old_path_field = RedirectForm.base_fields["old_path"]
+        self.redirect_link_field = RedirectForm.base_fields["redirect_link"]
+
+        self.errors = []
+        self.total = 0
+        self.created = 0
+        self.updated = 0
+
+    def get_existing_redirect_ids(self):
+        """
+        Return a dict of the ids of the existing redirects for the site that
+        redirects are imported into, keyed by their ``old_path``.
+        """
+        return dict(
+            Redirect.objects.filter(site=self.site).values_list("old_path", "id")
+        )
+
+    def run(self, rows, progress_callback=None):
+        """
+        Import redirects from an iterable of rows, and return a summary of the
+        import. ``progress_callback`` is called with the number of rows
+        processed so far after each chunk.
+        """
+        self.existing_redirect_ids = self.get_existing_redirect_ids()
+        self.imported_paths = set()
+
+        new_redirects = []
+        updated_redirects = []
+        for row in rows:
+            if not any(row):
+                # Skip blank lines
+                continue
+
+            self.total += 1
+            redirect = self.get_redirect_for_row(row)
+            if redirect is not None:
+                if redirect.pk is None:
+                    new_redirects.append(redirect)
+                else:
+                    updated_redirects.append(redirect)
+
+            if self.total % self.chunk_size == 0:
+                self.save_chunk(new_redirects, updated_redirects)
+                new_redirects = []
+                updated_redirects = []
+                if progress_callback is not None:
+                    progress_callback(self.total)
+
+        self.save_chunk(new_redirects, updated_redirects)
+        if progress_callback is not None:
+            progress_callback(self.total)
+
+        return self.get_summary()
+
+    def get_redirect_for_row(self, row):
+        """
+        Validate a row and return an unsaved redirect for it (or an existing
+        redirect to update), or None if the row is invalid.
+        """
+        from_link = row[self.from_index]
+        to_link = row[self.to_index]
+
+        try:
+            old_path = Redirect.normalise_path(self.old_path_field.clean(from_link))
+            if len(old_path) > Redirect._meta.get_field("old_path").max_length:
+                raise ValidationError(
+                    self.old_path_field.error_messages["max_length"],
+                    params={
+                        "limit_value": self.old_path_field.max_length,
+                        "show_value": len(old_path),
+                    },
+                )
+            redirect_link = self.redirect_link_field.clean(to_link)
+        except ValidationError as e:
+            self.errors.append([from_link, to_link, ", ".join(e.messages)])
+            return None
+
+        existing_id = self.existing_redirect_ids.get(old_path)
+        if old_path in self.imported_paths or (
+            existing_id is not None and not self.update_existing
+        ):
+            self.errors.append(
+                [from_link, to_link, _("A redirect with this path already exists.")]
+            )
+            return None
+        self.imported_paths.add(old_path)
+
+        return Redirect(
+            id=existing_id,
+            old_path=old_path,
+            site=self.site,
+            redirect_link=redirect_link,
+            is_permanent=self.permanent,
+        )
+
+    def save_chunk(self, new_redirects, updated_redirects):
+        if self.dry_run:
+            self.created += len(new_redirects)
+            self.updated += len(updated_redirects)
+            return
+
+        if not new_redirects and not updated_redirects:
+            return
+
+        with transaction.atomic():
+            Redirect.objects.bulk_create(new_redirects)
+            self.set_ids(new_redirects)
+            Redirect.objects.bulk_update(
+                updated_redirects,
+                [
+                    "redirect_link",
+                    "redirect_page",
+                    "redirect_page_route_path",
+                    "is_permanent",
+                ],
+            )
+            self.log_actions(new_redirects, "wagtail.create")
+            self.log_actions(updated_redirects, "wagtail.edit")
+
+            # bulk_create() and bulk_update() do not send the post_save signal
+            if getattr(settings, "WAGTAILREDIRECTS_IN_MEMORY_LOOKUP", False):
+                invalidate_redirect_table()
+
+        self.created += len(new_redirects)
+        self.updated += len(updated_redirects)
+
+    def set_ids(self, redirects):
+        """
+        Set the ids of newly created redirects, for databases that cannot
+        return them from ``bulk_create``.
+        """
+        if not redirects or connection.features.can_return_rows_from_bulk_insert:
+            return
+
+        ids = dict(
+            Redirect.objects.filter(
+                site=self.site,
+                old_path__in=[redirect.old_path for redirect in redirects],
+            ).values_list("old_path", "id")
+        )
+        for redirect in redirects:
+            redirect.pk = ids[redirect.old_path]
+
+    def log_actions(self, redirects, action):
+        """
+        Create the audit log entries for the given redirects with a single
+        query.
+        """
+        log_entry_model = log_registry.get_log_model_for_model(Redirect)
+        if log_entry_model is None or not redirects:
+            return
+
+        content_type = ContentType.objects.get_for_model(
+            Redirect, for_concrete_model=False
+        )
+        log_context = get_active_log_context()
+        user = self.user or log_context.user
+        timestamp = timezone.now()
+        log_entry_model.objects.bulk_create(
+            [
+                log_entry_model(
+                    content_type=content_type,
+                    object_id=str(redirect.pk),
+                    label=log_entry_model.objects.get_instance_title(redirect),
+                    action=action,
+                    timestamp=timestamp,
+                    data={},
+                    user=user,
+                    uuid=log_context.uuid,
+                )
+                for redirect in redirects
+            ]
+        )
+
+    def get_summary(self):
+        return {
+            "errors": self.errors,
+            "errors_count": len(self.errors),
+            "successes": self.created + self.updated,
+            "created": self.created,
+            "updated": self.updated,
+            "total": self.total,
+        }
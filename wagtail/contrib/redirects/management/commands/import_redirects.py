@@ -1,8 +1,10 @@
 import os
+from itertools import islice
 
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 
 from wagtail.contrib.redirects.base_formats import Dataset
+from wagtail.contrib.redirects.bulk_import import BulkRedirectImporter
 from wagtail.contrib.redirects.forms import RedirectForm
 from wagtail.contrib.redirects.utils import (
     get_format_cls_by_extension,
@@ -71,6 +73,23 @@ class Command(BaseCommand):
         parser.add_argument(
             "--limit", help="Limit import to num items", type=int, default=None
         )
+        parser.add_argument(
+            "--chunk-size",
+            help=(
+                "Read the file as a stream, and validate and save redirects "
+                "this many rows at a time"
+            ),
+            type=int,
+            default=None,
+        )
+        parser.add_argument(
+            "--update-existing",
+            action="store_true",
+            help=(
+                "Update redirects that already exist for a path, instead of "
+                "reporting them as errors (requires --chunk-size)"
+            ),
+        )
 
     def handle(self, *args, **options):
         src = options["src"]
@@ -84,6 +103,8 @@ class Command(BaseCommand):
         ask = options.pop("ask")
         offset = options.pop("offset")
         limit = options.pop("limit")
+        chunk_size = options.pop("chunk_size")
+        update_existing = options.pop("update_existing")
 
         errors = []
         successes = 0
@@ -111,6 +132,27 @@ class Command(BaseCommand):
             raise Exception(f"Invalid format '{extension}'")
         input_format = import_format_cls()
 
+        if chunk_size is not None:
+            if ask:
+                raise CommandError("--ask cannot be used with --chunk-size")
+            return self.import_in_chunks(
+                src,
+                input_format,
+                BulkRedirectImporter(
+                    from_index=from_index,
+                    to_index=to_index,
+                    permanent=permanent,
+                    site=site,
+                    update_existing=update_existing,
+                    chunk_size=chunk_size,
+                    dry_run=dry_run,
+                ),
+                offset=offset,
+                limit=limit,
+            )
+        elif update_existing:
+            raise CommandError("--update-existing requires --chunk-size")
+
         if extension in ["xls", "xlsx"]:
             mode = "rb"
         else:
@@ -198,6 +240,39 @@ class Command(BaseCommand):
         self.stdout.write(f"Skipped : {skipped}")
         self.stdout.write(f"Errors: {len(errors)}")
 
+    def import_in_chunks(self, src, input_format, importer, offset=None, limit=None):
+        if importer.site:
+            self.stdout.write(f"Using site: {importer.site.hostname}")
+
+        if input_format.is_binary():
+            file = open(src, "rb")
+        else:
+            file = open(src, encoding="utf-8", newline="")
+
+        with file:
+            rows = input_format.iter_rows(file)
+            # Skip the header row
+            next(rows, None)
+            if offset or limit:
+                rows = islice(
+                    rows, offset or 0, (offset or 0) + limit if limit else None
+                )
+            summary = importer.run(
+                rows,
+                progress_callback=lambda processed: self.stdout.write(
+                    f"Processed {processed} rows"
+                ),
+            )
+
+        for from_link, to_link, error in summary["errors"]:
+            self.stdout.write(f"Error: {from_link} -> {to_link} (Reason: {error})")
+
+        self.stdout.write("\n")
+        self.stdout.write(f"Found: {summary['total']}")
+        self.stdout.write(f"Created: {summary['created']}")
+        self.stdout.write(f"Updated: {summary['updated']}")
+        self.stdout.write(f"Errors: {summary['errors_count']}")
+
 
 def get_input(msg):  # pragma: no cover
     return input(msg)
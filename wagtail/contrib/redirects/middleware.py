@@ -1,6 +1,7 @@
 from urllib.parse import urlparse
 
 from django import http
+from django.conf import settings
 from django.utils.encoding import uri_to_iri
 
 try:
@@ -9,6 +10,7 @@ except ImportError:  # DJANGO_VERSION < (6, 2)
     from django.utils.deprecation import MiddlewareMixin
 
 from wagtail.contrib.redirects import models
+from wagtail.contrib.redirects.redirect_table import get_redirect_table
 from wagtail.models import Site
 
 
@@ -19,6 +21,9 @@ def _get_redirect(request, path):
         return None
 
     site = Site.find_for_request(request)
+    if getattr(settings, "WAGTAILREDIRECTS_IN_MEMORY_LOOKUP", False):
+        return get_redirect_table(request).get(site, path)
+
     try:
         return models.Redirect.get_for_site(site).get(old_path=path)
     except models.Redirect.MultipleObjectsReturned:
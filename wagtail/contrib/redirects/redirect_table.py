@@ -0,0 +1,117 @@
+import threading
+import uuid
+from collections import defaultdict
+
+from django.core.cache import cache
+
+from wagtail.coreutils import on_commit_once
+
+from .models import Redirect
+
+# Cache key for the version of the redirects, which is changed whenever a
+# redirect is created, updated or deleted
+VERSION_CACHE_KEY = "wagtail-redirect-table-version"
+
+REDIRECT_FIELDS = (
+    "id",
+    "site_id",
+    "old_path",
+    "is_permanent",
+    "redirect_page_id",
+    "redirect_page_route_path",
+    "redirect_link",
+)
+
+
+class RedirectTable:
+    """
+    All redirects held in memory, keyed by the id of their site (or ``None``
+    for redirects that apply to all sites) and then by ``old_path``, so that
+    they can be looked up without querying the database.
+    """
+
+    def __init__(self, version):
+        self.version = version
+
+        redirects_by_site = defaultdict(dict)
+        for values in Redirect.objects.values_list(*REDIRECT_FIELDS).iterator():
+            redirects_by_site[values[1]][values[2]] = values
+        self.redirects_by_site = dict(redirects_by_site)
+
+    def get(self, site, path):
+        """
+        Return the redirect for the given normalised path on the given site,
+        or None if there isn't one. As with ``Redirect.get_for_site``, a
+        redirect for the site is preferred over one that applies to all
+        sites, and redirects for any site are matched if ``site`` is None.
+        """
+        site_agnostic_redirects = self.redirects_by_site.get(None, {})
+        if site is not None:
+            values = self.redirects_by_site.get(site.pk, {}).get(
+                path
+            ) or site_agnostic_redirects.get(path)
+        else:
+            matches = [
+                redirects[path]
+                for redirects in self.redirects_by_site.values()
+                if path in redirects
+            ]
+            if len(matches) > 1:
+                values = site_agnostic_redirects.get(path)
+            else:
+                values = matches[0] if matches else None
+
+        if values is None:
+            return None
+        return Redirect(**dict(zip(REDIRECT_FIELDS, values)))
+
+
+_redirect_table = None
+_redirect_table_lock = threading.Lock()
+
+
+def get_redirect_version():
+    version = cache.get(VERSION_CACHE_KEY)
+    if version is None:
+        version = uuid.uuid4().hex
+        if not cache.add(VERSION_CACHE_KEY, version, None):
+            # Another process has just set the version
+            version = cache.get(VERSION_CACHE_KEY, version)
+    return version
+
+
+def get_redirect_table(request=None):
+    """
+    Return the ``RedirectTable`` for the current version of the redirects,
+    loading it if the redirects have changed since it was last loaded by
+    this process. If ``request`` is given, the table is reused for further
+    lookups during the same request.
+    """
+    global _redirect_table
+
+    if request is not None and hasattr(request, "_wagtail_redirect_table"):
+        return request._wagtail_redirect_table
+
+    version = get_redirect_version()
+    table = _redirect_table
+    if table is None or table.version != version:
+        with _redirect_table_lock:
+            table = _redirect_table
+            if table is None or table.version != version:
+                table = _redirect_table = RedirectTable(version)
+
+    if request is not None:
+        request._wagtail_redirect_table = table
+    return table
+
+
+def invalidate_redirect_table():
+    """
+    Change the version of the redirects once the current transaction is
+    committed, so that each process reloads its ``RedirectTable``.
+    """
+    on_commit_once("wagtail-redirect-table-invalidation", _set_new_redirect_version)
+
+
+def _set_new_redirect_version():
+    cache.set(VERSION_CACHE_KEY, uuid.uuid4().hex, None)
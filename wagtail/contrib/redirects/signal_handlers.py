@@ -11,6 +11,7 @@ from wagtail.coreutils import BatchCreator, get_dummy_request
 from wagtail.models import Site
 
 from .models import Redirect
+from .redirect_table import invalidate_redirect_table
 
 Page = swapper.load_model("wagtailcore", "Page")
 logger = logging.getLogger(__name__)
@@ -32,6 +33,10 @@ class BatchRedirectCreator(BatchCreator):
         Redirect.objects.filter(automatically_created=True).filter(clashes_q).delete()
 
     def post_process(self):
+        # bulk_create() does not send the post_save signal
+        if getattr(settings, "WAGTAILREDIRECTS_IN_MEMORY_LOOKUP", False):
+            invalidate_redirect_table()
+
         if not apps.is_installed("wagtail.contrib.frontend_cache"):
             return
 
@@ -45,6 +50,11 @@ class BatchRedirectCreator(BatchCreator):
         batch.purge()
 
 
+def invalidate_redirect_table_on_change(**kwargs):
+    if getattr(settings, "WAGTAILREDIRECTS_IN_MEMORY_LOOKUP", False):
+        invalidate_redirect_table()
+
+
 def autocreate_redirects_on_slug_change(
     instance_before: Page, instance: Page, **kwargs
 ):
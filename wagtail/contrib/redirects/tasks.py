@@ -0,0 +1,77 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django_tasks import task
+
+from wagtail.models import Site
+
+from .bulk_import import BulkRedirectImporter, iter_file_storage_rows
+from .utils import get_file_storage, get_import_formats
+
+# How long the progress of an import is kept for
+IMPORT_PROGRESS_TIMEOUT = 60 * 60 * 24
+
+
+def get_import_progress_cache_key(import_id):
+    return f"wagtail-redirects-import-progress-{import_id}"
+
+
+def get_import_progress(import_id):
+    """
+    Return a dict with the ``status`` (``"pending"``, ``"running"``,
+    ``"complete"`` or ``"failed"``) of a background import, the number of rows ``processed``
+    so far, and the ``summary`` once it is complete. Returns None for unknown
+    imports.
+    """
+    return cache.get(get_import_progress_cache_key(import_id))
+
+
+def set_import_progress(import_id, status, processed=0, summary=None):
+    cache.set(
+        get_import_progress_cache_key(import_id),
+        {"status": status, "processed": processed, "summary": summary},
+        IMPORT_PROGRESS_TIMEOUT,
+    )
+
+
+@task()
+def import_redirects_task(
+    import_id,
+    import_file_name,
+    input_format_index,
+    from_index,
+    to_index,
+    permanent=True,
+    site_id=None,
+    update_existing=False,
+    user_id=None,
+):
+    input_format = get_import_formats()[input_format_index]()
+    file_storage = get_file_storage()(name=import_file_name)
+    site = Site.objects.get(pk=site_id) if site_id is not None else None
+    user = get_user_model().objects.get(pk=user_id) if user_id is not None else None
+
+    importer = BulkRedirectImporter(
+        from_index=from_index,
+        to_index=to_index,
+        permanent=permanent,
+        site=site,
+        update_existing=update_existing,
+        user=user,
+    )
+
+    set_import_progress(import_id, "running")
+    try:
+        summary = importer.run(
+            iter_file_storage_rows(file_storage, input_format),
+            progress_callback=lambda processed: set_import_progress(
+                import_id, "running", processed
+            ),
+        )
+    except Exception:
+        set_import_progress(import_id, "failed", importer.total)
+        raise
+    finally:
+        file_storage.remove()
+
+    set_import_progress(import_id, "complete", summary["total"], summary)
+    return summary
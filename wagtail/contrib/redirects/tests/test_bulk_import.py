@@ -0,0 +1,435 @@
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import DatabaseError
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from wagtail.contrib.redirects.base_formats import CSV
+from wagtail.contrib.redirects.bulk_import import (
+    BulkRedirectImporter,
+    iter_file_storage_rows,
+)
+from wagtail.contrib.redirects.models import Redirect
+from wagtail.contrib.redirects.tasks import set_import_progress
+from wagtail.contrib.redirects.tmp_storages import TempFolderStorage
+from wagtail.contrib.redirects.utils import (
+    RedirectsCacheStorage,
+    RedirectsMediaStorage,
+)
+from wagtail.models import ModelLogEntry, Site
+from wagtail.test.utils import WagtailTestUtils
+
+TEST_ROOT = os.path.abspath(os.path.dirname(__file__))
+
+
+class TestBulkRedirectImporter(TestCase):
+    def test_import(self):
+        importer = BulkRedirectImporter()
+        summary = importer.run(
+            [
+                ["/hello/", "http://hello.com/random/"],
+                ["goodbye?b=2&a=1", "https://hello.com/goodbye/"],
+            ]
+        )
+
+        self.assertEqual(summary["total"], 2)
+        self.assertEqual(summary["created"], 2)
+        self.assertEqual(summary["errors_count"], 0)
+
+        redirect = Redirect.objects.get(old_path="/goodbye?a=1&b=2")
+        self.assertIsNone(redirect.site)
+        self.assertEqual(redirect.redirect_link, "https://hello.com/goodbye/")
+        self.assertTrue(redirect.is_permanent)
+        self.assertTrue(Redirect.objects.filter(old_path="/hello").exists())
+
+    def test_import_to_site(self):
+        site = Site.objects.get(is_default_site=True)
+
+        BulkRedirectImporter(site=site, permanent=False).run(
+            [["/hello", "http://hello.com/"]]
+        )
+
+        redirect = Redirect.objects.get(old_path="/hello")
+        self.assertEqual(redirect.site, site)
+        self.assertFalse(redirect.is_permanent)
+
+    def test_invalid_rows(self):
+        summary = BulkRedirectImporter().run(
+            [
+                ["", "http://hello.com/"],
+                ["/hello", "not a url"],
+                ["/" + "a" * 300, "http://hello.com/"],
+            ]
+        )
+
+        self.assertEqual(summary["total"], 3)
+        self.assertEqual(summary["created"], 0)
+        self.assertEqual(
+            [error[2] for error in summary["errors"]],
+            [
+                "This field is required.",
+                "Enter a valid URL.",
+                "Ensure this value has at most 255 characters (it has 301).",
+            ],
+        )
+        self.assertFalse(Redirect.objects.exists())
+
+    def test_duplicate_paths(self):
+        Redirect.objects.create(old_path="/existing", redirect_link="http://a.com/")
+
+        summary = BulkRedirectImporter().run(
+            [
+                ["/existing/", "http://b.com/"],
+                ["/new", "http://b.com/"],
+                ["/new/", "http://c.com/"],
+            ]
+        )
+
+        self.assertEqual(summary["created"], 1)
+        self.assertEqual(
+            summary["errors"],
+            [
+                [
+                    "/existing/",
+                    "http://b.com/",
+                    "A redirect with this path already exists.",
+                ],
+                ["/new/", "http://c.com/", "A redirect with this path already exists."],
+            ],
+        )
+        self.assertEqual(
+            Redirect.objects.get(old_path="/existing").redirect_link, "http://a.com/"
+        )
+        self.assertEqual(
+            Redirect.objects.get(old_path="/new").redirect_link, "http://b.com/"
+        )
+
+    def test_paths_on_other_sites_are_not_duplicates(self):
+        site = Site.objects.get(is_default_site=True)
+        Redirect.objects.create(old_path="/existing", redirect_link="http://a.com/")
+
+        summary = BulkRedirectImporter(site=site).run([["/existing", "http://b.com/"]])
+
+        self.assertEqual(summary["created"], 1)
+        self.assertEqual(Redirect.objects.filter(old_path="/existing").count(), 2)
+
+    def test_update_existing(self):
+        redirect = Redirect.objects.create(
+            old_path="/existing", redirect_link="http://a.com/", is_permanent=False
+        )
+
+        summary = BulkRedirectImporter(update_existing=True).run(
+            [["/existing", "http://b.com/"]]
+        )
+
+        self.assertEqual(summary["created"], 0)
+        self.assertEqual(summary["updated"], 1)
+        redirect.refresh_from_db()
+        self.assertEqual(redirect.redirect_link, "http://b.com/")
+        self.assertTrue(redirect.is_permanent)
+        self.assertTrue(
+            ModelLogEntry.objects.filter(
+                action="wagtail.edit", object_id=str(redirect.pk)
+            ).exists()
+        )
+
+    def test_dry_run(self):
+        summary = BulkRedirectImporter(dry_run=True).run([["/hello", "http://a.com/"]])
+
+        self.assertEqual(summary["created"], 1)
+        self.assertFalse(Redirect.objects.exists())
+
+    def test_chunks(self):
+        rows = [[f"/path-{i}", "http://hello.com/"] for i in range(25)]
+        progress = []
+        ContentType.objects.get_for_model(Redirect)
+
+        # One query to load the existing redirects, then for each chunk, one
+        # to create redirects and one to log them, in a transaction
+        with self.assertNumQueries(1 + 3 * (2 + 2)):
+            summary = BulkRedirectImporter(chunk_size=10).run(
+                rows, progress_callback=progress.append
+            )
+
+        self.assertEqual(summary["created"], 25)
+        self.assertEqual(progress, [10, 20, 25])
+        self.assertEqual(Redirect.objects.count(), 25)
+
+        log_entries = ModelLogEntry.objects.filter(action="wagtail.create")
+        self.assertEqual(log_entries.count(), 25)
+        self.assertEqual(
+            set(log_entries.values_list("object_id", flat=True)),
+            {str(pk) for pk in Redirect.objects.values_list("pk", flat=True)},
+        )
+
+
+class TestImportCommandInChunks(TestCase):
+    def test_import_csv(self):
+        out = StringIO()
+        call_command(
+            "import_redirects",
+            src=f"{TEST_ROOT}/files/example.csv",
+            chunk_size=2,
+            stdout=out,
+        )
+
+        self.assertEqual(Redirect.objects.count(), 2)
+        output = out.getvalue()
+        self.assertIn("Processed 2 rows", output)
+        self.assertIn("Created: 2", output)
+        self.assertIn("Errors: 1", output)
+
+    def test_import_tsv(self):
+        call_command(
+            "import_redirects",
+            src=f"{TEST_ROOT}/files/example.tsv",
+            chunk_size=1000,
+            stdout=StringIO(),
+        )
+
+        self.assertTrue(Redirect.objects.exists())
+
+    def test_import_xlsx(self):
+        call_command(
+            "import_redirects",
+            src=f"{TEST_ROOT}/files/example.xlsx",
+            chunk_size=1000,
+            stdout=StringIO(),
+        )
+
+        self.assertEqual(Redirect.objects.count(), 3)
+
+    def test_import_utf8_csv_with_quoted_newlines(self):
+        with tempfile.NamedTemporaryFile(mode="wb", suffix=".csv") as csv_file:
+            csv_file.write(
+                'from,to\n/caf\u00e9,"http://hello.com/\r\n"\n/tea,http://hello.com/\n'.encode()
+            )
+            csv_file.flush()
+
+            call_command(
+                "import_redirects",
+                src=csv_file.name,
+                chunk_size=1000,
+                stdout=StringIO(),
+            )
+
+        self.assertTrue(Redirect.objects.filter(old_path="/caf\u00e9").exists())
+        self.assertTrue(Redirect.objects.filter(old_path="/tea").exists())
+
+    def test_import_with_options(self):
+        site = Site.objects.get(is_default_site=True)
+        Redirect.objects.create(
+            site=site, old_path="/hello", redirect_link="http://a.com/"
+        )
+
+        call_command(
+            "import_redirects",
+            src=f"{TEST_ROOT}/files/example.csv",
+            site=site.pk,
+            permanent=False,
+            update_existing=True,
+            chunk_size=1000,
+            stdout=StringIO(),
+        )
+
+        redirect = Redirect.objects.get(old_path="/hello")
+        self.assertEqual(redirect.redirect_link, "http://hello.com/random/")
+        self.assertFalse(redirect.is_permanent)
+        self.assertEqual(Redirect.objects.filter(site=site).count(), 2)
+
+    def test_import_with_offset_and_limit(self):
+        call_command(
+            "import_redirects",
+            src=f"{TEST_ROOT}/files/example.xlsx",
+            offset=1,
+            limit=1,
+            chunk_size=1000,
+            stdout=StringIO(),
+        )
+
+        self.assertEqual(Redirect.objects.count(), 1)
+
+    def test_dry_run(self):
+        call_command(
+            "import_redirects",
+            src=f"{TEST_ROOT}/files/example.csv",
+            dry_run=True,
+            chunk_size=1000,
+            stdout=StringIO(),
+        )
+
+        self.assertFalse(Redirect.objects.exists())
+
+    def test_ask_requires_whole_file(self):
+        with self.assertRaisesMessage(
+            CommandError, "--ask cannot be used with --chunk-size"
+        ):
+            call_command(
+                "import_redirects",
+                src=f"{TEST_ROOT}/files/example.csv",
+                ask=True,
+                chunk_size=1000,
+                stdout=StringIO(),
+            )
+
+    def test_update_existing_requires_chunk_size(self):
+        with self.assertRaisesMessage(
+            CommandError, "--update-existing requires --chunk-size"
+        ):
+            call_command(
+                "import_redirects",
+                src=f"{TEST_ROOT}/files/example.csv",
+                update_existing=True,
+                stdout=StringIO(),
+            )
+
+
+class TestIterFileStorageRows(TestCase):
+    def test_cache_storage_csv(self):
+        file_storage = RedirectsCacheStorage()
+        file_storage.save("from,to\n/caf\u00e9,/tea\n".encode("latin-1"))
+
+        rows = iter_file_storage_rows(file_storage, CSV(), from_encoding="latin-1")
+        self.assertEqual(list(rows), [["/caf\u00e9", "/tea"]])
+
+    def test_temp_folder_storage_csv(self):
+        file_storage = TempFolderStorage()
+        file_storage.save("from,to\n/caf\u00e9,/tea\n".encode("latin-1"), mode="wb")
+        self.addCleanup(file_storage.remove)
+
+        rows = iter_file_storage_rows(file_storage, CSV(), from_encoding="latin-1")
+        self.assertEqual(list(rows), [["/caf\u00e9", "/tea"]])
+
+    def test_media_storage_csv(self):
+        file_storage = RedirectsMediaStorage()
+        file_storage.save("from,to\n/caf\u00e9,/tea\n".encode("latin-1"))
+        self.addCleanup(file_storage.remove)
+
+        rows = iter_file_storage_rows(file_storage, CSV(), from_encoding="latin-1")
+        self.assertEqual(list(rows), [["/caf\u00e9", "/tea"]])
+
+
+@override_settings(
+    ALLOWED_HOSTS=["testserver", "localhost", "test.example.com", "other.example.com"],
+    WAGTAILREDIRECTS_BACKGROUND_IMPORT=True,
+)
+class TestBackgroundImportAdminViews(WagtailTestUtils, TestCase):
+    def setUp(self):
+        self.user = self.login()
+
+    def start_import(self, filename):
+        with open(f"{TEST_ROOT}/files/{filename}", "rb") as infile:
+            upload_file = SimpleUploadedFile(filename, infile.read())
+
+        response = self.client.post(
+            reverse("wagtailredirects:start_import"), {"import_file": upload_file}
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(
+                reverse("wagtailredirects:process_import"),
+                {
+                    **response.context["form"].initial,
+                    "from_index": 0,
+                    "to_index": 1,
+                    "permanent": True,
+                },
+            )
+
+    def test_import(self):
+        response = self.start_import("example.xlsx")
+
+        self.assertRedirects(response, response.url, fetch_redirect_response=False)
+        self.assertIn("/admin/redirects/import/", response.url)
+
+        response = self.client.get(response.url)
+        self.assertRedirects(response, reverse("wagtailredirects:index"))
+        self.assertEqual(Redirect.objects.count(), 3)
+        self.assertEqual(
+            ModelLogEntry.objects.filter(
+                action="wagtail.create", user=self.user
+            ).count(),
+            3,
+        )
+
+    def test_upload_stored_in_media_storage(self):
+        # The worker running the import may not be able to read the web
+        # server's temporary folder
+        with open(f"{TEST_ROOT}/files/example.csv", "rb") as infile:
+            upload_file = SimpleUploadedFile("example.csv", infile.read())
+        response = self.client.post(
+            reverse("wagtailredirects:start_import"), {"import_file": upload_file}
+        )
+
+        # The file name is signed in the form's initial data
+        name, _signature = (
+            response.context["form"].initial["import_file_name"].split(":")
+        )
+        path = RedirectsMediaStorage(name=name).get_full_path()
+        self.assertTrue(default_storage.exists(path))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse("wagtailredirects:process_import"),
+                {
+                    **response.context["form"].initial,
+                    "from_index": 0,
+                    "to_index": 1,
+                    "permanent": True,
+                },
+            )
+        self.assertEqual(Redirect.objects.count(), 2)
+        self.assertFalse(default_storage.exists(path))
+
+    def test_import_with_errors(self):
+        response = self.start_import("example.csv")
+
+        response = self.client.get(response.url)
+        self.assertTemplateUsed(response, "wagtailredirects/import_summary.html")
+        self.assertEqual(response.context["import_summary"]["errors_count"], 1)
+        self.assertEqual(Redirect.objects.count(), 2)
+
+    @override_settings(WAGTAIL_REDIRECTS_FILE_STORAGE="cache")
+    def test_import_csv_with_cache_storage(self):
+        response = self.start_import("example.csv")
+
+        response = self.client.get(response.url)
+        self.assertTemplateUsed(response, "wagtailredirects/import_summary.html")
+        self.assertEqual(response.context["import_summary"]["total"], 3)
+        self.assertEqual(Redirect.objects.count(), 2)
+
+    def test_failed_import(self):
+        with (
+            mock.patch.object(
+                BulkRedirectImporter, "save_chunk", side_effect=DatabaseError
+            ),
+            self.assertLogs("django_tasks", level="ERROR"),
+        ):
+            response = self.start_import("example.csv")
+
+        response = self.client.get(response.url)
+        self.assertTemplateUsed(response, "wagtailredirects/import_progress.html")
+        self.assertContains(response, "The import failed")
+        self.assertNotContains(response, "w-action#reload")
+
+    def test_pending_import(self):
+        set_import_progress("pending-import", "pending")
+
+        response = self.client.get(
+            reverse("wagtailredirects:import_progress", args=("pending-import",))
+        )
+        self.assertContains(response, "The import is waiting to start.")
+        self.assertContains(response, 'data-action="w-init:ready->w-action#reload"')
+
+    def test_unknown_import(self):
+        response = self.client.get(
+            reverse("wagtailredirects:import_progress", args=("unknown",))
+        )
+        self.assertEqual(response.status_code, 404)
@@ -49,9 +49,20 @@ class TestImportUtils(TestCase):
         FileStorage = get_file_storage()
         self.assertEqual(FileStorage.__name__, "TempFolderStorage")
 
+    @override_settings(WAGTAIL_REDIRECTS_FILE_STORAGE="media")
+    def test_that_media_storage_are_returned(self):
+        FileStorage = get_file_storage()
+        self.assertEqual(FileStorage.__name__, "RedirectsMediaStorage")
+
+    @override_settings(WAGTAILREDIRECTS_BACKGROUND_IMPORT=True)
+    def test_that_media_storage_are_returned_for_background_imports(self):
+        FileStorage = get_file_storage()
+        self.assertEqual(FileStorage.__name__, "RedirectsMediaStorage")
+
     @override_settings(WAGTAIL_REDIRECTS_FILE_STORAGE="INVALID")
     def test_invalid_file_storage_raises_errors(self):
         with self.assertRaisesMessage(
-            Exception, "Invalid file storage, must be either 'tmp_file' or 'cache'"
+            Exception,
+            "Invalid file storage, must be either 'tmp_file', 'cache' or 'media'",
         ):
             get_file_storage()
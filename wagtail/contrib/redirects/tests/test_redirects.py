@@ -1,14 +1,18 @@
 from io import BytesIO
+from unittest.mock import patch
 
 from django.conf import settings
 from django.contrib.auth.models import Permission
+from django.db import connection
 from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from openpyxl.reader.excel import load_workbook
 
 from wagtail.admin.admin_url_finder import AdminURLFinder
 from wagtail.contrib.frontend_cache.tests import PURGED_URLS
-from wagtail.contrib.redirects import models
+from wagtail.contrib.redirects import models, redirect_table
+from wagtail.contrib.redirects.signal_handlers import BatchRedirectCreator
 from wagtail.log_actions import registry as log_registry
 from wagtail.models import Site
 from wagtail.test.routablepage.models import RoutablePageTest
@@ -645,6 +649,109 @@ class TestRedirects(PageFixturesMixin, TestCase):
         self.assertIs(redirect.is_permanent, True)
 
 
+@override_settings(WAGTAILREDIRECTS_IN_MEMORY_LOOKUP=True)
+class TestRedirectTable(TestRedirects):
+    """
+    Run the redirect tests again with redirects looked up in a RedirectTable
+    """
+
+    def setUp(self):
+        super().setUp()
+        # The redirect tests change redirects between requests, so change the
+        # version straight away rather than when the test's transaction would
+        # have been committed
+        self.enterContext(
+            patch.object(
+                redirect_table, "on_commit_once", lambda key, func, **kwargs: func()
+            )
+        )
+
+    def assertNoRedirectQueries(self, queries):
+        self.assertFalse(
+            [
+                query
+                for query in queries
+                if models.Redirect._meta.db_table in query["sql"]
+            ]
+        )
+
+    def test_no_queries_for_redirect_lookups(self):
+        models.Redirect.objects.create(old_path="/redirectme", redirect_link="/to")
+
+        # Load the table
+        self.client.get("/redirectme/")
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/redirectme/")
+        self.assertNoRedirectQueries(queries)
+        self.assertRedirects(
+            response, "/to", status_code=301, fetch_redirect_response=False
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/not-a-redirect/?foo=bar")
+        self.assertNoRedirectQueries(queries)
+        self.assertEqual(response.status_code, 404)
+
+    def test_table_is_reloaded_when_redirects_change(self):
+        self.assertEqual(self.client.get("/redirectme/").status_code, 404)
+
+        redirect = models.Redirect.objects.create(
+            old_path="/redirectme", redirect_link="/to"
+        )
+        self.assertRedirects(
+            self.client.get("/redirectme/"),
+            "/to",
+            status_code=301,
+            fetch_redirect_response=False,
+        )
+
+        redirect.redirect_link = "/elsewhere"
+        redirect.save()
+        self.assertRedirects(
+            self.client.get("/redirectme/"),
+            "/elsewhere",
+            status_code=301,
+            fetch_redirect_response=False,
+        )
+
+        redirect.delete()
+        self.assertEqual(self.client.get("/redirectme/").status_code, 404)
+
+    def test_bulk_created_redirects(self):
+        self.assertEqual(self.client.get("/redirectme/").status_code, 404)
+
+        batch = BatchRedirectCreator(max_size=10)
+        batch.add(old_path="/redirectme", redirect_link="/to")
+        batch.process()
+
+        self.assertRedirects(
+            self.client.get("/redirectme/"),
+            "/to",
+            status_code=301,
+            fetch_redirect_response=False,
+        )
+
+
+@override_settings(WAGTAILREDIRECTS_IN_MEMORY_LOOKUP=True)
+class TestRedirectTableInvalidation(TestCase):
+    def test_version_changed_once_per_transaction(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            models.Redirect.objects.create(old_path="/one", redirect_link="/to")
+            models.Redirect.objects.create(old_path="/two", redirect_link="/to")
+        self.assertEqual(len(callbacks), 1)
+
+        version = redirect_table.get_redirect_version()
+        callbacks[0]()
+        self.assertNotEqual(redirect_table.get_redirect_version(), version)
+
+    @override_settings(WAGTAILREDIRECTS_IN_MEMORY_LOOKUP=False)
+    def test_version_not_changed_when_disabled(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            models.Redirect.objects.create(old_path="/one", redirect_link="/to")
+        self.assertEqual(callbacks, [])
+
+
 @override_settings(
     CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
 )
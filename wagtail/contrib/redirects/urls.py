@@ -11,4 +11,5 @@ urlpatterns = [
     path("<int:redirect_id>/delete/", views.DeleteView.as_view(), name="delete"),
     path("import/", views.start_import, name="start_import"),
     path("import/process/", views.process_import, name="process_import"),
+    path("import/<str:import_id>/", views.import_progress, name="import_progress"),
 ]
@@ -1,16 +1,19 @@
 from django.conf import settings
+from django.core.files.storage import default_storage
 
 from wagtail.contrib.redirects.base_formats import DEFAULT_FORMATS
-from wagtail.contrib.redirects.tmp_storages import CacheStorage, TempFolderStorage
+from wagtail.contrib.redirects.tmp_storages import (
+    CacheStorage,
+    MediaStorage,
+    TempFolderStorage,
+)
 
 
 def write_to_file_storage(import_file, input_format):
     FileStorage = get_file_storage()
     file_storage = FileStorage()
 
-    data = b""
-    for chunk in import_file.chunks():
-        data += chunk
+    data = b"".join(import_file.chunks())
 
     file_storage.save(data, input_format.get_read_mode())
     return file_storage
@@ -36,14 +39,32 @@ def get_import_formats():
 
 
 def get_file_storage():
-    file_storage = getattr(settings, "WAGTAIL_REDIRECTS_FILE_STORAGE", "tmp_file")
+    # Background imports are run by a worker that may be on another host, so
+    # can't read uploads from the web server's temporary folder
+    if getattr(settings, "WAGTAILREDIRECTS_BACKGROUND_IMPORT", False):
+        default = "media"
+    else:
+        default = "tmp_file"
+
+    file_storage = getattr(settings, "WAGTAIL_REDIRECTS_FILE_STORAGE", default)
     if file_storage == "tmp_file":
         return TempFolderStorage
     if file_storage == "cache":
         return RedirectsCacheStorage
+    if file_storage == "media":
+        return RedirectsMediaStorage
 
-    raise Exception("Invalid file storage, must be either 'tmp_file' or 'cache'")
+    raise Exception(
+        "Invalid file storage, must be either 'tmp_file', 'cache' or 'media'"
+    )
 
 
 class RedirectsCacheStorage(CacheStorage):
     CACHE_PREFIX = "wagtail-redirects-"
+
+
+class RedirectsMediaStorage(MediaStorage):
+    MEDIA_FOLDER = "wagtail-redirects-imports"
+
+    def open(self, mode="rb"):
+        return default_storage.open(self.get_full_path(), mode)
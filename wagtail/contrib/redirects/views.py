@@ -1,7 +1,11 @@
 import os
+import uuid
+from contextlib import closing
 
+from django.conf import settings
 from django.core.exceptions import SuspiciousOperation
 from django.db import transaction
+from django.http import Http404
 from django.shortcuts import redirect, render
 from django.urls import reverse
 from django.utils.encoding import force_str
@@ -17,6 +21,7 @@ from wagtail.admin.ui.tables import Column, StatusTagColumn, TitleColumn
 from wagtail.admin.views import generic
 from wagtail.admin.widgets.button import Button
 from wagtail.contrib.frontend_cache.utils import PurgeBatch, purge_urls_from_cache
+from wagtail.contrib.redirects.bulk_import import iter_file_storage_rows
 from wagtail.contrib.redirects.filters import RedirectsReportFilterSet
 from wagtail.contrib.redirects.forms import (
     ConfirmImportForm,
@@ -25,6 +30,11 @@ from wagtail.contrib.redirects.forms import (
     RedirectForm,
 )
 from wagtail.contrib.redirects.models import Redirect
+from wagtail.contrib.redirects.tasks import (
+    get_import_progress,
+    import_redirects_task,
+    set_import_progress,
+)
 from wagtail.contrib.redirects.utils import (
     get_file_storage,
     get_format_cls_by_extension,
@@ -314,27 +324,41 @@ def process_import(request):
             f"{management_form.errors.as_text()}"
         )
 
-    input_format = get_import_formats()[
-        int(management_form.cleaned_data["input_format"])
-    ]()
+    import_file_name = management_form.cleaned_data["import_file_name"]
+    input_format_index = int(management_form.cleaned_data["input_format"])
+    input_format = get_import_formats()[input_format_index]()
 
     FileStorage = get_file_storage()
-    file_storage = FileStorage(name=management_form.cleaned_data["import_file_name"])
-
-    data = file_storage.read(input_format.get_read_mode())
-    if not input_format.is_binary() and from_encoding:
-        data = force_str(data, from_encoding)
-    dataset = input_format.create_dataset(data)
+    file_storage = FileStorage(name=import_file_name)
+
+    background_import = getattr(settings, "WAGTAILREDIRECTS_BACKGROUND_IMPORT", False)
+    if background_import:
+        # Only the header row is needed to validate the form
+        with closing(
+            iter_file_storage_rows(
+                file_storage,
+                input_format,
+                skip_header=False,
+                from_encoding=from_encoding,
+            )
+        ) as rows:
+            headers = next(rows, [])
+        dataset = None
+    else:
+        dataset = read_dataset(file_storage, input_format, from_encoding)
+        headers = dataset.headers
 
     # Now check if the rest of the management form is valid
     form = ConfirmImportForm(
-        dataset.headers,
+        headers,
         request.POST,
         request.FILES,
         initial=management_form.cleaned_data,
     )
 
     if not form.is_valid():
+        if dataset is None:
+            dataset = read_dataset(file_storage, input_format, from_encoding)
         return render(
             request,
             "wagtailredirects/confirm_import.html",
@@ -344,6 +368,22 @@ def process_import(request):
             },
         )
 
+    if background_import:
+        import_id = uuid.uuid4().hex
+        set_import_progress(import_id, "pending")
+        site = form.cleaned_data["site"]
+        import_redirects_task.enqueue(
+            import_id,
+            import_file_name,
+            input_format_index,
+            int(form.cleaned_data["from_index"]),
+            int(form.cleaned_data["to_index"]),
+            permanent=form.cleaned_data["permanent"],
+            site_id=site.pk if site else None,
+            user_id=request.user.pk,
+        )
+        return redirect("wagtailredirects:import_progress", import_id)
+
     import_summary = create_redirects_from_dataset(
         dataset,
         {
@@ -376,6 +416,47 @@ def process_import(request):
     return redirect("wagtailredirects:index")
 
 
+def read_dataset(file_storage, input_format, from_encoding):
+    data = file_storage.read(input_format.get_read_mode())
+    if not input_format.is_binary() and from_encoding:
+        data = force_str(data, from_encoding)
+    return input_format.create_dataset(data)
+
+
+@permission_checker.require_any("add")
+def import_progress(request, import_id):
+    progress = get_import_progress(import_id)
+    if progress is None:
+        raise Http404
+
+    if progress["status"] != "complete":
+        return render(
+            request,
+            "wagtailredirects/import_progress.html",
+            {"progress": progress},
+        )
+
+    import_summary = progress["summary"]
+    if import_summary["errors_count"] > 0:
+        return render(
+            request,
+            "wagtailredirects/import_summary.html",
+            {
+                "form": ImportForm(get_supported_extensions()),
+                "import_summary": import_summary,
+            },
+        )
+
+    total = import_summary["total"]
+    messages.success(
+        request,
+        ngettext("Imported %(total)d redirect", "Imported %(total)d redirects", total)
+        % {"total": total},
+    )
+
+    return redirect("wagtailredirects:index")
+
+
 def create_redirects_from_dataset(dataset, config):
     errors = []
     successes = 0
@@ -0,0 +1,104 @@
+import pickle
+import threading
+import uuid
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+
+# Recently used settings, shared by every SettingsCache in this process. Keys
+# include the generation of the setting model, so entries for settings that
+# have since changed are never returned, and are eventually evicted.
+_local_settings = OrderedDict()
+_local_settings_lock = threading.Lock()
+
+
+class SettingsCache:
+    """
+    A cache of setting instances shared between requests, keyed by setting
+    model and site (or ``None`` for generic settings).
+
+    Each setting model has a generation token in the shared cache, which is
+    changed whenever an instance of the model is saved or deleted, so that
+    every cached instance of the model is discarded. The most recently used
+    instances are also kept in memory by each process, so that a lookup only
+    needs to fetch the generation token from the shared cache.
+
+    Instances are stored pickled, and a new copy is returned for each lookup,
+    so state set on an instance during a request (such as ``_request`` or its
+    page URL cache) is never shared with other requests.
+    """
+
+    ENTRY_KEY_PREFIX = "wagtail-settings-"
+    GENERATION_KEY_PREFIX = "wagtail-settings-generation-"
+
+    # The maximum number of setting instances to keep in memory per process
+    LOCAL_CACHE_SIZE = 256
+
+    def __init__(self, cache):
+        self.cache = cache
+
+    @classmethod
+    def get_for_settings(cls):
+        """
+        Return a ``SettingsCache`` for the cache alias configured in the
+        ``WAGTAILSETTINGS_CACHE`` setting, or ``None`` if it is not configured.
+        """
+        alias = getattr(settings, "WAGTAILSETTINGS_CACHE", None)
+        if not alias:
+            return None
+        return cls(caches[alias])
+
+    def get_generation_key(self, model):
+        return self.GENERATION_KEY_PREFIX + model._meta.label_lower
+
+    def get_generation(self, model):
+        """
+        Return the current generation token for the given setting model,
+        creating it if it is missing.
+        """
+        key = self.get_generation_key(model)
+        generation = self.cache.get(key)
+        if generation is None:
+            generation = uuid.uuid4().hex
+            if not self.cache.add(key, generation, None):
+                # Another process has just set the generation
+                generation = self.cache.get(key, generation)
+        return generation
+
+    def get_or_create(self, model, site_id, get_or_create):
+        """
+        Return the instance of the setting model for the site with the given
+        id (or ``None`` for generic settings), calling ``get_or_create()`` to
+        fetch it from the database if it is not cached.
+        """
+        # The generation is fetched before the instance, so that an instance
+        # fetched while it is being changed is stored under the old generation
+        generation = self.get_generation(model)
+        key = f"{self.ENTRY_KEY_PREFIX}{model._meta.label_lower}-{site_id}-{generation}"
+
+        with _local_settings_lock:
+            data = _local_settings.get(key)
+            if data is not None:
+                _local_settings.move_to_end(key)
+
+        if data is None:
+            data = self.cache.get(key)
+            if data is None:
+                data = pickle.dumps(get_or_create(), pickle.HIGHEST_PROTOCOL)
+                self.cache.set(key, data)
+
+            with _local_settings_lock:
+                _local_settings[key] = data
+                while len(_local_settings) > self.LOCAL_CACHE_SIZE:
+                    _local_settings.popitem(last=False)
+
+        # The data is only ever written by this method, to the configured
+        # cache (which itself unpickles values)
+        return pickle.loads(data)  # noqa: S301
+
+    def invalidate(self, model):
+        """
+        Discard all cached instances of the given setting model.
+        """
+        self.cache.set(self.get_generation_key(model), uuid.uuid4().hex, None)
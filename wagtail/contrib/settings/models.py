@@ -3,10 +3,11 @@ from django.utils.functional import cached_property
 from django.utils.translation import gettext as _
 
 from wagtail.coreutils import InvokeViaAttributeShortcut
-from wagtail.models import Site
+from wagtail.models import Page, Site
 from wagtail.permission_policies import ModelPermissionPolicy
 from wagtail.permission_policies.sites import SitePermissionPolicy
 
+from .cache import SettingsCache
 from .registry import register_setting
 
 __all__ = [
@@ -59,6 +60,7 @@ class AbstractSetting(models.Model):
         super().__init__(*args, **kwargs)
         # Per-instance page URL cache
         self._page_url_cache = {}
+        self._page_urls_resolved = False
 
     @classmethod
     def get_permission_policy(cls):
@@ -79,9 +81,16 @@ class AbstractSetting(models.Model):
         The result is also cached per-object to facilitate
         fast repeat access.
 
+        The first time this is called, the URLs of the pages referenced by
+        all of the object's page foreign keys are resolved at once.
+
         Raises an ``AttributeError`` if the object has no such
         field or attribute.
         """
+        if not self._page_urls_resolved:
+            self._page_url_cache.update(self._get_page_urls())
+            self._page_urls_resolved = True
+
         if attribute_name in self._page_url_cache:
             return self._page_url_cache[attribute_name]
 
@@ -102,12 +111,55 @@ class AbstractSetting(models.Model):
         self._page_url_cache[attribute_name] = url
         return url
 
+    def _get_page_urls(self):
+        """
+        Return a dict mapping the name of each foreign key to a page on this
+        object to the URL of that page, fetching the pages in a single query.
+        """
+        page_ids = {}
+        for field in self._meta.concrete_fields:
+            if field.many_to_one and issubclass(field.related_model, Page):
+                page_ids[field.name] = getattr(self, field.attname)
+
+        ids = {page_id for page_id in page_ids.values() if page_id is not None}
+        if not ids:
+            return dict.fromkeys(page_ids, "")
+
+        # Deferring the specific fields avoids querying each page type's
+        # table, while still using the specific class to generate URLs
+        pages = Page.objects.filter(pk__in=ids).specific(defer=True).in_bulk()
+        urls = Page.get_urls_in_bulk(
+            pages.values(), request=getattr(self, "_request", None)
+        )
+        return {
+            name: urls[page_id] if page_id in urls else ""
+            for name, page_id in page_ids.items()
+        }
+
     def __getstate__(self):
-        # Ignore 'page_url' when pickling
+        # Ignore 'page_url' and cached page URLs when pickling, as the URLs
+        # may have been generated for a particular request
         state = super().__getstate__()
         state.pop("page_url", None)
+        state.pop("_page_url_cache", None)
         return state
 
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        self._page_url_cache = {}
+        self._page_urls_resolved = False
+
+    @classmethod
+    def get_from_settings_cache(cls, site_id, get_or_create):
+        """
+        Return the result of ``get_or_create()``, sharing it between requests
+        if the ``WAGTAILSETTINGS_CACHE`` setting is configured.
+        """
+        settings_cache = SettingsCache.get_for_settings()
+        if settings_cache is None:
+            return get_or_create()
+        return settings_cache.get_or_create(cls, site_id, get_or_create)
+
 
 class BaseSiteSetting(AbstractSetting):
     site = models.OneToOneField(
@@ -154,8 +206,17 @@ class BaseSiteSetting(AbstractSetting):
         """
         if site is None:
             raise cls.DoesNotExist("%s does not exist for site None." % cls)
-        queryset = cls.base_queryset()
-        instance, created = queryset.get_or_create(site=site)
+        return cls.get_from_settings_cache(
+            site.pk, lambda: cls._get_or_create_for_site(site)
+        )
+
+    @classmethod
+    def _get_or_create_for_site(cls, site):
+        """
+        Internal convenience method to get or create the instance for the site
+        from the database, bypassing the settings cache.
+        """
+        instance, created = cls.base_queryset().get_or_create(site=site)
         return instance
 
     def __str__(self):
@@ -202,14 +263,14 @@ class BaseGenericSetting(AbstractSetting):
         # We can only cache on the request, so if there is no request then
         # we know there's nothing in the cache.
         if request_or_site is None or isinstance(request_or_site, Site):
-            return cls._get_or_create()
+            return cls.get_from_settings_cache(None, cls._get_or_create)
 
         # Check if we already have this in the cache and return it if so.
         attr_name = cls.get_cache_attr_name()
         if hasattr(request_or_site, attr_name):
             return getattr(request_or_site, attr_name)
 
-        obj = cls._get_or_create()
+        obj = cls.get_from_settings_cache(None, cls._get_or_create)
 
         # Cache for next time.
         setattr(request_or_site, attr_name, obj)
@@ -0,0 +1,20 @@
+from django.apps import apps
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from .cache import SettingsCache
+from .models import AbstractSetting
+
+
+def invalidate_settings_cache(sender, **kwargs):
+    # Discard the cached instances of the setting model once the transaction
+    # saving or deleting an instance of it is committed
+    if settings_cache := SettingsCache.get_for_settings():
+        transaction.on_commit(lambda: settings_cache.invalidate(sender))
+
+
+def register_signal_handlers():
+    for model in apps.get_models():
+        if issubclass(model, AbstractSetting):
+            post_save.connect(invalidate_settings_cache, sender=model)
+            post_delete.connect(invalidate_settings_cache, sender=model)
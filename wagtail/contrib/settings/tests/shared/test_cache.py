@@ -0,0 +1,194 @@
+from unittest import mock
+
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from wagtail.contrib.settings import cache as settings_cache_module
+from wagtail.contrib.settings.cache import SettingsCache
+from wagtail.models import Site
+from wagtail.test.testapp.models import (
+    ImportantPagesSiteSetting,
+    TestGenericSetting,
+    TestSiteSetting,
+)
+from wagtail.test.utils import WagtailTestUtils
+
+from ..site_specific.base import SiteSettingsTestMixin
+
+
+@override_settings(
+    ALLOWED_HOSTS=["testserver", "localhost", "other"],
+    CACHES={
+        "default": {
+            "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+            "LOCATION": "cache",
+        },
+        "settings": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        },
+    },
+    WAGTAILSETTINGS_CACHE="settings",
+)
+class TestSettingsCache(SiteSettingsTestMixin, WagtailTestUtils, TestCase):
+    def setUp(self):
+        super().setUp()
+        caches["settings"].clear()
+        settings_cache_module._local_settings.clear()
+
+    def test_for_site_is_cached(self):
+        with self.assertNumQueries(1):
+            settings = TestSiteSetting.for_site(self.default_site)
+        self.assertEqual(settings, self.default_settings)
+        TestSiteSetting.for_site(self.other_site)
+
+        with self.assertNumQueries(0):
+            settings = TestSiteSetting.for_site(self.default_site)
+            other_settings = TestSiteSetting.for_site(self.other_site)
+        self.assertEqual(settings.title, "Site title")
+        self.assertEqual(other_settings, self.other_settings)
+        self.assertEqual(other_settings.title, "Other title")
+
+    def test_for_request_is_cached_between_requests(self):
+        TestSiteSetting.for_request(self.get_request())
+
+        request = self.get_request()
+        # force site query beforehand
+        Site.find_for_request(request)
+
+        with self.assertNumQueries(0):
+            settings = TestSiteSetting.for_request(request)
+        self.assertEqual(settings.title, "Site title")
+        self.assertIs(settings._request, request)
+
+    def test_instances_are_not_shared(self):
+        first_request = self.get_request()
+        first_settings = TestSiteSetting.for_request(first_request)
+        second_settings = TestSiteSetting.for_request(self.get_request())
+
+        self.assertIsNot(first_settings, second_settings)
+        self.assertIs(first_settings._request, first_request)
+        self.assertIsNot(second_settings._request, first_request)
+
+    def test_page_url_of_cached_instance(self):
+        ImportantPagesSiteSetting.objects.create(
+            site=self.default_site,
+            sign_up_page=self.default_site.root_page,
+            general_terms_page=self.default_site.root_page,
+            privacy_policy_page=self.other_site.root_page,
+        )
+        ImportantPagesSiteSetting.for_site(self.default_site)
+
+        request = self.get_request()
+        settings = ImportantPagesSiteSetting.for_request(request)
+        self.assertEqual(settings.page_url.sign_up_page, "/")
+        self.assertEqual(settings.page_url.privacy_policy_page, "http://other/")
+
+    def test_shared_cache_only_read_for_generation(self):
+        TestSiteSetting.for_site(self.default_site)
+
+        with mock.patch.object(
+            caches["settings"], "get", wraps=caches["settings"].get
+        ) as cache_get:
+            TestSiteSetting.for_site(self.default_site)
+        cache_get.assert_called_once_with(
+            SettingsCache.GENERATION_KEY_PREFIX + "tests.testsitesetting"
+        )
+
+    def test_instances_shared_between_processes(self):
+        TestSiteSetting.for_site(self.default_site)
+        # Simulate a lookup in another process
+        settings_cache_module._local_settings.clear()
+
+        with self.assertNumQueries(0):
+            settings = TestSiteSetting.for_site(self.default_site)
+        self.assertEqual(settings.title, "Site title")
+
+    def test_local_cache_size(self):
+        with mock.patch.object(SettingsCache, "LOCAL_CACHE_SIZE", 1):
+            TestSiteSetting.for_site(self.default_site)
+            TestSiteSetting.for_site(self.other_site)
+
+        self.assertEqual(len(settings_cache_module._local_settings), 1)
+
+    def test_save_invalidates_cache(self):
+        TestSiteSetting.for_site(self.default_site)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.default_settings.title = "New title"
+            self.default_settings.save()
+
+        self.assertEqual(TestSiteSetting.for_site(self.default_site).title, "New title")
+
+    def test_delete_invalidates_cache(self):
+        TestSiteSetting.for_site(self.default_site)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.default_settings.delete()
+
+        settings = TestSiteSetting.for_site(self.default_site)
+        self.assertNotEqual(settings.pk, self.default_settings.pk)
+        self.assertEqual(settings.title, "")
+
+    def test_generic_setting_is_cached(self):
+        generic_settings = TestGenericSetting.objects.create(title="Generic title")
+
+        with self.assertNumQueries(1):
+            TestGenericSetting.load()
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                TestGenericSetting.load(request_or_site=self.get_request()),
+                generic_settings,
+            )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            generic_settings.title = "New title"
+            generic_settings.save()
+
+        self.assertEqual(TestGenericSetting.load().title, "New title")
+
+    def test_edit_view_invalidates_cache(self):
+        self.login()
+        TestSiteSetting.for_site(self.default_site)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse(
+                    "wagtailsettings:edit",
+                    args=["tests", "testsitesetting", self.default_site.pk],
+                ),
+                {"title": "Edited title", "email": "edited@example.com"},
+            )
+        self.assertEqual(response.status_code, 302)
+
+        self.assertEqual(
+            TestSiteSetting.for_site(self.default_site).title, "Edited title"
+        )
+
+    def test_edit_view_bypasses_cache(self):
+        self.login()
+        TestSiteSetting.for_site(self.default_site)
+        # Changes made without signals are not seen by the cache...
+        TestSiteSetting.objects.filter(pk=self.default_settings.pk).update(
+            title="Updated title"
+        )
+        self.assertEqual(
+            TestSiteSetting.for_site(self.default_site).title, "Site title"
+        )
+
+        # ...but are always seen by the edit view
+        response = self.client.get(
+            reverse(
+                "wagtailsettings:edit",
+                args=["tests", "testsitesetting", self.default_site.pk],
+            )
+        )
+        self.assertEqual(response.context["object"].title, "Updated title")
+
+    @override_settings(WAGTAILSETTINGS_CACHE=None)
+    def test_disabled(self):
+        TestSiteSetting.for_site(self.default_site)
+
+        with self.assertNumQueries(1):
+            TestSiteSetting.for_site(self.default_site)
+        self.assertFalse(settings_cache_module._local_settings)
@@ -133,7 +133,8 @@ class EditView(generic.EditView):
             ):
                 raise PermissionDenied
 
-            return self.model.for_site(self.site)
+            # Always edit the current instance, rather than a cached copy
+            return self.model._get_or_create_for_site(self.site)
         else:
             return get_object_or_404(self.model, pk=self.pk)
 
@@ -212,7 +213,7 @@ class PreviewOnEdit(preview.PreviewOnEdit):
         self.site = None
         if issubclass(self.model, BaseSiteSetting):
             self.site = get_object_or_404(Site, pk=self.pk)
-            obj = self.model.for_site(self.site)
+            obj = self.model._get_or_create_for_site(self.site)
         else:
             obj = get_object_or_404(self.model, pk=self.pk)
 
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from wagtail.contrib.sitemaps.precomputed import write_sitemaps
+from wagtail.models import Site
+
+
+class Command(BaseCommand):
+    help = "Generates the sitemaps of each site and writes them to storage"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--site",
+            action="append",
+            dest="site_ids",
+            type=int,
+            help="Only generate the sitemaps of the site with this id (can be given more than once)",
+        )
+
+    def handle(self, *args, **options):
+        sites = Site.objects.select_related("root_page").order_by("pk")
+        if options["site_ids"]:
+            sites = sites.filter(pk__in=options["site_ids"])
+
+        for site in sites:
+            file_names = write_sitemaps(site)
+            self.stdout.write("%s: wrote %d sitemap file(s)" % (site, len(file_names)))
@@ -0,0 +1,148 @@
+import inspect
+from types import SimpleNamespace
+
+from django.conf import settings
+from django.contrib.sitemaps.views import SitemapIndexItem
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.base import ContentFile
+from django.core.files.storage import InvalidStorageError, default_storage, storages
+from django.template.loader import render_to_string
+from django.urls import NoReverseMatch, reverse
+from django.utils.module_loading import import_string
+
+from wagtail.coreutils import get_dummy_request
+
+from .sitemap_generator import Sitemap
+
+# The section name used for the sitemap served by the ``sitemap`` view when it
+# is not given any sitemaps
+DEFAULT_SECTION = "wagtail"
+
+DEFAULT_SITEMAP_URL_NAME = "django.contrib.sitemaps.views.sitemap"
+
+
+def get_sitemap_storage():
+    """
+    Return the storage that precomputed sitemaps are written to, which is set
+    by ``WAGTAILSITEMAPS_STORAGE`` or defaults to the default storage.
+    """
+    storage = getattr(settings, "WAGTAILSITEMAPS_STORAGE", default_storage)
+    if isinstance(storage, str):
+        try:
+            # First see if the string is a storage alias
+            storage = storages[storage]
+        except InvalidStorageError:
+            # Otherwise treat the string as a dotted path
+            try:
+                storage = import_string(storage)()
+            except ImportError as e:
+                raise ImproperlyConfigured(
+                    "WAGTAILSITEMAPS_STORAGE must be either a valid storage alias or dotted module path."
+                ) from e
+
+    return storage
+
+
+def get_sitemap_directory(site_id):
+    prefix = getattr(settings, "WAGTAILSITEMAPS_STORAGE_PATH", "sitemaps")
+    return f"{prefix}/{site_id}"
+
+
+def get_sitemap_file_name(section, page=1):
+    return f"{section}-{page}.xml"
+
+
+def get_index_file_name(sections):
+    return "index-%s.xml" % "-".join(sorted(sections))
+
+
+def read_precomputed_sitemap(site_id, file_name):
+    """
+    Return the contents of a precomputed sitemap file for the site with the
+    given id, or None if it has not been generated.
+    """
+    storage = get_sitemap_storage()
+    path = f"{get_sitemap_directory(site_id)}/{file_name}"
+    try:
+        with storage.open(path, "rb") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def write_sitemaps(
+    site, sitemaps=None, sitemap_url_name=DEFAULT_SITEMAP_URL_NAME, storage=None
+):
+    """
+    Generate the sitemaps for the given Wagtail ``Site`` and write them to the
+    sitemap storage, so that they can be served by the ``index`` and
+    ``sitemap`` views without being generated for each request.
+
+    ``sitemaps`` is a dict of section names to sitemaps, as passed to the
+    views, and defaults to the single sitemap served by the ``sitemap`` view
+    when it is not given any. A file is written for each page of each section,
+    along with an index of them if ``sitemap_url_name`` can be reversed with a
+    ``section`` argument. Any previously generated files that are no longer
+    needed are deleted. Returns the names of the files that were written.
+    """
+    if storage is None:
+        storage = get_sitemap_storage()
+    if sitemaps is None:
+        sitemaps = {DEFAULT_SECTION: Sitemap}
+
+    request = get_dummy_request(site=site)
+    # Stands in for a Django Site (which is only used by sitemaps not based on
+    # Wagtail's Sitemap class) to avoid the ALLOWED_HOSTS check of RequestSite
+    domain_site = SimpleNamespace(domain=site.root_url.split("://", 1)[1])
+    protocol = "https" if site.port == 443 else "http"
+
+    files = {}
+    index_items = []
+    for section, sitemap in sitemaps.items():
+        if inspect.isclass(sitemap) and issubclass(sitemap, Sitemap):
+            sitemap = sitemap(request)
+        elif callable(sitemap):
+            sitemap = sitemap()
+
+        for page in sitemap.paginator.page_range:
+            urls = sitemap.get_urls(page=page, site=domain_site, protocol=protocol)
+            files[get_sitemap_file_name(section, page)] = render_to_string(
+                "sitemap.xml", {"urlset": urls}
+            )
+
+        try:
+            location = site.root_url + reverse(
+                sitemap_url_name, kwargs={"section": section}
+            )
+        except NoReverseMatch:
+            index_items = None
+        if index_items is not None:
+            lastmod = sitemap.get_latest_lastmod()
+            index_items.append(SitemapIndexItem(location, lastmod))
+            index_items.extend(
+                SitemapIndexItem(f"{location}?p={page}", lastmod)
+                for page in sitemap.paginator.page_range[1:]
+            )
+
+    if index_items is not None:
+        files[get_index_file_name(sitemaps)] = render_to_string(
+            "sitemap_index.xml", {"sitemaps": index_items}
+        )
+
+    directory = get_sitemap_directory(site.pk)
+    for file_name, content in files.items():
+        path = f"{directory}/{file_name}"
+        # Replace the existing file, rather than saving under a new name
+        storage.delete(path)
+        storage.save(path, ContentFile(content.encode()))
+
+    # Delete files for pages of these sections that no longer exist
+    try:
+        existing_file_names = storage.listdir(directory)[1]
+    except FileNotFoundError:
+        existing_file_names = []
+    for file_name in existing_file_names:
+        if file_name not in files and file_name.rsplit("-", 1)[0] in sitemaps:
+            storage.delete(f"{directory}/{file_name}")
+
+    return list(files)
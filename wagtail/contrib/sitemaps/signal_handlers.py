@@ -0,0 +1,89 @@
+from functools import partial
+
+import swapper
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+
+from wagtail.coreutils import on_commit_once
+from wagtail.models import PageViewRestriction, Site
+from wagtail.signals import page_published, page_unpublished, post_page_move
+
+from .tasks import generate_sitemaps_task, get_regenerate_cache_key
+
+# The time after which a pending regeneration is assumed to have been lost, and
+# another one can be enqueued
+REGENERATE_TIMEOUT = 60 * 60
+
+Page = swapper.load_model("wagtailcore", "Page")
+
+
+def enqueue_sitemap_regeneration(page):
+    """
+    Enqueue a task to regenerate the precomputed sitemaps of each site that the
+    page belongs to, unless one is already waiting to run.
+    """
+    ancestor_paths = [
+        page.path[:i] for i in range(page.steplen, len(page.path) + 1, page.steplen)
+    ]
+    for site_id in Site.objects.filter(root_page__path__in=ancestor_paths).values_list(
+        "pk", flat=True
+    ):
+        # Only mark the regeneration as pending once the change is committed,
+        # so that a rollback doesn't block regeneration until the timeout
+        on_commit_once(
+            f"wagtail-sitemaps-regeneration-{site_id}",
+            partial(_enqueue_sitemap_regeneration, site_id),
+        )
+
+
+def _enqueue_sitemap_regeneration(site_id):
+    if cache.add(get_regenerate_cache_key(site_id), True, REGENERATE_TIMEOUT):
+        generate_sitemaps_task.enqueue(site_id)
+
+
+def regenerate_on_publish_enabled():
+    return getattr(settings, "WAGTAILSITEMAPS_REGENERATE_ON_PUBLISH", False)
+
+
+def page_published_signal_handler(instance, **kwargs):
+    if regenerate_on_publish_enabled():
+        enqueue_sitemap_regeneration(instance)
+
+
+def page_unpublished_signal_handler(instance, **kwargs):
+    if regenerate_on_publish_enabled():
+        enqueue_sitemap_regeneration(instance)
+
+
+def post_page_move_signal_handler(instance, parent_page_before, **kwargs):
+    # The URLs and order of the page and its descendants change, and they may
+    # have moved to another site
+    if regenerate_on_publish_enabled():
+        enqueue_sitemap_regeneration(parent_page_before)
+        enqueue_sitemap_regeneration(instance)
+
+
+def page_deleted_signal_handler(instance, **kwargs):
+    # Deleting a page doesn't send page_unpublished
+    if regenerate_on_publish_enabled() and instance.live:
+        enqueue_sitemap_regeneration(instance)
+
+
+def view_restriction_changed_signal_handler(instance, **kwargs):
+    # Private pages are left out of sitemaps
+    if regenerate_on_publish_enabled():
+        enqueue_sitemap_regeneration(instance.page)
+
+
+def register_signal_handlers():
+    page_published.connect(page_published_signal_handler)
+    page_unpublished.connect(page_unpublished_signal_handler)
+    post_page_move.connect(post_page_move_signal_handler)
+    post_delete.connect(page_deleted_signal_handler, sender=Page)
+    post_save.connect(
+        view_restriction_changed_signal_handler, sender=PageViewRestriction
+    )
+    post_delete.connect(
+        view_restriction_changed_signal_handler, sender=PageViewRestriction
+    )
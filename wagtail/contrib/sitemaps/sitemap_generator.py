@@ -1,10 +1,51 @@
+from itertools import islice
+
 from django.contrib.sitemaps import Sitemap as DjangoSitemap
+from django.core.paginator import Paginator
+from django.utils.functional import cached_property
 
 # Note: avoid importing models here. This module is imported from __init__.py
 # which causes it to be loaded early in startup if wagtail.contrib.sitemaps is
 # included in INSTALLED_APPS (not required, but developers are likely to add it
 # anyhow) leading to an AppRegistryNotReady exception.
 
+# The number of pages to generate URLs for at once
+URL_CHUNK_SIZE = 1000
+
+
+class PathKeysetPaginator(Paginator):
+    """
+    A paginator for a queryset of pages ordered by ``path``, which fetches each
+    page of results by filtering on ``path`` instead of using an OFFSET over
+    whole rows. If the last path of the previous page is known (as it is when
+    the pages are generated in order), the page seeks directly past it.
+    Otherwise the first path of the page is found in a subquery that only
+    reads the ``path`` column.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Page number -> the path of the last item on that page, once known
+        self.page_end_paths = {}
+
+    def page(self, number):
+        number = self.validate_number(number)
+        object_list = self.object_list
+        if number > 1:
+            end_path = self.page_end_paths.get(number - 1)
+            if end_path is not None:
+                object_list = object_list.filter(path__gt=end_path)
+            else:
+                from django.db.models import Subquery
+
+                offset = (number - 1) * self.per_page
+                object_list = object_list.filter(
+                    path__gte=Subquery(
+                        self.object_list.values("path")[offset : offset + 1]
+                    )
+                )
+        return self._get_page(object_list[: self.per_page], number, self)
+
 
 class Sitemap(DjangoSitemap):
     def __init__(self, request=None):
@@ -37,16 +78,94 @@ class Sitemap(DjangoSitemap):
             .specific()
         )
 
+    @cached_property
+    def paginator(self):
+        items = self._items()
+        if hasattr(items, "values_list") and tuple(items.query.order_by) == ("path",):
+            return PathKeysetPaginator(items, self.limit)
+        return Paginator(items, self.limit)
+
+    def get_latest_lastmod(self):
+        if type(self).lastmod is not Sitemap.lastmod:
+            return super().get_latest_lastmod()
+
+        from django.db.models import Count, Max, Q
+        from django.db.models.functions import Coalesce
+
+        items = self.items()
+        if not hasattr(items, "aggregate"):
+            return super().get_latest_lastmod()
+
+        # Find the latest lastmod with an aggregate rather than loading every
+        # page. As in Django's implementation, there is no latest lastmod if
+        # any page is missing one.
+        result = items.aggregate(
+            latest_lastmod=Max(
+                Coalesce("last_published_at", "latest_revision_created_at")
+            ),
+            missing_lastmod_count=Count(
+                "pk",
+                filter=Q(
+                    last_published_at__isnull=True,
+                    latest_revision_created_at__isnull=True,
+                ),
+            ),
+        )
+        if result["missing_lastmod_count"]:
+            return None
+        return result["latest_lastmod"]
+
+    def _get_url_info_items(self, pages):
+        """
+        Return a list of the sitemap URL entries for each of the given pages.
+        URLs for pages that use the default ``get_sitemap_urls`` are generated
+        in bulk.
+        """
+        from wagtail.models import AbstractPage
+
+        default_pages = [
+            page
+            for page in pages
+            if type(page).get_sitemap_urls is AbstractPage.get_sitemap_urls
+        ]
+        locations = AbstractPage.get_urls_in_bulk(
+            default_pages, request=self.request, full_url=True
+        )
+
+        url_info_items = []
+        for page in pages:
+            if page.pk in locations:
+                url_info_items.append(
+                    [
+                        {
+                            "location": locations[page.pk],
+                            # fall back on latest_revision_created_at if
+                            # last_published_at is null, as get_sitemap_urls does
+                            "lastmod": (
+                                page.last_published_at
+                                or page.latest_revision_created_at
+                            ),
+                        }
+                    ]
+                )
+            else:
+                url_info_items.append(page.get_sitemap_urls(self.request))
+        return url_info_items
+
     def _urls(self, page, protocol, domain):
         urls = []
         last_mods = set()
 
-        for item in self.paginator.page(page).object_list.iterator():
-            url_info_items = item.get_sitemap_urls(self.request)
+        items = self.paginator.page(page).object_list.iterator()
+        while chunk := list(islice(items, URL_CHUNK_SIZE)):
+            for url_info_items in self._get_url_info_items(chunk):
+                for url_info in url_info_items:
+                    urls.append(url_info)
+                    last_mods.add(url_info.get("lastmod"))
 
-            for url_info in url_info_items:
-                urls.append(url_info)
-                last_mods.add(url_info.get("lastmod"))
+            # Let the next page seek past this one
+            if isinstance(self.paginator, PathKeysetPaginator):
+                self.paginator.page_end_paths[page] = chunk[-1].path
 
         # last_mods might be empty if the whole site is private
         if last_mods and None not in last_mods:
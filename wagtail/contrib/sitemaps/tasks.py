@@ -0,0 +1,21 @@
+from django.core.cache import cache
+from django_tasks import task
+
+from wagtail.models import Site
+
+from .precomputed import write_sitemaps
+
+
+def get_regenerate_cache_key(site_id):
+    return f"wagtail-sitemaps-regenerate-{site_id}"
+
+
+@task()
+def generate_sitemaps_task(site_id):
+    # Allow further changes to enqueue another run from now on, as they may
+    # not be included in this one
+    cache.delete(get_regenerate_cache_key(site_id))
+
+    site = Site.objects.filter(pk=site_id).select_related("root_page").first()
+    if site is not None:
+        write_sitemaps(site)
@@ -1,16 +1,27 @@
 import datetime
+import io
+from unittest import mock
 
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.sites.shortcuts import get_current_site
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import InMemoryStorage
+from django.core.management import call_command
+from django.core.paginator import Paginator
+from django.db import connection
 from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 
 from wagtail.models import PageViewRestriction, Site
-from wagtail.test.testapp.models import EventIndex, SimplePage
+from wagtail.test.testapp.models import EventIndex, EventSitemap, SimplePage
 from wagtail.test.utils import Page
 
-from .sitemap_generator import Sitemap
+from .precomputed import write_sitemaps
+from .sitemap_generator import PathKeysetPaginator, Sitemap
+from .tasks import generate_sitemaps_task, get_regenerate_cache_key
 
 
 @override_settings(
@@ -250,6 +261,56 @@ class TestSitemapGenerator(TestCase):
 
         self.assertFalse(hasattr(sitemap, "latest_lastmod"))
 
+    def test_paginator_pages_by_path(self):
+        request, django_site = self.get_request_and_django_site("/sitemap.xml")
+
+        sitemap = Sitemap(request)
+        sitemap.limit = 2
+        self.assertIsInstance(sitemap.paginator, PathKeysetPaginator)
+
+        offset_paginator = Paginator(sitemap.items(), 2)
+        self.assertEqual(sitemap.paginator.count, offset_paginator.count)
+        self.assertEqual(sitemap.paginator.num_pages, 2)
+        for page_number in sitemap.paginator.page_range:
+            with CaptureQueriesContext(connection) as queries:
+                object_list = list(sitemap.paginator.page(page_number).object_list)
+            self.assertEqual(
+                object_list, list(offset_paginator.page(page_number).object_list)
+            )
+            # Pages are found by path, without numbering every row
+            for query in queries.captured_queries:
+                self.assertNotIn("ROW_NUMBER", query["sql"])
+
+    def test_paginator_seeks_past_previous_page(self):
+        request, django_site = self.get_request_and_django_site("/sitemap.xml")
+
+        sitemap = Sitemap(request)
+        sitemap.limit = 2
+        first_page_urls = sitemap.get_urls(1, django_site, request.scheme)
+        self.assertEqual(
+            sitemap.paginator.page_end_paths,
+            {1: sitemap.items()[1].path},
+        )
+
+        offset_paginator = Paginator(sitemap.items(), 2)
+        second_page = sitemap.paginator.page(2)
+        self.assertIn('"wagtailcore_page"."path" >', str(second_page.object_list.query))
+        self.assertEqual(
+            list(second_page.object_list), list(offset_paginator.page(2).object_list)
+        )
+        self.assertEqual(len(first_page_urls), 2)
+
+    def test_get_urls_matches_get_sitemap_urls(self):
+        request, django_site = self.get_request_and_django_site("/sitemap.xml")
+
+        sitemap = Sitemap(request)
+        urls = sitemap.get_urls(1, django_site, request.scheme)
+
+        expected_urls = []
+        for page in sitemap.items():
+            expected_urls.extend(page.get_sitemap_urls(request))
+        self.assertEqual(urls, expected_urls)
+
     def test_non_default_site(self):
         request = RequestFactory().get("/sitemap.xml")
         request.META["HTTP_HOST"] = "other.example.com"
@@ -287,3 +348,203 @@ class TestSitemapView(TestCase):
 
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response["Content-Type"], "application/xml")
+
+
+class TestPrecomputedSitemaps(TestCase):
+    def setUp(self):
+        self.site = Site.objects.get(is_default_site=True)
+        self.home_page = self.site.root_page
+
+        self.storage = InMemoryStorage()
+        settings_override = override_settings(
+            WAGTAILSITEMAPS_STORAGE=self.storage,
+            WAGTAILSITEMAPS_SERVE_PRECOMPUTED=True,
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_write_sitemaps(self):
+        file_names = write_sitemaps(self.site)
+
+        self.assertEqual(file_names, ["wagtail-1.xml"])
+        with self.storage.open(f"sitemaps/{self.site.pk}/wagtail-1.xml") as f:
+            content = f.read().decode()
+        self.assertIn("<loc>http://localhost/</loc>", content)
+
+    def test_write_sitemaps_removes_stale_pages(self):
+        self.storage.save(f"sitemaps/{self.site.pk}/wagtail-2.xml", ContentFile(b""))
+        self.storage.save(f"sitemaps/{self.site.pk}/other-2.xml", ContentFile(b""))
+
+        write_sitemaps(self.site)
+
+        self.assertEqual(
+            sorted(self.storage.listdir(f"sitemaps/{self.site.pk}")[1]),
+            ["other-2.xml", "wagtail-1.xml"],
+        )
+
+    def test_serve_precomputed_sitemap(self):
+        write_sitemaps(self.site)
+        # Pages added after the sitemaps were written are not included until
+        # they are written again
+        self.home_page.add_child(
+            instance=SimplePage(
+                title="Hello world!", slug="hello-world", content="hello", live=True
+            )
+        )
+
+        # Only the site is looked up
+        with self.assertNumQueries(1):
+            response = self.client.get("/sitemap.xml")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/xml")
+        self.assertEqual(response["X-Robots-Tag"], "noindex, noodp, noarchive")
+        self.assertContains(response, "<loc>http://localhost/</loc>")
+        self.assertNotContains(response, "hello-world")
+
+        write_sitemaps(self.site)
+        response = self.client.get("/sitemap.xml")
+        self.assertContains(response, "<loc>http://localhost/hello-world/</loc>")
+
+    def test_serve_precomputed_sitemap_index(self):
+        write_sitemaps(
+            self.site,
+            {"pages": Sitemap, "events": EventSitemap(request=None)},
+            sitemap_url_name="sitemap",
+        )
+
+        response = self.client.get("/sitemap-index.xml")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/xml")
+        self.assertContains(response, "<loc>http://localhost/sitemap-pages.xml</loc>")
+        self.assertContains(response, "<loc>http://localhost/sitemap-events.xml</loc>")
+
+        response = self.client.get("/sitemap-pages.xml")
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "<loc>http://localhost/</loc>")
+
+    def test_falls_back_to_generating_sitemap(self):
+        response = self.client.get("/sitemap.xml")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "<loc>http://localhost/</loc>")
+
+    @override_settings(WAGTAILSITEMAPS_SERVE_PRECOMPUTED=False)
+    def test_not_served_when_disabled(self):
+        write_sitemaps(self.site)
+        self.home_page.add_child(
+            instance=SimplePage(
+                title="Hello world!", slug="hello-world", content="hello", live=True
+            )
+        )
+
+        response = self.client.get("/sitemap.xml")
+
+        self.assertContains(response, "<loc>http://localhost/hello-world/</loc>")
+
+    def test_generate_sitemaps_command(self):
+        call_command("generate_sitemaps", site_ids=[self.site.pk], stdout=io.StringIO())
+
+        self.assertTrue(self.storage.exists(f"sitemaps/{self.site.pk}/wagtail-1.xml"))
+
+    @override_settings(WAGTAILSITEMAPS_REGENERATE_ON_PUBLISH=True)
+    def test_regenerate_on_publish(self):
+        write_sitemaps(self.site)
+        page = self.home_page.add_child(
+            instance=SimplePage(
+                title="Hello world!", slug="hello-world", content="hello", live=False
+            )
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            page.save_revision().publish()
+
+        response = self.client.get("/sitemap.xml")
+        self.assertContains(response, "<loc>http://localhost/hello-world/</loc>")
+
+    @override_settings(WAGTAILSITEMAPS_REGENERATE_ON_PUBLISH=True)
+    def test_regenerate_on_view_restriction_change(self):
+        page = self.home_page.add_child(
+            instance=SimplePage(
+                title="Hello world!", slug="hello-world", content="hello", live=True
+            )
+        )
+        write_sitemaps(self.site)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            restriction = PageViewRestriction.objects.create(
+                page=page, restriction_type=PageViewRestriction.LOGIN
+            )
+
+        response = self.client.get("/sitemap.xml")
+        self.assertNotContains(response, "hello-world")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            restriction.delete()
+
+        response = self.client.get("/sitemap.xml")
+        self.assertContains(response, "<loc>http://localhost/hello-world/</loc>")
+
+    @override_settings(WAGTAILSITEMAPS_REGENERATE_ON_PUBLISH=True)
+    def test_regenerate_on_move(self):
+        section = self.home_page.add_child(
+            instance=SimplePage(
+                title="Section", slug="section", content="section", live=True
+            )
+        )
+        page = self.home_page.add_child(
+            instance=SimplePage(
+                title="Hello world!", slug="hello-world", content="hello", live=True
+            )
+        )
+        write_sitemaps(self.site)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            page.move(section, pos="last-child")
+
+        response = self.client.get("/sitemap.xml")
+        self.assertContains(
+            response, "<loc>http://localhost/section/hello-world/</loc>"
+        )
+        self.assertNotContains(response, "<loc>http://localhost/hello-world/</loc>")
+
+    @override_settings(WAGTAILSITEMAPS_REGENERATE_ON_PUBLISH=True)
+    def test_regenerate_on_delete(self):
+        page = self.home_page.add_child(
+            instance=SimplePage(
+                title="Hello world!", slug="hello-world", content="hello", live=True
+            )
+        )
+        page.add_child(
+            instance=SimplePage(title="Child", slug="child", content="child", live=True)
+        )
+        write_sitemaps(self.site)
+
+        with (
+            mock.patch(
+                "wagtail.contrib.sitemaps.signal_handlers.generate_sitemaps_task"
+            ) as mock_task,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            mock_task.enqueue.side_effect = generate_sitemaps_task.enqueue
+            page.delete()
+
+        # The page and its child are deleted in the same transaction
+        mock_task.enqueue.assert_called_once_with(self.site.pk)
+
+        response = self.client.get("/sitemap.xml")
+        self.assertNotContains(response, "hello-world")
+
+    @override_settings(WAGTAILSITEMAPS_REGENERATE_ON_PUBLISH=True)
+    def test_rolled_back_publish_does_not_block_regeneration(self):
+        page = self.home_page.add_child(
+            instance=SimplePage(
+                title="Hello world!", slug="hello-world", content="hello", live=False
+            )
+        )
+
+        # Discard the on-commit callbacks, as a rollback would
+        with self.captureOnCommitCallbacks(execute=False):
+            page.save_revision().publish()
+
+        self.assertIsNone(cache.get(get_regenerate_cache_key(self.site.pk)))
@@ -1,16 +1,36 @@
 import inspect
 
+from django.conf import settings
 from django.contrib.sitemaps import views as sitemap_views
+from django.http import HttpResponse
 
+from wagtail.models import Site
+
+from .precomputed import (
+    DEFAULT_SECTION,
+    get_index_file_name,
+    get_sitemap_file_name,
+    read_precomputed_sitemap,
+)
 from .sitemap_generator import Sitemap
 
 
 def index(request, sitemaps, **kwargs):
+    response = serve_precomputed_sitemap(request, "index", sitemaps=sitemaps, **kwargs)
+    if response is not None:
+        return response
+
     sitemaps = prepare_sitemaps(request, sitemaps)
     return sitemap_views.index(request, sitemaps, **kwargs)
 
 
 def sitemap(request, sitemaps=None, **kwargs):
+    response = serve_precomputed_sitemap(
+        request, "sitemap", sitemaps=sitemaps, **kwargs
+    )
+    if response is not None:
+        return response
+
     if sitemaps:
         sitemaps = prepare_sitemaps(request, sitemaps)
     else:
@@ -26,3 +46,47 @@ def prepare_sitemaps(request, sitemaps):
         else:
             initialised_sitemaps[name] = sitemap_cls
     return initialised_sitemaps
+
+
+def serve_precomputed_sitemap(
+    request, view, sitemaps=None, section=None, template_name=None, **kwargs
+):
+    """
+    Return a response for the precomputed sitemap file that the given view
+    would have generated, or None if the sitemap should be generated instead
+    (because serving precomputed sitemaps is disabled, a custom template is
+    used, or the file has not been written yet).
+    """
+    if not getattr(settings, "WAGTAILSITEMAPS_SERVE_PRECOMPUTED", False):
+        return None
+
+    if template_name is not None:
+        return None
+
+    site = Site.find_for_request(request)
+    if site is None:
+        return None
+
+    if view == "index":
+        file_name = get_index_file_name(sitemaps)
+    else:
+        if section is None:
+            if not sitemaps:
+                section = DEFAULT_SECTION
+            elif len(sitemaps) == 1:
+                (section,) = sitemaps
+            else:
+                # Sitemaps combining several sections are not precomputed
+                return None
+
+        page = request.GET.get("p", "1")
+        if not page.isdigit():
+            return None
+        file_name = get_sitemap_file_name(section, int(page))
+
+    content = read_precomputed_sitemap(site.pk, file_name)
+    if content is None:
+        return None
+    response = HttpResponse(content, content_type="application/xml")
+    response.headers["X-Robots-Tag"] = "noindex, noodp, noarchive"
+    return response
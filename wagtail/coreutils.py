@@ -3,11 +3,13 @@ import inspect
 import logging
 import re
 import unicodedata
+import weakref
 from collections.abc import Iterable
 from hashlib import md5
 from typing import TYPE_CHECKING, Any
 
 from anyascii import anyascii
+from asgiref.local import Local
 from django.apps import apps
 from django.conf import settings
 from django.conf.locale import LANG_INFO
@@ -15,6 +17,7 @@ from django.core.cache import cache
 from django.core.cache.utils import make_template_fragment_key
 from django.core.exceptions import ImproperlyConfigured, SuspiciousOperation
 from django.core.signals import setting_changed
+from django.db import transaction
 from django.db.models import Model
 from django.db.models.base import ModelBase
 from django.dispatch import receiver
@@ -391,6 +394,44 @@ def multigetattr(item, accessor):
     return current
 
 
+# The callbacks registered by on_commit_once that are waiting for the current
+# transaction to be committed, by database alias and key
+pending_on_commit_once = Local()
+
+
+def on_commit_once(key, callback, using=None):
+    """
+    Register ``callback`` to be called when the current transaction is
+    committed, as ``django.db.transaction.on_commit`` does, unless a callback
+    registered with the same ``key`` is already waiting for it. Returns
+    whether ``callback`` was registered.
+
+    A callback stops waiting when it is called, or when it is discarded by
+    the rollback of the transaction (or savepoint) that it was registered in,
+    after which the next call registers its callback again.
+    """
+    connection = transaction.get_connection(using)
+    pending = getattr(pending_on_commit_once, "callbacks", None)
+    if pending is None:
+        pending = pending_on_commit_once.callbacks = {}
+
+    pending_key = (connection.alias, key)
+    pending_ref = pending.get(pending_key)
+    if pending_ref is not None and pending_ref() is not None:
+        return False
+
+    def run_callback():
+        if pending.get(pending_key) is callback_ref:
+            del pending[pending_key]
+        callback()
+
+    # Only a weak reference is kept, so that the flag is dropped along with
+    # the callback if the transaction is rolled back
+    callback_ref = pending[pending_key] = weakref.ref(run_callback)
+    transaction.on_commit(run_callback, using=using)
+    return True
+
+
 def get_dummy_request(*, path: str = "/", site: "Site" = None) -> HttpRequest:
     """
     Return a simple ``HttpRequest`` instance that can be passed to
@@ -1,9 +1,14 @@
+import concurrent.futures
+import datetime
 import logging
+from itertools import groupby
 
 from django.core.management.base import BaseCommand
-from django.db import transaction
+from django.db import connections, transaction
 
 from wagtail.images import get_image_model
+from wagtail.models import Collection
+from wagtail.tasks import delete_file_from_storage_task
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +24,97 @@ def progress_bar(current, total, bar_length=50):
     return (f"Progress: [{arrow}{padding}] {int(fraction * 100)}%", ending)
 
 
+def regenerate_rendition(rendition, source):
+    """
+    Regenerate the file for a rendition from the given ``DecodedImage``.
+
+    The new file is written before the rendition is updated to point to it, and
+    the old file is only deleted once the transaction is committed, so the
+    rendition can still be served while it is being regenerated, and still
+    has its file if the transaction is rolled back.
+    """
+    image = rendition.image
+    filter = rendition.filter
+    focal_point_key = filter.get_cache_key(image)
+
+    if (
+        focal_point_key != rendition.focal_point_key
+        and image.renditions.filter(
+            filter_spec=rendition.filter_spec, focal_point_key=focal_point_key
+        ).exists()
+    ):
+        # The image's focal point has changed since this rendition was created,
+        # and an up-to-date rendition already exists, so this one is unused
+        rendition.delete()
+        return
+
+    rendition.purge_from_cache()
+    old_file_name = rendition.file.name
+    storage = rendition.file.storage
+
+    new_file = image.generate_rendition_file(filter, source=source)
+    rendition.file.save(new_file.name, new_file, save=False)
+    rendition.focal_point_key = focal_point_key
+    rendition.save(update_fields=["file", "width", "height", "focal_point_key"])
+
+    if rendition.file.name != old_file_name:
+        transaction.on_commit(
+            lambda: delete_file_from_storage_task.enqueue(
+                storage.deconstruct(), old_file_name
+            )
+        )
+
+
+def update_renditions(rendition_ids, purge_only=False):
+    """
+    Regenerate (or, if ``purge_only`` is set, delete) the renditions with the
+    given ids, and return a list of the ids that could not be processed.
+
+    Renditions are grouped by image, so each original image is only read and
+    decoded once.
+    """
+    Rendition = get_image_model().get_rendition_model()
+    renditions = (
+        Rendition.objects.filter(id__in=rendition_ids)
+        .select_related("image")
+        .order_by("image_id", "id")
+    )
+
+    failed_ids = []
+    for image_id, image_renditions in groupby(renditions, lambda r: r.image_id):
+        image_renditions = list(image_renditions)
+
+        source = None
+        if not purge_only:
+            try:
+                source = image_renditions[0].image.get_decoded_image(
+                    *(rendition.filter for rendition in image_renditions)
+                )
+            except:  # noqa:E722
+                logger.exception("Error reading image %d", image_id)
+                failed_ids.extend(rendition.id for rendition in image_renditions)
+                continue
+
+        for rendition in image_renditions:
+            try:
+                with transaction.atomic():
+                    if purge_only:
+                        rendition.delete()
+                    else:
+                        regenerate_rendition(rendition, source)
+            except:  # noqa:E722
+                logger.exception("Error operating on rendition %d", rendition.id)
+                failed_ids.append(rendition.id)
+
+    return failed_ids
+
+
+def _setup_worker():
+    import django
+
+    django.setup()
+
+
 class Command(BaseCommand):
     """Command to create missing image renditions with the option to remove (purge) any existing ones."""
 
@@ -34,23 +130,46 @@ class Command(BaseCommand):
             "--chunk-size",
             type=int,
             default=50,
-            help="Operate in x size chunks (default: %(default)s)",
+            help="Operate on the renditions of x images at a time (default: %(default)s)",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Number of worker processes to operate on chunks in parallel (default: %(default)s)",
+        )
+        parser.add_argument(
+            "--filter-spec",
+            action="append",
+            dest="filter_specs",
+            help="Only operate on renditions with this filter spec (can be given more than once)",
+        )
+        parser.add_argument(
+            "--collection",
+            type=int,
+            help="Only operate on renditions of images in the collection with this id, or its descendants",
+        )
+        parser.add_argument(
+            "--created-after",
+            type=datetime.date.fromisoformat,
+            help="Only operate on renditions of images uploaded on or after this date (YYYY-MM-DD)",
+        )
+        parser.add_argument(
+            "--created-before",
+            type=datetime.date.fromisoformat,
+            help="Only operate on renditions of images uploaded before this date (YYYY-MM-DD)",
         )
 
     def handle(self, *args, **options):
-        Rendition = get_image_model().get_rendition_model()
-
-        renditions = Rendition.objects.all()
+        renditions = self.get_renditions(options)
 
         purge_only = options["purge_only"]
 
-        if not renditions.exists():
+        num_renditions = renditions.count()
+        if not num_renditions:
             self.stdout.write(self.style.WARNING("No image renditions found."))
             return
 
-        rendition_ids = list(renditions.values_list("id", flat=True))
-        num_renditions = len(rendition_ids)
-
         if purge_only:
             self.stdout.write(
                 self.style.HTTP_INFO(f"Purging {num_renditions} rendition(s)")
@@ -60,36 +179,27 @@ class Command(BaseCommand):
                 self.style.HTTP_INFO(f"Regenerating {num_renditions} rendition(s)")
             )
 
-        progress_bar_current = 1
-        for rendition in (
-            # Pre-calculate the ids of the renditions to change,
-            # otherwise `.iterator` never ends.
-            renditions.filter(id__in=rendition_ids)
-            .select_related("image")
-            .iterator(chunk_size=options["chunk_size"])
+        num_processed = 0
+        num_failed = 0
+        for rendition_ids, failed_ids in self.process_chunks(
+            self.get_chunks(renditions, options["chunk_size"]),
+            purge_only,
+            options["workers"],
         ):
-            try:
-                with transaction.atomic():
-                    rendition_filter = rendition.filter
-                    rendition_image = rendition.image
-
-                    # Delete the existing rendition
-                    rendition.delete()
-
-                    _progress_bar = progress_bar(progress_bar_current, num_renditions)
-                    self.stdout.write(_progress_bar[0], ending=_progress_bar[1])
-                    progress_bar_current = progress_bar_current + 1
-
-                    if not purge_only:
-                        # Create a new one
-                        rendition_image.get_rendition(rendition_filter)
-            except:  # noqa:E722
-                logger.exception("Error operating on rendition %d", rendition.id)
+            for rendition_id in failed_ids:
                 self.stderr.write(
-                    self.style.ERROR(f"Failed to operate on rendition {rendition.id}")
+                    self.style.ERROR(f"Failed to operate on rendition {rendition_id}")
                 )
-                num_renditions -= 1
+            num_failed += len(failed_ids)
+
+            for _ in rendition_ids:
+                # Renditions created while the command is running may take the
+                # count over the original total
+                num_processed = min(num_processed + 1, num_renditions)
+                _progress_bar = progress_bar(num_processed, num_renditions)
+                self.stdout.write(_progress_bar[0], ending=_progress_bar[1])
 
+        num_renditions = num_processed - num_failed
         if num_renditions:
             self.stdout.write(
                 self.style.SUCCESS(
@@ -98,3 +208,87 @@ class Command(BaseCommand):
             )
         else:
             self.stdout.write(self.style.WARNING("Could not process any renditions."))
+
+    def get_renditions(self, options):
+        Rendition = get_image_model().get_rendition_model()
+        renditions = Rendition.objects.all()
+
+        if options["filter_specs"]:
+            renditions = renditions.filter(filter_spec__in=options["filter_specs"])
+
+        if options["collection"] is not None:
+            collection = Collection.objects.get(id=options["collection"])
+            renditions = renditions.filter(
+                image__collection__in=collection.get_descendants(inclusive=True)
+            )
+
+        if options["created_after"]:
+            renditions = renditions.filter(
+                image__created_at__date__gte=options["created_after"]
+            )
+
+        if options["created_before"]:
+            renditions = renditions.filter(
+                image__created_at__date__lt=options["created_before"]
+            )
+
+        return renditions
+
+    def get_chunks(self, renditions, chunk_size):
+        """
+        Yield lists of the ids of the renditions of ``chunk_size`` images at a
+        time, paging through images by id.
+        """
+        last_image_id = None
+        while True:
+            chunk_renditions = renditions
+            if last_image_id is not None:
+                chunk_renditions = chunk_renditions.filter(image_id__gt=last_image_id)
+
+            image_ids = list(
+                chunk_renditions.order_by("image_id")
+                .values_list("image_id", flat=True)
+                .distinct()[:chunk_size]
+            )
+            if not image_ids:
+                return
+
+            last_image_id = image_ids[-1]
+            yield list(
+                renditions.filter(image_id__in=image_ids)
+                .order_by("id")
+                .values_list("id", flat=True)
+            )
+
+    def process_chunks(self, chunks, purge_only, workers):
+        """
+        Run ``update_renditions`` for each chunk of rendition ids, yielding a
+        ``(rendition_ids, failed_ids)`` pair for each chunk as it completes.
+        """
+        if workers <= 1:
+            for rendition_ids in chunks:
+                yield rendition_ids, update_renditions(rendition_ids, purge_only)
+            return
+
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers, initializer=_setup_worker
+        ) as executor:
+            pending = {}
+            for rendition_ids in chunks:
+                # Fetching the chunk opens a database connection, which must
+                # not be shared with a worker process forked on submitting it
+                connections.close_all()
+                future = executor.submit(update_renditions, rendition_ids, purge_only)
+                pending[future] = rendition_ids
+
+                # Limit the number of chunks waiting to be processed, so that
+                # memory usage does not grow with the number of renditions
+                if len(pending) >= workers * 2:
+                    done, _ = concurrent.futures.wait(
+                        pending, return_when=concurrent.futures.FIRST_COMPLETED
+                    )
+                    for future in done:
+                        yield pending.pop(future), future.result()
+
+            for future in concurrent.futures.as_completed(pending):
+                yield pending[future], future.result()
@@ -4,6 +4,7 @@ import concurrent.futures
 import hashlib
 import itertools
 import logging
+import math
 import os.path
 import re
 import time
@@ -47,6 +48,7 @@ from wagtail.images.image_operations import (
     TransformOperation,
 )
 from wagtail.images.rect import Rect
+from wagtail.images.tasks import generate_renditions_task
 from wagtail.images.utils import to_svg_safe_spec
 from wagtail.models import CollectionMember, ReferenceIndex
 from wagtail.permissions import policy_registry
@@ -56,6 +58,10 @@ from wagtail.utils.file import hash_filelike
 
 logger = logging.getLogger("wagtail.images")
 
+# How long (in seconds) to wait for a rendition enqueued for background generation
+# before it can be enqueued again
+RENDITION_PENDING_TIMEOUT = 300
+
 
 IMAGE_FORMAT_EXTENSIONS = {
     "avif": ".avif",
@@ -302,6 +308,10 @@ class AbstractImage(ImageFileMixin, CollectionMember, index.Indexed, models.Mode
 
     objects = ImageQuerySet.as_manager()
 
+    # Filter specs of renditions to generate in the background whenever an
+    # image is saved, so that they exist before they are first requested
+    pregenerated_renditions = []
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.decorative = False
@@ -553,6 +563,9 @@ class AbstractImage(ImageFileMixin, CollectionMember, index.Indexed, models.Mode
         try:
             rendition = self.find_existing_rendition(filter)
         except Rendition.DoesNotExist:
+            if getattr(settings, "WAGTAILIMAGES_BACKGROUND_RENDITIONS", False):
+                return self.enqueue_renditions(filter)[filter]
+
             rendition = self.create_rendition(filter)
             # Reuse this rendition if requested again from this object
             self._add_to_prefetched_renditions(rendition)
@@ -630,9 +643,12 @@ class AbstractImage(ImageFileMixin, CollectionMember, index.Indexed, models.Mode
 
         # Create any renditions not found in prefetched values, cache or database
         not_found = [f for f in filters if f not in renditions]
-        for filter, rendition in self.create_renditions(*not_found).items():
-            self._add_to_prefetched_renditions(rendition)
-            renditions[filter] = rendition
+        if getattr(settings, "WAGTAILIMAGES_BACKGROUND_RENDITIONS", False):
+            renditions.update(self.enqueue_renditions(*not_found))
+        else:
+            for filter, rendition in self.create_renditions(*not_found).items():
+                self._add_to_prefetched_renditions(rendition)
+                renditions[filter] = rendition
 
         # Update the cache
         cache_additions = {
@@ -642,6 +658,7 @@ class AbstractImage(ImageFileMixin, CollectionMember, index.Indexed, models.Mode
             for filter, rendition in renditions.items()
             # prevent writing of cached data back to the cache
             if not getattr(rendition, "_from_cache", False)
+            and not rendition.is_placeholder
         }
         if cache_additions:
             Rendition.cache_backend.set_many(cache_additions)
@@ -752,22 +769,21 @@ class AbstractImage(ImageFileMixin, CollectionMember, index.Indexed, models.Mode
         return_value: dict[Filter, AbstractRendition] = {}
         filter_map: dict[str, Filter] = {f.spec: f for f in filters}
 
-        # Read file contents into memory
-        with self.open_file() as file:
-            original_image_bytes = file.read()
-
-        to_create = []
+        source = self.get_decoded_image(*filters)
 
-        with concurrent.futures.ThreadPoolExecutor(max_workers=3) as executor:
-            for future in concurrent.futures.as_completed(
-                executor.submit(
-                    self.generate_rendition_instance,
-                    filter,
-                    BytesIO(original_image_bytes),
-                )
-                for filter in filters
-            ):
-                to_create.append(future.result())
+        workers = getattr(settings, "WAGTAILIMAGES_RENDITION_WORKERS", 3)
+        if workers > 1:
+            to_create = []
+            with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+                for future in concurrent.futures.as_completed(
+                    executor.submit(self.generate_rendition_instance, filter, source)
+                    for filter in filters
+                ):
+                    to_create.append(future.result())
+        else:
+            to_create = [
+                self.generate_rendition_instance(filter, source) for filter in filters
+            ]
 
         # Rendition generation can take a while. So, if other processes have created
         # identical renditions in the meantime, we should find them to avoid clashes.
@@ -808,24 +824,96 @@ class AbstractImage(ImageFileMixin, CollectionMember, index.Indexed, models.Mode
 
         return return_value
 
+    def enqueue_renditions(self, *filters: Filter) -> dict[Filter, AbstractRendition]:
+        """
+        Enqueues a task to generate renditions reflecting the supplied ``filters``
+        in the background, and returns a ``dict`` of placeholder ``Rendition``
+        instances keyed by the relevant ``Filter`` instance.
+
+        Placeholder renditions are unsaved, and use the original image file with
+        the dimensions that the generated rendition will have. A filter is not
+        enqueued again while a previous task for it is still pending.
+
+        This method is usually called by ``Image.get_rendition()`` and
+        ``Image.get_renditions()`` when the
+        ``WAGTAILIMAGES_BACKGROUND_RENDITIONS`` setting is enabled.
+        """
+        Rendition = self.get_rendition_model()
+
+        placeholders: dict[Filter, AbstractRendition] = {}
+        to_enqueue: list[str] = []
+
+        for filter in filters:
+            focal_point_key = filter.get_cache_key(self)
+            width, height = filter.get_transform(self).size
+            placeholder = Rendition(
+                image=self,
+                filter_spec=filter.spec,
+                focal_point_key=focal_point_key,
+                file=self.file,
+                width=width,
+                height=height,
+            )
+            placeholder.is_placeholder = True
+            placeholders[filter] = placeholder
+
+            pending_cache_key = "pending-" + Rendition.construct_cache_key(
+                self, focal_point_key, filter.spec
+            )
+            if Rendition.cache_backend.add(
+                pending_cache_key, True, timeout=RENDITION_PENDING_TIMEOUT
+            ):
+                to_enqueue.append(filter.spec)
+
+        if to_enqueue:
+            generate_renditions_task.enqueue(
+                self._meta.app_label, self._meta.model_name, str(self.pk), to_enqueue
+            )
+
+        return placeholders
+
+    def get_decoded_image(self, *filters: Filter) -> DecodedImage:
+        """
+        Reads this image's file into memory and decodes it once, so that
+        renditions reflecting the supplied ``filters`` can all be generated from
+        the returned ``DecodedImage``. JPEG files are decoded at the smallest
+        size that all of the renditions can be generated from.
+        """
+        with self.open_file() as file:
+            original_image_bytes = file.read()
+
+        willow_image = willow.Image.open(BytesIO(original_image_bytes))
+        if willow_image.format_name == "jpeg" and filters:
+            scale = max(filter.get_scale(self) for filter in filters)
+        else:
+            # Only JPEG files can be decoded at a reduced size
+            scale = 1
+        return DecodedImage.from_willow_image(willow_image, scale=scale)
+
     def generate_rendition_instance(
-        self, filter: Filter, source: BytesIO
+        self, filter: Filter, source: BytesIO | DecodedImage
     ) -> AbstractRendition:
         """
         Use the supplied ``source`` image to create and return an
         **unsaved** ``Rendition`` instance, with a ``file`` value reflecting
         the supplied ``filter`` value and focal point values from this object.
+
+        ``source`` may be the contents of the image file, or a ``DecodedImage``
+        shared between several renditions.
         """
+        if not isinstance(source, DecodedImage):
+            source = File(source, name=self.file.name)
+
         return self.get_rendition_model()(
             image=self,
             filter_spec=filter.spec,
             focal_point_key=filter.get_cache_key(self),
-            file=self.generate_rendition_file(
-                filter, source=File(source, name=self.file.name)
-            ),
+            file=self.generate_rendition_file(filter, source=source),
         )
 
-    def generate_rendition_file(self, filter: Filter, *, source: File = None) -> File:
+    def generate_rendition_file(
+        self, filter: Filter, *, source: File | DecodedImage = None
+    ) -> File:
         """
         Generates an in-memory image matching the supplied ``filter`` value
         and focal point value from this object, wraps it in a ``File`` object
@@ -836,6 +924,8 @@ class AbstractImage(ImageFileMixin, CollectionMember, index.Indexed, models.Mode
         If the contents of ``self.file`` has already been read into memory, the
         ``source`` keyword can be used to provide a reference to the in-memory
         ``File``, bypassing the need to reload the image contents from storage.
+        ``source`` may also be a ``DecodedImage``, to avoid decoding the image
+        again for each rendition.
 
         NOTE: The responsibility of generating the new image from the original
         falls to the supplied ``filter`` object. If you want to do anything
@@ -945,6 +1035,56 @@ class Image(AbstractImage):
         ]
 
 
+class DecodedImage:
+    """
+    A source image that has been decoded and auto-oriented, so that several
+    renditions can be generated from it without decoding the file again.
+    """
+
+    def __init__(self, willow_image, format_name: str, size: tuple[int, int]):
+        self.willow_image = willow_image
+        # The format of the original file, such as "jpeg"
+        self.format_name = format_name
+        # The full size of the auto-oriented image. This is larger than the size
+        # of willow_image if the file was decoded at a reduced scale
+        self.size = size
+
+    @classmethod
+    def from_willow_image(cls, willow_image, scale: float = 1) -> DecodedImage:
+        """
+        Decodes and auto-orients an image opened with ``willow.Image.open()``.
+
+        ``scale`` is the largest factor by which any rendition generated from
+        the image scales it down. JPEG files are decoded at the smallest size
+        the decoder supports (1/2, 1/4 or 1/8) that is still at least this large.
+        """
+        format_name = willow_image.format_name
+
+        if format_name == "jpeg" and scale < 1 and hasattr(willow_image, "f"):
+            from PIL import Image as PILImage
+            from willow.plugins.pillow import PillowImage
+
+            willow_image.f.seek(0)
+            pil_image = PILImage.open(willow_image.f)
+            full_width, full_height = pil_image.size
+            pil_image.draft(
+                pil_image.mode,
+                (math.ceil(full_width * scale), math.ceil(full_height * scale)),
+            )
+            pil_image.load()
+            decoded_width, decoded_height = pil_image.size
+
+            willow_image = PillowImage(pil_image).auto_orient()
+            if willow_image.get_size() != (decoded_width, decoded_height):
+                # The image has been rotated by 90 or 270 degrees
+                full_width, full_height = full_height, full_width
+
+            return cls(willow_image, format_name, (full_width, full_height))
+
+        willow_image = willow_image.auto_orient()
+        return cls(willow_image, format_name, willow_image.get_size())
+
+
 class Filter:
     """
     Represents one or more operations that can be applied to an Image to produce a rendition
@@ -1054,121 +1194,152 @@ class Filter:
             with image.get_willow_image() as willow_image:
                 yield willow_image
 
-    def run(self, image: AbstractImage, output: BytesIO, source: File = None):
-        with self.get_willow_image(image, source) as willow:
-            original_format = willow.format_name
+    def get_scale(self, image: AbstractImage) -> float:
+        """
+        Returns the factor by which this filter scales the given image down, as a
+        number between 0 and 1. This is used to decode large JPEG images at a
+        reduced size where the output is much smaller than the original.
+        """
+        return min(max(self.get_transform(image).scale), 1)
 
-            # Fix orientation of image
-            willow = willow.auto_orient()
+    def run(
+        self,
+        image: AbstractImage,
+        output: BytesIO,
+        source: File | DecodedImage = None,
+    ):
+        if isinstance(source, DecodedImage):
+            return self.run_on_decoded_image(image, output, source)
 
-            # Transform the image
-            transform = self.get_transform(
-                image, (willow.image.width, willow.image.height)
+        with self.get_willow_image(image, source) as willow:
+            # Only JPEG files can be decoded at a reduced size
+            scale = self.get_scale(image) if willow.format_name == "jpeg" else 1
+            return self.run_on_decoded_image(
+                image, output, DecodedImage.from_willow_image(willow, scale=scale)
             )
-            willow = willow.crop(transform.get_rect().round())
-            willow = willow.resize(transform.size)
 
-            # Apply filters
-            env = {
-                "original-format": original_format,
-            }
-            for operation in self.filter_operations:
-                willow = operation.run(willow, image, env) or willow
+    def run_on_decoded_image(
+        self, image: AbstractImage, output: BytesIO, source: DecodedImage
+    ):
+        willow = source.willow_image
+        original_format = source.format_name
+
+        # Transform the image. The transform is calculated against the full size
+        # of the image, then scaled to the size it was decoded at
+        transform = self.get_transform(image, source.size)
+        rect = transform.get_rect()
+        decoded_width, decoded_height = willow.get_size()
+        if (decoded_width, decoded_height) != tuple(source.size):
+            x_scale = decoded_width / source.size[0]
+            y_scale = decoded_height / source.size[1]
+            rect = Rect(
+                rect.left * x_scale,
+                rect.top * y_scale,
+                rect.right * x_scale,
+                rect.bottom * y_scale,
+            )
+        willow = willow.crop(rect.round())
+        willow = willow.resize(transform.size)
 
-            # Find the output format to use
-            if "output-format" in env:
-                # Developer specified an output format
-                output_format = env["output-format"]
-            else:
-                # Convert bmp to png, and heic to jpg, by default
-                default_conversions = {
-                    "bmp": "png",
-                    "heic": "jpeg",
-                }
+        # Apply filters
+        env = {
+            "original-format": original_format,
+        }
+        for operation in self.filter_operations:
+            willow = operation.run(willow, image, env) or willow
 
-                # Convert unanimated GIFs to PNG as well
-                if not willow.has_animation():
-                    default_conversions["gif"] = "png"
+        # Find the output format to use
+        if "output-format" in env:
+            # Developer specified an output format
+            output_format = env["output-format"]
+        else:
+            # Convert bmp to png, and heic to jpg, by default
+            default_conversions = {
+                "bmp": "png",
+                "heic": "jpeg",
+            }
 
-                # Allow the user to override the conversions
-                conversion = getattr(settings, "WAGTAILIMAGES_FORMAT_CONVERSIONS", {})
-                default_conversions.update(conversion)
+            # Convert unanimated GIFs to PNG as well
+            if not willow.has_animation():
+                default_conversions["gif"] = "png"
 
-                # Get the converted output format falling back to the original
-                output_format = default_conversions.get(
-                    original_format, original_format
-                )
+            # Allow the user to override the conversions
+            conversion = getattr(settings, "WAGTAILIMAGES_FORMAT_CONVERSIONS", {})
+            default_conversions.update(conversion)
 
-            # Prevent raster-only format conversions for SVG images
-            if original_format == "svg" and output_format != "svg":
-                raise InvalidFilterSpecError(
-                    "format-* operations are not supported for SVG images. To skip this conversion for SVG images, use 'preserve-svg'."
-                )
+            # Get the converted output format falling back to the original
+            output_format = default_conversions.get(original_format, original_format)
 
-            if output_format == "jpeg":
-                # Allow changing of JPEG compression quality
-                if "jpeg-quality" in env:
-                    quality = env["jpeg-quality"]
-                else:
-                    quality = getattr(settings, "WAGTAILIMAGES_JPEG_QUALITY", 76)
+        # Prevent raster-only format conversions for SVG images
+        if original_format == "svg" and output_format != "svg":
+            raise InvalidFilterSpecError(
+                "format-* operations are not supported for SVG images. To skip this conversion for SVG images, use 'preserve-svg'."
+            )
 
-                # If the image has an alpha channel, give it a white background
-                if willow.has_alpha():
-                    willow = willow.set_background_color_rgb((255, 255, 255))
+        if output_format == "jpeg":
+            # Allow changing of JPEG compression quality
+            if "jpeg-quality" in env:
+                quality = env["jpeg-quality"]
+            else:
+                quality = getattr(settings, "WAGTAILIMAGES_JPEG_QUALITY", 76)
 
-                return willow.save_as_jpeg(
-                    output, quality=quality, progressive=True, optimize=True
-                )
-            elif output_format == "png":
-                return willow.save_as_png(output, optimize=True)
-            elif output_format == "gif":
-                return willow.save_as_gif(output)
-            elif output_format == "webp":
-                # Allow changing of WebP compression quality
-                if (
-                    "output-format-options" in env
-                    and "lossless" in env["output-format-options"]
-                ):
-                    return willow.save_as_webp(output, lossless=True)
-                elif "webp-quality" in env:
-                    quality = env["webp-quality"]
-                else:
-                    quality = getattr(settings, "WAGTAILIMAGES_WEBP_QUALITY", 80)
+            # If the image has an alpha channel, give it a white background
+            if willow.has_alpha():
+                willow = willow.set_background_color_rgb((255, 255, 255))
 
-                return willow.save_as_webp(output, quality=quality)
-            elif output_format == "avif":
-                # Allow changing of AVIF compression quality
-                if (
-                    "output-format-options" in env
-                    and "lossless" in env["output-format-options"]
-                ):
-                    return willow.save_as_avif(output, lossless=True)
-                elif "avif-quality" in env:
-                    quality = env["avif-quality"]
-                else:
-                    quality = getattr(settings, "WAGTAILIMAGES_AVIF_QUALITY", 61)
-                return willow.save_as_avif(output, quality=quality)
-            elif output_format == "heic":
-                # Allow changing of HEIC compression quality. Safari is the only browser that supports HEIC,
-                # so there is little value in outputting it - for that reason, we make it work if someone
-                # explicitly requests it, but these settings are not documented.
-                if (
-                    "output-format-options" in env
-                    and "lossless" in env["output-format-options"]
-                ):
-                    return willow.save_as_heic(output, lossless=True)
-                elif "heic-quality" in env:
-                    quality = env["heic-quality"]
-                else:
-                    quality = getattr(settings, "WAGTAILIMAGES_HEIC_QUALITY", 80)
-                return willow.save_as_heic(output, quality=quality)
-            elif output_format == "svg":
-                return willow.save_as_svg(output)
-            elif output_format == "ico":
-                return willow.save_as_ico(output)
-            raise UnknownOutputImageFormatError(
-                f"Unknown output image format '{output_format}'"
+            return willow.save_as_jpeg(
+                output, quality=quality, progressive=True, optimize=True
             )
+        elif output_format == "png":
+            return willow.save_as_png(output, optimize=True)
+        elif output_format == "gif":
+            return willow.save_as_gif(output)
+        elif output_format == "webp":
+            # Allow changing of WebP compression quality
+            if (
+                "output-format-options" in env
+                and "lossless" in env["output-format-options"]
+            ):
+                return willow.save_as_webp(output, lossless=True)
+            elif "webp-quality" in env:
+                quality = env["webp-quality"]
+            else:
+                quality = getattr(settings, "WAGTAILIMAGES_WEBP_QUALITY", 80)
+
+            return willow.save_as_webp(output, quality=quality)
+        elif output_format == "avif":
+            # Allow changing of AVIF compression quality
+            if (
+                "output-format-options" in env
+                and "lossless" in env["output-format-options"]
+            ):
+                return willow.save_as_avif(output, lossless=True)
+            elif "avif-quality" in env:
+                quality = env["avif-quality"]
+            else:
+                quality = getattr(settings, "WAGTAILIMAGES_AVIF_QUALITY", 61)
+            return willow.save_as_avif(output, quality=quality)
+        elif output_format == "heic":
+            # Allow changing of HEIC compression quality. Safari is the only browser that supports HEIC,
+            # so there is little value in outputting it - for that reason, we make it work if someone
+            # explicitly requests it, but these settings are not documented.
+            if (
+                "output-format-options" in env
+                and "lossless" in env["output-format-options"]
+            ):
+                return willow.save_as_heic(output, lossless=True)
+            elif "heic-quality" in env:
+                quality = env["heic-quality"]
+            else:
+                quality = getattr(settings, "WAGTAILIMAGES_HEIC_QUALITY", 80)
+            return willow.save_as_heic(output, quality=quality)
+        elif output_format == "svg":
+            return willow.save_as_svg(output)
+        elif output_format == "ico":
+            return willow.save_as_ico(output)
+        raise UnknownOutputImageFormatError(
+            f"Unknown output image format '{output_format}'"
+        )
 
     def get_cache_key(self, image):
         vary_parts = []
@@ -1338,6 +1509,10 @@ class AbstractRendition(ImageFileMixin, models.Model):
 
     wagtail_reference_index_ignore = True
 
+    # Whether this is an unsaved stand-in for a rendition that is being
+    # generated in the background (see ``AbstractImage.enqueue_renditions()``)
+    is_placeholder = False
+
     @property
     def url(self):
         return self.file.url
@@ -5,7 +5,7 @@ from django.db.models.signals import post_delete, post_save
 from wagtail.images import get_image_model
 from wagtail.tasks import delete_file_from_storage_task
 
-from .tasks import set_image_focal_point_task
+from .tasks import generate_renditions_task, set_image_focal_point_task
 
 
 def post_delete_file_cleanup(instance, **kwargs):
@@ -31,11 +31,28 @@ def post_save_image_feature_detection(instance, **kwargs):
             )
 
 
+def post_save_pregenerate_renditions(instance, **kwargs):
+    if kwargs["raw"] or not instance.pregenerated_renditions:
+        return
+
+    # Generate renditions once the image has been committed, so that it is
+    # visible to the task
+    transaction.on_commit(
+        lambda: generate_renditions_task.enqueue(
+            instance._meta.app_label,
+            instance._meta.model_name,
+            str(instance.pk),
+            list(instance.pregenerated_renditions),
+        )
+    )
+
+
 def register_signal_handlers():
     Image = get_image_model()
     Rendition = Image.get_rendition_model()
 
     post_save.connect(post_save_image_feature_detection, sender=Image)
+    post_save.connect(post_save_pregenerate_renditions, sender=Image)
     post_delete.connect(post_delete_file_cleanup, sender=Image)
     post_delete.connect(post_delete_file_cleanup, sender=Rendition)
     post_delete.connect(post_delete_purge_rendition_cache, sender=Rendition)
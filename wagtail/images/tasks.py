@@ -16,3 +16,18 @@ def set_image_focal_point_task(app_label, model_name, pk):
             "focal_point_height",
         ]
     )
+
+
+@task()
+def generate_renditions_task(app_label, model_name, pk, filter_specs):
+    from wagtail.images.models import Filter
+
+    model = apps.get_model(app_label, model_name)
+    try:
+        instance = model.objects.get(pk=pk)
+    except model.DoesNotExist:
+        return
+
+    filters = [instance.clean_filter_for_svg(Filter(spec)) for spec in filter_specs]
+    existing = instance.find_existing_renditions(*filters)
+    instance.create_renditions(*(f for f in filters if f not in existing))
@@ -1,10 +1,16 @@
+import datetime
+import multiprocessing
 import re
 import warnings
 from io import StringIO
+from unittest import mock
 
 from django.core import management
+from django.db import connections
 from django.test import TestCase, override_settings
 
+from wagtail.models import Collection
+
 from ..management.commands.wagtail_update_image_renditions import progress_bar
 from .utils import Image, get_test_image_file
 
@@ -138,3 +144,118 @@ class TestUpdateImageRenditions(TestCase):
         self.assertIn(
             f"Successfully processed {total_renditions} rendition(s)\n", output_string
         )
+
+    def test_image_renditions_are_replaced_in_place(self):
+        old_file_name = self.rendition.file.name
+        storage = self.rendition.file.storage
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.run_command()
+
+        rendition = Rendition.objects.get()
+        # The existing rendition is updated rather than deleted and recreated
+        self.assertEqual(rendition.pk, self.rendition.pk)
+        self.assertNotEqual(rendition.file.name, old_file_name)
+        self.assertTrue(storage.exists(rendition.file.name))
+        self.assertFalse(storage.exists(old_file_name))
+        self.assertEqual((rendition.width, rendition.height), (640, 480))
+
+    def test_old_rendition_file_deleted_on_commit(self):
+        rendition = self.image.get_rendition("width-100")
+        old_file_name = rendition.file.name
+        storage = rendition.file.storage
+        self.assertTrue(storage.exists(old_file_name))
+
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            self.run_command(filter_specs=["width-100"])
+
+        # The old file is kept until the new file name has been committed
+        self.assertTrue(storage.exists(old_file_name))
+        for callback in callbacks:
+            callback()
+        self.assertFalse(storage.exists(old_file_name))
+
+    def test_image_renditions_in_chunks(self):
+        other_image = Image.objects.create(
+            title="Other test image",
+            file=get_test_image_file(filename="other_image.png", colour="white"),
+        )
+        other_image.get_renditions("width-100", "width-200")
+
+        output = self.run_command(chunk_size=1)
+        output_string = self.REAESC.sub("", output.read())
+        self.assertIn("Regenerating 3 rendition(s)\n", output_string)
+        self.assertIn("Successfully processed 3 rendition(s)\n", output_string)
+        self.assertEqual(Rendition.objects.count(), 3)
+
+    def test_image_renditions_with_workers(self):
+        if multiprocessing.current_process().daemon:
+            self.skipTest("Daemonic processes (as used by --parallel) can't fork")
+
+        other_image = Image.objects.create(
+            title="Other test image",
+            file=get_test_image_file(filename="other_image.png", colour="white"),
+        )
+        other_image.get_renditions("width-100", "width-200")
+
+        with mock.patch.object(
+            connections, "close_all", wraps=connections.close_all
+        ) as close_all:
+            output = self.run_command(chunk_size=1, workers=2)
+
+        output_string = self.REAESC.sub("", output.read())
+        self.assertIn("Regenerating 3 rendition(s)\n", output_string)
+        self.assertIn("Successfully processed 3 rendition(s)\n", output_string)
+
+        # The parent's connections are closed before each chunk is submitted,
+        # as a worker process may be forked then
+        self.assertEqual(close_all.call_count, 2)
+
+    def test_image_renditions_with_filter_spec(self):
+        self.image.get_renditions("width-100", "width-200")
+        width_100 = Rendition.objects.get(filter_spec="width-100")
+        width_200 = Rendition.objects.get(filter_spec="width-200")
+
+        output = self.run_command(filter_specs=["width-100"])
+        output_string = self.REAESC.sub("", output.read())
+        self.assertIn("Regenerating 1 rendition(s)\n", output_string)
+
+        self.assertNotEqual(
+            Rendition.objects.get(pk=width_100.pk).file.name, width_100.file.name
+        )
+        self.assertEqual(
+            Rendition.objects.get(pk=width_200.pk).file.name, width_200.file.name
+        )
+
+    def test_image_renditions_with_collection(self):
+        root_collection = Collection.get_first_root_node()
+        collection = root_collection.add_child(name="Evil plans")
+        child_collection = collection.add_child(name="Secret plans")
+        other_image = Image.objects.create(
+            title="Other test image",
+            file=get_test_image_file(filename="other_image.png", colour="white"),
+            collection=child_collection,
+        )
+        other_image.get_rendition("width-100")
+
+        output = self.run_command(purge_only=True, collection=collection.id)
+        output_string = self.REAESC.sub("", output.read())
+        self.assertIn("Purging 1 rendition(s)\n", output_string)
+        self.assertFalse(other_image.renditions.exists())
+        self.assertTrue(self.image.renditions.exists())
+
+    def test_image_renditions_with_created_dates(self):
+        output = self.run_command(
+            purge_only=True,
+            created_before=datetime.date(2000, 1, 1),
+        )
+        output_string = self.REAESC.sub("", output.read())
+        self.assertEqual(output_string, "No image renditions found.\n")
+
+        output = self.run_command(
+            purge_only=True,
+            created_after=datetime.date(2000, 1, 1),
+        )
+        output_string = self.REAESC.sub("", output.read())
+        self.assertIn("Purging 1 rendition(s)\n", output_string)
+        self.assertFalse(Rendition.objects.exists())
@@ -20,10 +20,12 @@ from django.test import (
     tag,
 )
 from django.urls import reverse
+from PIL import Image as PILImage
 from willow.image import Image as WillowImage
 
 from wagtail.images.exceptions import InvalidFilterSpecError
 from wagtail.images.models import (
+    DecodedImage,
     Filter,
     Picture,
     Rendition,
@@ -32,6 +34,7 @@ from wagtail.images.models import (
     get_rendition_storage,
 )
 from wagtail.images.rect import Rect
+from wagtail.images.tasks import generate_renditions_task
 from wagtail.models import Collection, GroupCollectionPermission, ReferenceIndex
 from wagtail.search.backends import get_search_backend
 from wagtail.test.dummy_external_storage import (
@@ -49,6 +52,7 @@ from wagtail.test.utils import Page, PageFixturesMixin, WagtailTestUtils
 from .utils import (
     Image,
     get_test_image_file,
+    get_test_image_file_jpeg,
     get_test_image_file_svg,
     get_test_image_filename,
 )
@@ -809,6 +813,64 @@ class TestRenditions(TestCase):
         # required, and no cache hits are made
         self._test_get_renditions_performance(0, prefetch_all=True)
 
+    def test_create_renditions_decodes_image_once(self):
+        opened_sizes = []
+        original_open = PILImage.open
+
+        def open_image(*args, **kwargs):
+            image = original_open(*args, **kwargs)
+            opened_sizes.append(image.size)
+            return image
+
+        filter_list = [Filter(spec) for spec in self.SPECS]
+        with mock.patch("PIL.Image.open", side_effect=open_image):
+            result = self.image.create_renditions(*filter_list)
+
+        # The original is only opened once, other calls read the generated renditions
+        self.assertEqual(opened_sizes.count((640, 480)), 1)
+        self.assertEqual(
+            {(filter.spec, rendition.width) for filter, rendition in result.items()},
+            {("height-66", 88), ("width-100", 100), ("width-400", 400)},
+        )
+
+    @override_settings(WAGTAILIMAGES_RENDITION_WORKERS=1)
+    def test_create_renditions_without_thread_pool(self):
+        filter_list = [Filter(spec) for spec in self.SPECS]
+        with mock.patch(
+            "concurrent.futures.ThreadPoolExecutor"
+        ) as thread_pool_executor:
+            result = self.image.create_renditions(*filter_list)
+
+        thread_pool_executor.assert_not_called()
+        self.assertEqual(
+            {filter.spec for filter in result.keys()},
+            set(self.SPECS),
+        )
+
+    def test_create_renditions_decodes_large_jpeg_at_reduced_size(self):
+        image = Image.objects.create(
+            title="Test image",
+            file=get_test_image_file_jpeg(size=(1600, 1200)),
+            focal_point_x=1400,
+            focal_point_y=1000,
+            focal_point_width=100,
+            focal_point_height=100,
+        )
+
+        with image.open_file() as file:
+            source = DecodedImage.from_willow_image(WillowImage.open(file), scale=0.1)
+            self.assertEqual(source.size, (1600, 1200))
+            self.assertEqual(source.willow_image.get_size(), (200, 150))
+
+        result = image.create_renditions(Filter("width-100"), Filter("fill-100x100"))
+        self.assertEqual(
+            {
+                (filter.spec, rendition.width, rendition.height)
+                for filter, rendition in result.items()
+            },
+            {("width-100", 100, 75), ("fill-100x100", 100, 100)},
+        )
+
     def test_create_renditions(self):
         filter_list = [Filter(spec) for spec in self.SPECS]
         # When no renditions exist, there should be one query for
@@ -1116,6 +1178,76 @@ class TestRenditions(TestCase):
         self.assertEqual(renditions["width-200"].url, filename2)
 
 
+@override_settings(WAGTAILIMAGES_BACKGROUND_RENDITIONS=True)
+class TestBackgroundRenditions(TestCase):
+    def setUp(self):
+        self.image = Image.objects.create(
+            title="Test image",
+            file=get_test_image_file(),
+        )
+
+    @mock.patch("wagtail.images.models.generate_renditions_task")
+    def test_get_rendition_returns_placeholder(self, generate_renditions_task):
+        rendition = self.image.get_rendition("width-100")
+
+        self.assertTrue(rendition.is_placeholder)
+        self.assertIsNone(rendition.pk)
+        self.assertEqual(rendition.url, self.image.file.url)
+        self.assertEqual((rendition.width, rendition.height), (100, 75))
+        self.assertFalse(self.image.renditions.exists())
+        generate_renditions_task.enqueue.assert_called_once_with(
+            "wagtailimages", "image", str(self.image.pk), ["width-100"]
+        )
+
+        # The rendition is not enqueued again while generation is pending
+        rendition = self.image.get_rendition("width-100")
+        self.assertTrue(rendition.is_placeholder)
+        generate_renditions_task.enqueue.assert_called_once()
+
+    @mock.patch("wagtail.images.models.generate_renditions_task")
+    def test_get_renditions_enqueues_missing_renditions(self, generate_renditions_task):
+        with override_settings(WAGTAILIMAGES_BACKGROUND_RENDITIONS=False):
+            existing = self.image.get_rendition("width-400")
+
+        renditions = self.image.get_renditions("width-400", "height-66", "width-100")
+
+        self.assertEqual(renditions["width-400"], existing)
+        self.assertFalse(renditions["width-400"].is_placeholder)
+        self.assertTrue(renditions["height-66"].is_placeholder)
+        self.assertTrue(renditions["width-100"].is_placeholder)
+        generate_renditions_task.enqueue.assert_called_once_with(
+            "wagtailimages", "image", str(self.image.pk), ["height-66", "width-100"]
+        )
+
+    def test_generate_renditions_task(self):
+        generate_renditions_task.call(
+            "wagtailimages", "image", str(self.image.pk), ["height-66", "width-100"]
+        )
+
+        self.assertEqual(
+            set(self.image.renditions.values_list("filter_spec", flat=True)),
+            {"height-66", "width-100"},
+        )
+        rendition = self.image.get_rendition("width-100")
+        self.assertFalse(rendition.is_placeholder)
+        self.assertEqual(rendition.width, 100)
+
+    def test_pregenerated_renditions(self):
+        with mock.patch.object(
+            Image, "pregenerated_renditions", ["width-100", "fill-50x50"]
+        ):
+            with self.captureOnCommitCallbacks(execute=True):
+                image = Image.objects.create(
+                    title="Test image",
+                    file=get_test_image_file(),
+                )
+
+        self.assertEqual(
+            set(image.renditions.values_list("filter_spec", flat=True)),
+            {"width-100", "fill-50x50"},
+        )
+
+
 @override_settings(
     CACHES={"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
 )
@@ -1,6 +1,7 @@
 import os
 import unittest
 from io import BytesIO
+from unittest import mock
 
 import willow
 from django import forms, template
@@ -22,6 +23,7 @@ from wagtail.images import get_image_model, get_image_model_string
 from wagtail.images.fields import WagtailImageField
 from wagtail.images.formats import Format, get_image_format, register_image_format
 from wagtail.images.forms import get_image_form
+from wagtail.images.models import Filter
 from wagtail.images.models import Image as WagtailImage
 from wagtail.images.rect import Rect, Vector
 from wagtail.images.tests import update_permission_policy
@@ -610,6 +612,25 @@ class TestFrontendServeView(TestCase):
         )
         self.assertEqual(response["Cache-Control"], "max-age=3600, public")
 
+    @override_settings(WAGTAILIMAGES_BACKGROUND_RENDITIONS=True)
+    def test_placeholder_rendition_not_cached(self):
+        signature = generate_signature(self.image.id, "fill-800x600")
+        url = reverse(
+            "wagtailimages_serve_action_serve",
+            args=(signature, self.image.id, "fill-800x600"),
+        )
+
+        with mock.patch("wagtail.images.models.generate_renditions_task"):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("no-store", response["Cache-Control"])
+        self.assertNotIn("public", response["Cache-Control"])
+
+        # Once the rendition has been generated, it can be cached
+        self.image.create_rendition(Filter(spec="fill-800x600"))
+        response = self.client.get(url)
+        self.assertEqual(response["Cache-Control"], "max-age=3600, public")
+
 
 class TestFrontendSendfileView(TestCase):
     def setUp(self):
@@ -2,8 +2,8 @@ from django.core.exceptions import ImproperlyConfigured, PermissionDenied
 from django.http import FileResponse, HttpResponse
 from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse
-from django.utils.decorators import classonlymethod, method_decorator
-from django.views.decorators.cache import cache_control
+from django.utils.cache import add_never_cache_headers, patch_cache_control
+from django.utils.decorators import classonlymethod
 from django.views.generic import View
 
 from wagtail.images import get_image_model
@@ -35,7 +35,6 @@ class ServeView(View):
 
         return super().as_view(**initkwargs)
 
-    @method_decorator(cache_control(max_age=3600, public=True))
     def get(self, request, signature, image_id, filter_spec, filename=None):
         if not verify_signature(
             signature.encode(), image_id, filter_spec, key=self.key
@@ -48,17 +47,26 @@ class ServeView(View):
         try:
             rendition = image.get_rendition(filter_spec)
         except SourceImageIOError:
-            return HttpResponse(
+            response = HttpResponse(
                 "Source image file not found", content_type="text/plain", status=410
             )
         except InvalidFilterSpecError:
-            return HttpResponse(
+            response = HttpResponse(
                 "Invalid filter spec: " + filter_spec,
                 content_type="text/plain",
                 status=400,
             )
-
-        return getattr(self, self.action)(rendition)
+        else:
+            response = getattr(self, self.action)(rendition)
+            if rendition.is_placeholder:
+                # The original image is served at this URL until the rendition
+                # has been generated in the background, so it mustn't be kept
+                # by browsers or frontend caches
+                add_never_cache_headers(response)
+                return response
+
+        patch_cache_control(response, max_age=3600, public=True)
+        return response
 
     def serve(self, rendition):
         with rendition.get_willow_image() as willow_image:
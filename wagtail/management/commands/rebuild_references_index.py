@@ -1,12 +1,95 @@
+import uuid
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
 from django.apps import apps
-from django.core.management.base import BaseCommand
-from django.db import transaction
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, models, transaction
+from django.db.models import CharField
+from django.db.models.functions import Cast
 
 from wagtail.models import ReferenceIndex
-from wagtail.signal_handlers import disable_reference_index_auto_update
 
 DEFAULT_CHUNK_SIZE = 1000
 
+# Cache key for the state of the most recent run, used by --resume. The state
+# and the checkpoints of each task are kept in the default cache, so are only
+# stored if it is shared between processes and kept between runs.
+RUN_CACHE_KEY = "wagtail-rebuild-references-index"
+
+# The integer field types whose primary keys can be split into ranges across workers
+INTEGER_PK_FIELDS = (models.AutoField, models.BigAutoField, models.IntegerField)
+
+
+def get_checkpoint_key(run_id, task_index):
+    return f"{RUN_CACHE_KEY}:{run_id}:{task_index}"
+
+
+def iter_index_model_range(
+    model_label, after_pk, upto_pk, chunk_size, checkpoint_key=None
+):
+    """
+    Index all instances of the given model with a primary key greater than
+    ``after_pk`` (if not None) and up to and including ``upto_pk`` (if not None),
+    yielding the number of objects indexed in each chunk.
+
+    Instances are fetched ``chunk_size`` at a time, ordered by primary key, and
+    each chunk is committed in its own transaction. After each chunk, the last
+    primary key is stored in the cache under ``checkpoint_key`` (if not None)
+    so that the task can be resumed.
+    """
+    model = apps.get_model(model_label)
+    queryset = model._default_manager.order_by("pk")
+    if upto_pk is not None:
+        queryset = queryset.filter(pk__lte=upto_pk)
+
+    while True:
+        chunk_queryset = queryset
+        if after_pk is not None:
+            chunk_queryset = chunk_queryset.filter(pk__gt=after_pk)
+
+        with transaction.atomic():
+            chunk = list(chunk_queryset[:chunk_size])
+            if not chunk:
+                break
+            ReferenceIndex.create_or_update_for_objects(chunk)
+
+        after_pk = chunk[-1].pk
+        if checkpoint_key is not None:
+            cache.set(checkpoint_key, {"after_pk": after_pk, "done": False}, None)
+        yield len(chunk)
+
+    if checkpoint_key is not None:
+        cache.set(checkpoint_key, {"after_pk": after_pk, "done": True}, None)
+
+
+def index_model_range(model_label, after_pk, upto_pk, chunk_size, checkpoint_key=None):
+    """
+    Index a range of instances of the given model, as with
+    ``iter_index_model_range``, and return the number of objects indexed.
+    """
+    return sum(
+        iter_index_model_range(
+            model_label, after_pk, upto_pk, chunk_size, checkpoint_key
+        )
+    )
+
+
+def cache_is_shared():
+    """
+    Return whether the default cache can be read by other processes and
+    later runs, so can hold the checkpoints of a run.
+    """
+    return not isinstance(caches[DEFAULT_CACHE_ALIAS], (LocMemCache, DummyCache))
+
+
+def _setup_worker():
+    import django
+
+    django.setup()
+
 
 class Command(BaseCommand):
     def write(self, *args, **kwargs):
@@ -27,41 +110,160 @@ class Command(BaseCommand):
             type=int,
             help="Set number of records to be fetched at once for inserting into the index",
         )
+        parser.add_argument(
+            "--workers",
+            action="store",
+            dest="workers",
+            default=1,
+            type=int,
+            help="Set number of worker processes to index models or primary key ranges in parallel",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            dest="resume",
+            default=False,
+            help=(
+                "Continue an interrupted run from its last committed chunk. "
+                "Requires a default cache shared between processes"
+            ),
+        )
 
     def handle(self, **options):
         self.verbosity = options["verbosity"]
 
-        chunk_size = options.get("chunk_size")
+        chunk_size = options["chunk_size"]
+        workers = max(options["workers"], 1)
         object_count = 0
 
+        if options["resume"] and not cache_is_shared():
+            raise CommandError(
+                "--resume requires a default cache that is shared between "
+                "processes, such as the database, Redis or Memcached cache"
+            )
+        checkpoints = cache_is_shared()
+
         self.write("Rebuilding reference index")
 
-        with transaction.atomic():
-            with disable_reference_index_auto_update():
-                # Use `_raw_delete` to avoid loading instances into memory
-                all_references = ReferenceIndex.objects.all()
-                all_references._raw_delete(using=all_references.db)
+        run = cache.get(RUN_CACHE_KEY) if options["resume"] else None
+        if run is None:
+            run = {"run_id": uuid.uuid4().hex, "tasks": self.get_tasks(workers)}
+            if checkpoints:
+                cache.set(RUN_CACHE_KEY, run, None)
+        else:
+            self.write("Resuming run %s" % run["run_id"])
 
-            for model in apps.get_models():
-                if not ReferenceIndex.is_indexed(model):
-                    continue
+        pending_tasks = []
+        for task_index, (model_label, after_pk, upto_pk) in enumerate(run["tasks"]):
+            checkpoint_key = None
+            if checkpoints:
+                checkpoint_key = get_checkpoint_key(run["run_id"], task_index)
+                checkpoint = cache.get(checkpoint_key)
+                if checkpoint is not None:
+                    if checkpoint["done"]:
+                        continue
+                    after_pk = checkpoint["after_pk"]
+            pending_tasks.append(
+                (model_label, after_pk, upto_pk, chunk_size, checkpoint_key)
+            )
 
-                self.write(str(model))
+        if workers == 1:
+            for task in pending_tasks:
+                self.write(str(apps.get_model(task[0])))
+                for count in self.print_iter_progress(iter_index_model_range(*task)):
+                    object_count += count
+                self.print_newline()
+        else:
+            # Connections must not be shared with the worker processes
+            connections.close_all()
+            with ProcessPoolExecutor(
+                max_workers=workers, initializer=_setup_worker
+            ) as executor:
+                futures = {
+                    executor.submit(index_model_range, *task): task
+                    for task in pending_tasks
+                }
+                for future in as_completed(futures):
+                    count = future.result()
+                    self.write(
+                        "%s (%d objects)" % (apps.get_model(futures[future][0]), count)
+                    )
+                    object_count += count
 
-                # Add items (chunk_size at a time)
-                for chunk in self.print_iter_progress(
-                    self.queryset_chunks(model.objects.all().order_by("pk"), chunk_size)
-                ):
-                    for instance in chunk:
-                        ReferenceIndex.create_or_update_for_object(instance)
+        self.remove_stale_references()
 
-                    object_count += len(chunk)
-
-                self.print_newline()
+        if checkpoints:
+            for task_index in range(len(run["tasks"])):
+                cache.delete(get_checkpoint_key(run["run_id"], task_index))
+            cache.delete(RUN_CACHE_KEY)
 
         self.write("Indexed %d objects" % object_count)
         self.print_newline()
 
+    def get_tasks(self, workers):
+        """
+        Return a list of ``(model_label, after_pk, upto_pk)`` tuples covering all
+        indexed models. Models with integer primary keys are split into one
+        primary key range per worker.
+        """
+        tasks = []
+        for model in apps.get_models():
+            if not ReferenceIndex.is_indexed(model):
+                continue
+
+            model_label = model._meta.label
+            if workers == 1 or not isinstance(model._meta.pk, INTEGER_PK_FIELDS):
+                tasks.append((model_label, None, None))
+                continue
+
+            pk_range = model._default_manager.aggregate(
+                min_pk=models.Min("pk"), max_pk=models.Max("pk")
+            )
+            if pk_range["min_pk"] is None:
+                tasks.append((model_label, None, None))
+                continue
+
+            step = (pk_range["max_pk"] - pk_range["min_pk"]) // workers + 1
+            after_pk = None
+            for upto_pk in range(
+                pk_range["min_pk"] + step - 1, pk_range["max_pk"], step
+            ):
+                tasks.append((model_label, after_pk, upto_pk))
+                after_pk = upto_pk
+            # Leave the last range open-ended to pick up objects created during the run
+            tasks.append((model_label, after_pk, None))
+
+        return tasks
+
+    def remove_stale_references(self):
+        """
+        Delete references recorded against models that are no longer indexed,
+        and against objects that no longer exist.
+        """
+        base_content_types = {
+            ReferenceIndex._get_base_content_type(model)
+            for model in apps.get_models()
+            if ReferenceIndex.is_indexed(model)
+        }
+
+        for base_content_type in base_content_types:
+            existing_object_ids = (
+                base_content_type.model_class()
+                ._default_manager.annotate(
+                    object_id_str=Cast("pk", output_field=CharField())
+                )
+                .values("object_id_str")
+            )
+            with transaction.atomic():
+                ReferenceIndex.objects.filter(
+                    base_content_type=base_content_type
+                ).exclude(object_id__in=existing_object_ids).delete()
+
+        with transaction.atomic():
+            ReferenceIndex.objects.exclude(
+                base_content_type__in=base_content_types
+            ).delete()
+
     def print_newline(self):
         self.write("")
 
@@ -87,20 +289,3 @@ class Command(BaseCommand):
                 self.write(" ", ending="")
 
             self.stdout.flush()
-
-    # Atomic so the count of models doesn't change as it is iterated
-    @transaction.atomic
-    def queryset_chunks(self, qs, chunk_size=DEFAULT_CHUNK_SIZE):
-        """
-        Yield a queryset in chunks of at most ``chunk_size``. The chunk yielded
-        will be a list, not a queryset. Iterating over the chunks is done in a
-        transaction so that the order and count of items in the queryset
-        remains stable.
-        """
-        i = 0
-        while True:
-            items = list(qs[i * chunk_size :][:chunk_size])
-            if not items:
-                break
-            yield items
-            i += 1
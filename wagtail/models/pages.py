@@ -6,6 +6,7 @@ import posixpath
 import uuid
 import warnings
 from typing import TYPE_CHECKING
+from urllib.parse import quote
 
 import swapper
 from django.conf import settings
@@ -31,6 +32,7 @@ from django.utils import timezone
 from django.utils import translation as translation
 from django.utils.encoding import force_bytes, force_str
 from django.utils.functional import Promise, cached_property, classproperty
+from django.utils.http import RFC3986_SUBDELIMS
 from django.utils.log import log_response
 from django.utils.text import capfirst, slugify
 from django.utils.translation import gettext
@@ -66,7 +68,7 @@ from wagtail.signals import (
     page_slug_changed,
     pre_validate_delete,
 )
-from wagtail.url_routing import RouteResult
+from wagtail.url_routing import RouteCache, RouteResult
 from wagtail.utils.deprecation import RemovedInWagtail90Warning
 from wagtail.utils.timestamps import ensure_utc
 
@@ -79,7 +81,7 @@ from .locking import LockableMixin
 from .panels import CommentPanelPlaceholder, PanelPlaceholder
 from .preview import PreviewableMixin
 from .revisions import Revision, RevisionMixin
-from .sites import Site
+from .sites import Site, SiteRootPathTrie
 from .specific import SpecificMixin
 from .view_restrictions import BaseViewRestriction
 from .workflows import WorkflowMixin
@@ -150,6 +152,15 @@ def get_streamfield_names(model_class):
     )
 
 
+def _overrides_route(page_class):
+    """
+    Return True if the given page class implements its own ``route()`` method,
+    in which case routing must be delegated to it rather than resolved by
+    ``url_path``.
+    """
+    return page_class is not None and page_class.route is not AbstractPage.route
+
+
 # Make sure that this list is sorted by the codename (first item in the tuple)
 # so that we can follow the same order when querying the Permission objects.
 # Note: codenames will be suffixed with the model name of the base page model
@@ -556,11 +567,14 @@ class AbstractPage(
                     path_components = [
                         component for component in path.split("/") if component
                     ]
-                    request._wagtail_route_for_request = (
-                        site.root_page.localized.specific.route(
-                            request, path_components
+                    root_page = site.root_page.localized
+                    if route_cache := RouteCache.get_for_settings():
+                        result = root_page._route_with_cache(
+                            route_cache, site, request, path_components
                         )
-                    )
+                    else:
+                        result = root_page._route_by_url_path(request, path_components)
+                    request._wagtail_route_for_request = result
                 else:
                     request._wagtail_route_for_request = None
             except Http404:
@@ -990,6 +1004,121 @@ class AbstractPage(
             else:
                 raise Http404
 
+    def _get_route_target(self, path_components):
+        """
+        Find the page responsible for handling ``path_components`` beneath this
+        page, resolving the whole chain of pages with a single query on
+        ``url_path`` rather than querying for each child page in turn.
+
+        Returns a ``(page, remaining_components)`` tuple, where ``page`` is
+        either the page matching the full path, or the first page along the
+        chain whose class overrides ``route()`` (such as ``RoutablePageMixin``),
+        which must be given the remaining path components. Raises ``Http404``
+        if no such page exists.
+        """
+        if _overrides_route(self.specific_class):
+            return self, path_components
+
+        url_paths = []
+        url_path = self.url_path
+        for component in path_components:
+            url_path += component + "/"
+            url_paths.append(url_path)
+
+        if url_paths:
+            descendants = self.base_page_model.objects.filter(
+                path__startswith=self.path,
+                depth__gt=self.depth,
+                depth__lte=self.depth + len(url_paths),
+                url_path__in=url_paths,
+            )
+            descendants_by_url_path = {page.url_path: page for page in descendants}
+        else:
+            descendants_by_url_path = {}
+
+        page = self
+        for depth, url_path in enumerate(url_paths, start=1):
+            subpage = descendants_by_url_path.get(url_path)
+            if (
+                subpage is None
+                or subpage.depth != page.depth + 1
+                or not subpage.path.startswith(page.path)
+            ):
+                raise Http404
+
+            # Cache the parent page on the subpage to avoid another db query
+            subpage._cached_parent_obj = page
+            page = subpage
+
+            if _overrides_route(page.specific_class):
+                return page, path_components[depth:]
+
+        return page, []
+
+    def _route_by_url_path(self, request, path_components):
+        """
+        Equivalent to ``self.specific.route(request, path_components)``, but
+        uses ``_get_route_target`` to find the page to route to.
+        """
+        page, remaining_components = self._get_route_target(path_components)
+        return page.specific._route_to_target(request, remaining_components)
+
+    def _route_to_target(self, request, remaining_components):
+        # Complete the routing of a request to a page found by ``_get_route_target``
+        if _overrides_route(self.specific_class):
+            return self.route(request, remaining_components)
+        elif self.live:
+            return RouteResult(self)
+        else:
+            raise Http404
+
+    def _route_with_cache(self, route_cache, site, request, path_components):
+        """
+        Equivalent to ``_route_by_url_path``, but looks up and stores the page
+        to route to in the given ``RouteCache``.
+        """
+        entry = route_cache.get(site.pk, self.pk, path_components)
+        if entry is not None:
+            page_id, content_type_id, url_path, remaining_components = entry
+            if page_id is None:
+                raise Http404
+
+            content_type = ContentType.objects.get_for_id(content_type_id)
+            model = content_type.model_class() or self.base_page_model
+            page = model.objects.filter(pk=page_id).first()
+            # Disregard the entry if the page has since been moved or unpublished
+            # without the cache being invalidated
+            if (
+                page is not None
+                and page.url_path == url_path
+                and (page.live or _overrides_route(page.specific_class))
+            ):
+                return page._route_to_target(request, list(remaining_components))
+
+        try:
+            page, remaining_components = self._get_route_target(path_components)
+            if not page.live and not _overrides_route(page.specific_class):
+                raise Http404
+        except Http404:
+            route_cache.set(
+                site.pk,
+                self.pk,
+                path_components,
+                url_path=self.url_path + "".join(f"{c}/" for c in path_components),
+            )
+            raise
+
+        route_cache.set(
+            site.pk,
+            self.pk,
+            path_components,
+            url_path=page.url_path,
+            page_id=page.pk,
+            content_type_id=page.content_type_id,
+            remaining_components=remaining_components,
+        )
+        return page.specific._route_to_target(request, remaining_components)
+
     def get_admin_display_title(self):
         """
         Return the title for this page as it should appear in the admin backend;
@@ -1557,6 +1686,123 @@ class AbstractPage(
         """
         return self.get_url(request=request, current_site=current_site)
 
+    @staticmethod
+    def get_urls_in_bulk(pages, request=None, current_site=None, full_url=False):
+        """
+        Return a dict mapping the id of each of the given pages to its URL, as
+        ``get_url`` (or ``get_full_url``, if ``full_url`` is true) would
+        return it. Use this when generating URLs for many pages at once, such
+        as in sitemaps, API listings and menus.
+
+        The site root paths are matched against each page using a prefix tree,
+        and the ``wagtail_serve`` URL prefix is only reversed once per
+        language, with each page's path being appended to it. Pages whose
+        class overrides ``get_url_parts`` are passed to ``get_url`` as normal.
+        """
+        if current_site is None and request is not None:
+            current_site = Site.find_for_request(request)
+
+        if request is not None:
+            try:
+                site_root_paths = request._wagtail_cached_site_root_paths
+            except AttributeError:
+                site_root_paths = Site.get_site_root_paths()
+                request._wagtail_cached_site_root_paths = site_root_paths
+        else:
+            site_root_paths = Site.get_site_root_paths()
+
+        trie = SiteRootPathTrie(site_root_paths)
+        request_site = (
+            Site.find_for_request(request) if isinstance(request, HttpRequest) else None
+        )
+        num_sites = len({root_path.site_id for root_path in site_root_paths})
+        use_wagtail_i18n = getattr(settings, "WAGTAIL_I18N_ENABLED", False)
+
+        # The active language is the same for every page, so the language to
+        # generate each URL in only has to be worked out once per language
+        if use_wagtail_i18n:
+            try:
+                active_language_code = translation.get_language()
+                active_content_language_code = get_supported_content_language_variant(
+                    active_language_code
+                )
+            except LookupError:
+                active_content_language_code = None
+
+        serve_prefixes = {}
+
+        def get_serve_prefix(language_code):
+            if use_wagtail_i18n and language_code == active_content_language_code:
+                language_code = active_language_code
+
+            try:
+                return serve_prefixes[language_code]
+            except KeyError:
+                pass
+
+            # The page may not be routable because wagtail_serve is not registered
+            # This may be the case if Wagtail is used headless
+            try:
+                if use_wagtail_i18n:
+                    with translation.override(language_code):
+                        prefix = reverse("wagtail_serve", args=("",))
+                else:
+                    prefix = reverse("wagtail_serve", args=("",))
+            except NoReverseMatch:
+                prefix = None
+
+            serve_prefixes[language_code] = prefix
+            return prefix
+
+        urls = {}
+        for page in pages:
+            if type(page).get_url_parts is not Page.get_url_parts:
+                if full_url:
+                    urls[page.pk] = page.get_full_url(request=request)
+                else:
+                    urls[page.pk] = page.get_url(
+                        request=request, current_site=current_site
+                    )
+                continue
+
+            possible_sites = trie.get_relevant_site_root_paths(page.url_path)
+            if not possible_sites:
+                urls[page.pk] = None
+                continue
+
+            site_id, root_path, root_url, language_code = possible_sites[0]
+
+            unique_site_ids = {values[0] for values in possible_sites}
+            if len(unique_site_ids) > 1 and request_site:
+                # The page belongs to more than one site, so prefer the one
+                # matching the request (where present)
+                for values in possible_sites:
+                    if values[0] == request_site.pk:
+                        site_id, root_path, root_url, language_code = values
+                        break
+
+            prefix = get_serve_prefix(language_code)
+            if prefix is None:
+                urls[page.pk] = None
+                continue
+
+            # Quote the path in the same way as reverse() would
+            page_path = prefix + quote(
+                page.url_path[len(root_path) :], safe=RFC3986_SUBDELIMS + "/~:@"
+            )
+            if not WAGTAIL_APPEND_SLASH and page_path != "/":
+                page_path = page_path.rstrip("/")
+
+            if full_url or not (
+                (current_site is not None and site_id == current_site.id)
+                or num_sites == 1
+            ):
+                urls[page.pk] = root_url + page_path
+            else:
+                urls[page.pk] = page_path
+
+        return urls
+
     def get_site(self):
         """
         Return the Site object that this page belongs to.
@@ -1991,21 +2237,31 @@ class AbstractPage(
         before querying PageViewRestrictions so alias pages use the same view restrictions
         as their source page and they cannot have their own.
         """
+        Page = swapper.load_model("wagtailcore", "Page")
         page_ids_to_check = set()
 
-        def add_page_to_check_list(page):
-            # If the page is an alias, add the source page to the check list instead
-            if page.alias_of:
-                add_page_to_check_list(page.alias_of)
-            else:
-                page_ids_to_check.add(page.id)
+        # Check the current page and each ancestor for view restrictions
+        pages = [(self.id, self.alias_of_id)]
+        pages.extend(self.get_ancestors().values_list("id", "alias_of_id"))
 
-        # Check current page for view restrictions
-        add_page_to_check_list(self)
+        while pages:
+            alias_of_ids = set()
+            for page_id, alias_of_id in pages:
+                # If the page is an alias, check the source page instead
+                if alias_of_id:
+                    alias_of_ids.add(alias_of_id)
+                else:
+                    page_ids_to_check.add(page_id)
 
-        # Check each ancestor for view restrictions as well
-        for page in self.get_ancestors().only("alias_of"):
-            add_page_to_check_list(page)
+            # Source pages may themselves be aliases, so fetch them in one query
+            # per level of aliasing
+            pages = (
+                Page.objects.filter(id__in=alias_of_ids).values_list(
+                    "id", "alias_of_id"
+                )
+                if alias_of_ids
+                else []
+            )
 
         return PageViewRestriction.objects.filter(page_id__in=page_ids_to_check)
 
@@ -1,4 +1,5 @@
 import uuid
+from collections import defaultdict
 from itertools import groupby
 
 from django.contrib.contenttypes.fields import GenericForeignKey, GenericRel
@@ -463,89 +464,126 @@ class ReferenceIndex(models.Model):
         Args:
             object (Model): The model instance to create/update ReferenceIndex records for
         """
+        cls.create_or_update_for_objects([object])
+
+    @classmethod
+    def create_or_update_for_objects(cls, objects):
+        """
+        Creates or updates ReferenceIndex records for the given objects.
+
+        This is equivalent to calling `create_or_update_for_object` for each object,
+        but existing references are fetched with a single query per model, and all
+        additions and deletions are written with a single query each.
+
+        Note: This method must be called within a `django.db.transaction.atomic()` block.
+
+        Args:
+            objects: An iterable of model instances to create/update ReferenceIndex
+            records for, which may be of different models
+        """
         # For the purpose of this method, a "reference record" is a tuple of
         # (to_content_type_id, to_object_id, model_path, content_path) - the properties that
         # uniquely define a reference
 
-        # Extract new references and construct a set of reference records
-        references = set(cls._extract_references_from_object(object))
+        objects_by_model = defaultdict(list)
+        for object in objects:
+            objects_by_model[type(object)].append(object)
 
-        # Find content types for this model and all of its ancestor classes,
-        # ordered from most to least specific
-        content_types = [
-            ContentType.objects.get_for_model(model_or_object, for_concrete_model=False)
-            for model_or_object in ([object] + object._meta.get_parent_list())
-        ]
-        content_type = content_types[0]
-        base_content_type = content_types[-1]
-        known_content_type_ids = [ct.id for ct in content_types]
-
-        # Find existing references in the database so we know what to add/delete.
-        # Construct a dict mapping reference records to the (content_type_id, id) pair that the
-        # existing database entry is found under
-        existing_references = {
-            (to_content_type_id, to_object_id, model_path, content_path): (
-                content_type_id,
+        new_records = []
+        deleted_reference_ids = []
+
+        for model, model_objects in objects_by_model.items():
+            # Find content types for this model and all of its ancestor classes,
+            # ordered from most to least specific
+            content_types = [
+                ContentType.objects.get_for_model(model, for_concrete_model=False)
+                for model in ([model] + model._meta.get_parent_list())
+            ]
+            content_type = content_types[0]
+            base_content_type = content_types[-1]
+            known_content_type_ids = [ct.id for ct in content_types]
+
+            # Find existing references in the database so we know what to add/delete.
+            # Construct a dict for each object mapping reference records to the
+            # (content_type_id, id) pair that the existing database entry is found under
+            existing_references_by_object_id = defaultdict(dict)
+            for (
                 id,
-            )
-            for id, content_type_id, to_content_type_id, to_object_id, model_path, content_path in cls.objects.filter(
-                base_content_type=base_content_type, object_id=object.pk
+                object_id,
+                content_type_id,
+                to_content_type_id,
+                to_object_id,
+                model_path,
+                content_path,
+            ) in cls.objects.filter(
+                base_content_type=base_content_type,
+                object_id__in=[str(object.pk) for object in model_objects],
             ).values_list(
                 "id",
+                "object_id",
                 "content_type_id",
                 "to_content_type",
                 "to_object_id",
                 "model_path",
                 "content_path",
-            )
-        }
+            ):
+                existing_references_by_object_id[object_id][
+                    (to_content_type_id, to_object_id, model_path, content_path)
+                ] = (content_type_id, id)
+
+            for object in model_objects:
+                # Extract new references and construct a set of reference records
+                references = set(cls._extract_references_from_object(object))
+                existing_references = existing_references_by_object_id[str(object.pk)]
+
+                # Construct database records for the reference records that have been found
+                # on the object but are not already present in the database
+                new_records.extend(
+                    cls(
+                        content_type=content_type,
+                        base_content_type=base_content_type,
+                        object_id=object.pk,
+                        to_content_type_id=to_content_type_id,
+                        to_object_id=to_object_id,
+                        model_path=model_path,
+                        content_path=content_path,
+                        content_path_hash=cls._get_content_path_hash(content_path),
+                    )
+                    for to_content_type_id, to_object_id, model_path, content_path in (
+                        references - set(existing_references.keys())
+                    )
+                )
 
-        # Construct the set of reference records that have been found on the object but are not
-        # already present in the database
-        new_references = references - set(existing_references.keys())
+                # Look at the reference record and the supporting content_type / id for each
+                # existing reference in the database
+                for reference_data, (
+                    content_type_id,
+                    id,
+                ) in existing_references.items():
+                    if reference_data in references:
+                        # Do not delete this reference, as it is still present in the new set
+                        continue
+
+                    if content_type_id not in known_content_type_ids:
+                        # The content type for the existing record does not match the current
+                        # model or any superclass. We can infer that the existing record is for
+                        # a more specific subclass than the one we're currently indexing - e.g.
+                        # we are indexing <Page id=123> while the existing reference was
+                        # recorded against <BlogPage id=123>. In this case, do not treat the
+                        # missing reference as a deletion - it likely still exists, but on a
+                        # relation which can only be seen on the more specific model.
+                        continue
+
+                    # If we reach here, this is a legitimate deletion - add it to the list of
+                    # IDs to delete
+                    deleted_reference_ids.append(id)
 
         bulk_create_kwargs = {}
         if connection.features.supports_ignore_conflicts:
             bulk_create_kwargs["ignore_conflicts"] = True
 
-        # Create database records for those reference records
-        cls.objects.bulk_create(
-            [
-                cls(
-                    content_type=content_type,
-                    base_content_type=base_content_type,
-                    object_id=object.pk,
-                    to_content_type_id=to_content_type_id,
-                    to_object_id=to_object_id,
-                    model_path=model_path,
-                    content_path=content_path,
-                    content_path_hash=cls._get_content_path_hash(content_path),
-                )
-                for to_content_type_id, to_object_id, model_path, content_path in new_references
-            ],
-            **bulk_create_kwargs,
-        )
-
-        # Delete removed references
-        deleted_reference_ids = []
-        # Look at the reference record and the supporting content_type / id for each existing
-        # reference in the database
-        for reference_data, (content_type_id, id) in existing_references.items():
-            if reference_data in references:
-                # Do not delete this reference, as it is still present in the new set
-                continue
-
-            if content_type_id not in known_content_type_ids:
-                # The content type for the existing record does not match the current model or any
-                # superclass. We can infer that the existing record is for a more specific subclass
-                # than the one we're currently indexing - e.g. we are indexing <Page id=123> while
-                # the existing reference was recorded against <BlogPage id=123>. In this case, do
-                # not treat the missing reference as a deletion - it likely still exists, but on a
-                # relation which can only be seen on the more specific model.
-                continue
-
-            # If we reach here, this is a legitimate deletion - add it to the list of IDs to delete
-            deleted_reference_ids.append(id)
+        # Create database records for the new reference records
+        cls.objects.bulk_create(new_records, **bulk_create_kwargs)
 
         # Perform the deletion
         cls.objects.filter(id__in=deleted_reference_ids).delete()
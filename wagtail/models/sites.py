@@ -1,4 +1,5 @@
-from collections import namedtuple
+import uuid
+from collections import defaultdict, namedtuple
 
 import swapper
 from django.apps import apps
@@ -65,6 +66,105 @@ def get_site_for_hostname(hostname, port):
     raise Site.DoesNotExist()
 
 
+SITE_RESOLUTION_GENERATION_CACHE_KEY = "wagtail_site_resolution_generation"
+
+
+class SiteResolutionTable:
+    """
+    An in-memory lookup table of all Site records, keyed by hostname, which
+    resolves a (hostname, port) pair with the same precedence rules as
+    ``get_site_for_hostname`` but without touching the database.
+    """
+
+    def __init__(self, sites):
+        self.sites_by_hostname = defaultdict(list)
+        self.default_site = None
+
+        for site in sites:
+            if site.is_default_site:
+                self.default_site = site
+            self.sites_by_hostname[site.hostname].append(site)
+
+    def get_site_for_hostname(self, hostname, port):
+        Site = apps.get_model("wagtailcore.Site")
+
+        try:
+            port = int(port)
+        except (TypeError, ValueError):
+            port = None
+
+        hostname_matches = self.sites_by_hostname.get(hostname, [])
+
+        # exact hostname+port match first
+        for site in hostname_matches:
+            if site.port == port:
+                return site
+
+        default_site = self.default_site
+
+        # then hostname+default
+        if default_site is not None and default_site.hostname == hostname:
+            return default_site
+
+        # if there is a unique hostname match, use it regardless of the port
+        if len(hostname_matches) == 1:
+            return hostname_matches[0]
+
+        # otherwise, fall back to the default site (if any)
+        if default_site is not None:
+            return default_site
+
+        raise Site.DoesNotExist()
+
+
+# The resolution table held by this process, along with the generation token
+# it was built for. Replaced as a whole (never mutated) to remain thread-safe.
+_site_resolution_table = (None, None)
+
+
+def get_site_resolution_generation():
+    """
+    Return the shared cache token identifying the current version of the
+    Site records. A new token is generated whenever sites are changed,
+    so that other processes know to rebuild their resolution tables.
+    """
+    generation = cache.get(SITE_RESOLUTION_GENERATION_CACHE_KEY)
+    if generation is None:
+        generation = uuid.uuid4().hex
+        if not cache.add(SITE_RESOLUTION_GENERATION_CACHE_KEY, generation, None):
+            generation = cache.get(SITE_RESOLUTION_GENERATION_CACHE_KEY, generation)
+    return generation
+
+
+def get_site_resolution_table():
+    """
+    Return the ``SiteResolutionTable`` for this process, building it from
+    the database if the shared generation token has changed since it was
+    last built.
+    """
+    global _site_resolution_table
+
+    generation = get_site_resolution_generation()
+    table_generation, table = _site_resolution_table
+    if table is None or table_generation != generation:
+        Site = apps.get_model("wagtailcore.Site")
+        table = SiteResolutionTable(Site.objects.select_related("root_page"))
+        _site_resolution_table = (generation, table)
+    return table
+
+
+def clear_site_resolution_table():
+    """
+    Discard the resolution table for this process and rotate the shared
+    generation token so that all other processes discard theirs too.
+    """
+    global _site_resolution_table
+
+    _site_resolution_table = (None, None)
+    if getattr(settings, "WAGTAIL_SITE_RESOLUTION_CACHE", False):
+        cache.set(SITE_RESOLUTION_GENERATION_CACHE_KEY, uuid.uuid4().hex, None)
+
+
 class SiteManager(models.Manager):
     def get_queryset(self):
         return (
@@ -85,6 +185,47 @@ class SiteManager(models.Manager):
 
 SiteRootPath = namedtuple("SiteRootPath", "site_id root_path root_url language_code")
 
+
+class SiteRootPathTrie:
+    """
+    A prefix tree over the path segments of a list of ``SiteRootPath``
+    instances, used to find the root paths that a page's ``url_path`` falls
+    under without testing every root path in turn.
+    """
+
+    def __init__(self, site_root_paths):
+        self.site_root_paths = list(site_root_paths)
+        # Each node is a tuple of (children keyed by path segment, indexes of
+        # the root paths ending at this node)
+        self.root = ({}, [])
+
+        for index, site_root_path in enumerate(self.site_root_paths):
+            node = self.root
+            for segment in self._get_segments(site_root_path.root_path):
+                node = node[0].setdefault(segment, ({}, []))
+            node[1].append(index)
+
+    @staticmethod
+    def _get_segments(path):
+        # Root paths and url_paths always begin and end with a slash
+        return path.strip("/").split("/") if path != "/" else []
+
+    def get_relevant_site_root_paths(self, url_path):
+        """
+        Return a tuple of the root paths that ``url_path`` starts with, in the
+        same order as they were given (most specific path first).
+        """
+        node = self.root
+        indexes = list(node[1])
+        for segment in self._get_segments(url_path):
+            node = node[0].get(segment)
+            if node is None:
+                break
+            indexes.extend(node[1])
+
+        return tuple(self.site_root_paths[index] for index in sorted(indexes))
+
+
 SITE_ROOT_PATHS_CACHE_KEY = "wagtail_site_root_paths"
 # Increase the cache version whenever the structure SiteRootPath tuple changes
 SITE_ROOT_PATHS_CACHE_VERSION = 2
@@ -179,7 +320,10 @@ class Site(models.Model):
         port = request.get_port()
         site = None
         try:
-            site = get_site_for_hostname(hostname, port)
+            if getattr(settings, "WAGTAIL_SITE_RESOLUTION_CACHE", False):
+                site = get_site_resolution_table().get_site_for_hostname(hostname, port)
+            else:
+                site = get_site_for_hostname(hostname, port)
         except Site.DoesNotExist:
             pass
             # copy old SiteMiddleware behaviour
@@ -282,6 +426,7 @@ class Site(models.Model):
     @staticmethod
     def clear_site_root_paths_cache():
         cache.delete(SITE_ROOT_PATHS_CACHE_KEY, version=SITE_ROOT_PATHS_CACHE_VERSION)
+        clear_site_resolution_table()
 
 
 class GroupSitePermissionManager(models.Manager):
@@ -46,6 +46,47 @@ class TreeQuerySet(MP_NodeQuerySet):
         """
         return self.exclude(self.descendant_of_q(other, inclusive))
 
+    def descendant_of_paths_q(self, paths):
+        """
+        Return a Q matching the pages with any of the given tree paths and
+        their descendants. If there are no paths, the Q matches no pages.
+
+        Paths within another of the paths are skipped, and consecutive
+        siblings are matched by a single range of paths, so that the
+        conditions stay few for many paths while only using lookups that
+        search backends support.
+        """
+        model = self.model
+
+        def get_next_sibling_path(path):
+            step = model._str2int(path[-model.steplen :]) + 1
+            if step >= len(model.alphabet) ** model.steplen:
+                return None
+            return model._get_path(path, len(path) // model.steplen, step)
+
+        # Each range is the first path in it, the last path in it, and the
+        # path of the last path's next sibling. As the paths are sorted, the
+        # descendants of a path are found before its next sibling.
+        ranges = []
+        for path in sorted(paths):
+            if ranges and path.startswith(ranges[-1][1]):
+                continue
+
+            next_path = get_next_sibling_path(path)
+            if ranges and path == ranges[-1][2] and next_path:
+                ranges[-1][1:] = [path, next_path]
+            else:
+                ranges.append([path, path, next_path])
+
+        q = Q()
+        for first_path, last_path, next_path in ranges:
+            if first_path == last_path:
+                q |= Q(path__startswith=first_path)
+            else:
+                q |= Q(path__gte=first_path, path__lt=next_path)
+
+        return q if q else Q(pk__in=[])
+
     def child_of_q(self, other):
         return self.descendant_of_q(other) & Q(depth=other.depth + 1)
 
@@ -143,6 +184,7 @@ class SpecificQuerySetMixin:
         self._defer_streamfields = False
         self._specific_select_related_fields = ()
         self._specific_prefetch_related_lookups = ()
+        self._specific_subquery_transforms = ()
 
     def _clone(self):
         """Ensure clones inherit custom attribute values."""
@@ -152,6 +194,7 @@ class SpecificQuerySetMixin:
         clone._specific_prefetch_related_lookups = (
             self._specific_prefetch_related_lookups
         )
+        clone._specific_subquery_transforms = self._specific_subquery_transforms
         return clone
 
     def specific(self, defer=False):
@@ -310,8 +353,41 @@ class SpecificQuerySetMixin:
             )
         return clone
 
+    def transform_specific_subqueries(self, function):
+        """
+        Adapts the subqueries made when a specific queryset is evaluated, one for
+        each specific model in the result. ``function`` is called with the queryset
+        for each model, and must return the queryset to use in its place.
+
+        Unlike ``select_related()`` and ``prefetch_related()`` with
+        ``for_specific_subqueries=True``, this allows each subquery to be adapted to
+        its model, for example to only fetch fields that some models have.
+        """
+        clone = self._chain()
+        clone._specific_subquery_transforms = self._specific_subquery_transforms + (
+            function,
+        )
+        return clone
+
 
 class PageQuerySet(SearchableQuerySetMixin, SpecificQuerySetMixin, TreeQuerySet):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # set by PageQuerySet.prefetch_streamfield_references()
+        self._prefetch_streamfield_names = ()
+        self._streamfield_prefetch_done = False
+
+    def _clone(self):
+        clone = super()._clone()
+        clone._prefetch_streamfield_names = self._prefetch_streamfield_names
+        return clone
+
+    def _fetch_all(self):
+        super()._fetch_all()
+        if self._prefetch_streamfield_names and not self._streamfield_prefetch_done:
+            self._prefetch_streamfield_references()
+            self._streamfield_prefetch_done = True
+
     def live_q(self):
         return Q(live=True)
 
@@ -398,12 +474,9 @@ class PageQuerySet(SearchableQuerySetMixin, SpecificQuerySetMixin, TreeQuerySet)
     def private_q(self):
         from wagtail.models import PageViewRestriction
 
-        q = Q()
-        for restriction in PageViewRestriction.objects.select_related("page").all():
-            q |= self.descendant_of_q(restriction.page, inclusive=True)
-
-        # do not match any page if no private section exists.
-        return q if q else Q(pk__in=[])
+        return self.descendant_of_paths_q(
+            PageViewRestriction.objects.values_list("page__path", flat=True).distinct()
+        )
 
     def public(self):
         """
@@ -553,6 +626,41 @@ class PageQuerySet(SearchableQuerySetMixin, SpecificQuerySetMixin, TreeQuerySet)
             return clone
         return clone.defer(*streamfield_names)
 
+    def prefetch_streamfield_references(self, *field_names):
+        """
+        Performance optimisation for listing pages.
+        When the queryset is evaluated, converts the values of the named StreamFields
+        across all results at once, so that the objects referenced by chooser blocks
+        (pages, images, documents, snippets and so on) are fetched with one query per
+        block type for the whole queryset, rather than one query per result.
+
+        Field names that do not exist on a result's model are ignored, so this can be
+        combined with ``specific()`` for listings containing several page types.
+        Passing ``None`` clears any previously given field names.
+        """
+        clone = self._chain()
+        if field_names == (None,):
+            clone._prefetch_streamfield_names = ()
+        else:
+            clone._prefetch_streamfield_names = (
+                self._prefetch_streamfield_names + field_names
+            )
+        return clone
+
+    def _prefetch_streamfield_references(self):
+        from wagtail.blocks import StreamValue
+
+        stream_values = []
+        for obj in self._result_cache:
+            # Skip results that are not model instances (e.g. from values()), and
+            # fields that are deferred, which would otherwise be fetched one by one
+            obj_dict = getattr(obj, "__dict__", {})
+            for field_name in self._prefetch_streamfield_names:
+                if isinstance(obj_dict.get(field_name), StreamValue):
+                    stream_values.append(obj_dict[field_name])
+
+        StreamValue.bulk_prefetch_blocks(stream_values)
+
     def in_site(self, site):
         """
         This filters the QuerySet to only contain pages within the specified site.
@@ -703,6 +811,9 @@ class SpecificIterable(ModelIterable):
                 if qs._defer_streamfields and hasattr(items, "defer_streamfields"):
                     items = items.defer_streamfields()
 
+                for transform in qs._specific_subquery_transforms:
+                    items = transform(items)
+
                 items_for_type = {item.pk: item for item in items}
                 items_by_type[content_type] = items_for_type
                 missing_pks.extend(pk for pk in pks if pk not in items_for_type)
@@ -1,11 +1,14 @@
 import logging
 from contextlib import contextmanager
+from functools import partial
 
 import swapper
 from asgiref.local import Local
+from django.conf import settings
 from django.core.cache import cache
 from django.db import transaction
 from django.db.models.signals import (
+    m2m_changed,
     post_delete,
     post_migrate,
     post_save,
@@ -13,9 +16,16 @@ from django.db.models.signals import (
     pre_migrate,
 )
 
-from wagtail.models import Locale, ReferenceIndex, Site
+from wagtail.coreutils import on_commit_once
+from wagtail.models import Locale, PageViewRestriction, ReferenceIndex, Site
+from wagtail.signals import page_published, page_unpublished, post_page_move
+from wagtail.url_routing import RouteCache
+from wagtail.view_restriction_table import (
+    get_view_restriction_table,
+    invalidate_view_restriction_table,
+)
 
-from .tasks import update_reference_index_task
+from .tasks import update_reference_index_batch_task, update_reference_index_task
 
 Page = swapper.load_model("wagtailcore", "Page")
 logger = logging.getLogger("wagtail")
@@ -24,10 +34,35 @@ logger = logging.getLogger("wagtail")
 # Clear the wagtail_site_root_paths from the cache whenever Site records are updated.
 def post_save_site_signal_handler(instance, update_fields=None, **kwargs):
     Site.clear_site_root_paths_cache()
+    clear_route_cache()
 
 
 def post_delete_site_signal_handler(instance, **kwargs):
     Site.clear_site_root_paths_cache()
+    clear_route_cache()
+
+
+def clear_route_cache():
+    if route_cache := RouteCache.get_for_settings():
+        transaction.on_commit(route_cache.clear)
+
+
+def invalidate_route_cache(*url_paths):
+    if route_cache := RouteCache.get_for_settings():
+        for url_path in url_paths:
+            transaction.on_commit(partial(route_cache.invalidate, url_path))
+
+
+# Invalidate cached routes to a page and its descendants whenever it is
+# published, unpublished, moved or deleted.
+def invalidate_route_cache_on_page_change(instance, **kwargs):
+    invalidate_route_cache(instance.url_path)
+
+
+def invalidate_route_cache_on_page_move(
+    instance, url_path_before, url_path_after, **kwargs
+):
+    invalidate_route_cache(url_path_before, url_path_after)
 
 
 def pre_delete_page_unpublish(sender, instance, **kwargs):
@@ -47,6 +82,13 @@ def reset_locales_display_names_cache(sender, instance, **kwargs):
 
 reference_index_auto_update_disabled = Local()
 
+# Objects saved in the current transaction that are waiting to be added to the
+# reference index, as a set of (app_label, model_name, pk) tuples
+reference_index_pending_updates = Local()
+
+# The maximum number of objects to pass to a single update_reference_index_batch_task
+REFERENCE_INDEX_BATCH_SIZE = 1000
+
 
 @contextmanager
 def disable_reference_index_auto_update():
@@ -73,11 +115,44 @@ def update_reference_index_on_save(instance, **kwargs):
     if getattr(reference_index_auto_update_disabled, "value", False):
         return
 
+    # Coalesce updates made within a transaction into batches, enqueued on commit
+    if (
+        getattr(settings, "WAGTAIL_REFERENCE_INDEX_BATCH_UPDATES", False)
+        and transaction.get_connection().in_atomic_block
+    ):
+        get_pending_reference_index_updates().add(
+            (instance._meta.app_label, instance._meta.model_name, str(instance.pk))
+        )
+        return
+
     update_reference_index_task.enqueue(
         instance._meta.app_label, instance._meta.model_name, str(instance.pk)
     )
 
 
+def get_pending_reference_index_updates():
+    """
+    Return the set of objects to be added to the reference index when the
+    current transaction is committed, starting a new one if there is no
+    pending flush (for example, if a previous transaction was rolled back).
+    """
+    pending_objects = set()
+    if on_commit_once(
+        "wagtail-reference-index-updates",
+        partial(flush_reference_index_updates, pending_objects),
+    ):
+        reference_index_pending_updates.value = pending_objects
+    return reference_index_pending_updates.value
+
+
+def flush_reference_index_updates(pending_objects):
+    objects = sorted(pending_objects)
+    for i in range(0, len(objects), REFERENCE_INDEX_BATCH_SIZE):
+        update_reference_index_batch_task.enqueue(
+            [list(obj) for obj in objects[i : i + REFERENCE_INDEX_BATCH_SIZE]]
+        )
+
+
 def remove_reference_index_on_delete(instance, **kwargs):
     if getattr(reference_index_auto_update_disabled, "value", False):
         return
@@ -107,13 +182,63 @@ def disconnect_reference_index_signal_handlers(**kwargs):
         disconnect_reference_index_signal_handlers_for_model(model)
 
 
+def view_restriction_cache_enabled():
+    return getattr(settings, "WAGTAIL_VIEW_RESTRICTION_CACHE", False)
+
+
+# Reload the in-memory page view restrictions whenever a restriction is
+# changed, or a page is moved or deleted (which changes the paths that the
+# restrictions apply to)
+def invalidate_view_restriction_table_on_change(**kwargs):
+    if view_restriction_cache_enabled():
+        invalidate_view_restriction_table()
+
+
+def invalidate_view_restriction_table_on_alias_change(
+    instance, created=False, raw=False, **kwargs
+):
+    # Aliases of restricted pages use the restrictions of their source page,
+    # so the restrictions need reloading when one is created, converted to a
+    # regular page or changed to be an alias of another page
+    if raw or not view_restriction_cache_enabled() or not isinstance(instance, Page):
+        return
+
+    if created and not instance.alias_of_id:
+        return
+
+    table = get_view_restriction_table()
+    alias_of_id = (
+        instance.alias_of_id if instance.alias_of_id in table.page_ids else None
+    )
+    if table.alias_of_ids_by_path.get(instance.path) != alias_of_id:
+        invalidate_view_restriction_table()
+
+
 def register_signal_handlers():
     post_save.connect(post_save_site_signal_handler, sender=Site)
     post_delete.connect(post_delete_site_signal_handler, sender=Site)
 
     pre_delete.connect(pre_delete_page_unpublish, sender=Page)
+    pre_delete.connect(invalidate_route_cache_on_page_change, sender=Page)
+    page_published.connect(invalidate_route_cache_on_page_change)
+    page_unpublished.connect(invalidate_route_cache_on_page_change)
+    post_page_move.connect(invalidate_route_cache_on_page_move)
     post_delete.connect(post_delete_page_log_deletion, sender=Page)
 
+    post_save.connect(
+        invalidate_view_restriction_table_on_change, sender=PageViewRestriction
+    )
+    post_delete.connect(
+        invalidate_view_restriction_table_on_change, sender=PageViewRestriction
+    )
+    m2m_changed.connect(
+        invalidate_view_restriction_table_on_change,
+        sender=PageViewRestriction.groups.through,
+    )
+    post_delete.connect(invalidate_view_restriction_table_on_change, sender=Page)
+    post_page_move.connect(invalidate_view_restriction_table_on_change)
+    post_save.connect(invalidate_view_restriction_table_on_alias_change)
+
     post_save.connect(reset_locales_display_names_cache, sender=Locale)
     post_delete.connect(reset_locales_display_names_cache, sender=Locale)
 
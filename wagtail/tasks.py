@@ -1,10 +1,21 @@
+from collections import defaultdict
+
 from django.apps import apps
 from django.db import transaction
+from django.db.models import DateTimeField, Value
+from django.db.models.functions import Coalesce, Greatest
+from django.utils.dateparse import parse_datetime
 from django.utils.module_loading import import_string
 from django_tasks import task
 from modelcluster.fields import ParentalKey
 
-from wagtail.models import ReferenceIndex
+from wagtail.models import APIToken, ReferenceIndex
+
+
+def _get_parental_key(model):
+    for field in model._meta.get_fields():
+        if isinstance(field, ParentalKey):
+            return field
 
 
 @task()
@@ -14,16 +25,11 @@ def update_reference_index_task(app_label, model_name, pk):
 
     # If the model is a child model, find the parent instance and index that instead
     while True:
-        parental_keys = list(
-            filter(
-                lambda field: isinstance(field, ParentalKey),
-                instance._meta.get_fields(),
-            )
-        )
-        if not parental_keys:
+        parental_key = _get_parental_key(instance._meta.model)
+        if parental_key is None:
             break
 
-        instance = getattr(instance, parental_keys[0].name)
+        instance = getattr(instance, parental_key.name)
         if instance is None:
             # parent is null, so there is no valid object to record references against
             return
@@ -33,9 +39,72 @@ def update_reference_index_task(app_label, model_name, pk):
             ReferenceIndex.create_or_update_for_object(instance)
 
 
+@task()
+def update_reference_index_batch_task(objects):
+    """
+    Update the reference index for a batch of objects, given as a list of
+    ``[app_label, model_name, pk]`` items.
+
+    Objects are fetched with one query per model, and child objects are
+    resolved to their parents one level at a time. All of the resulting
+    objects are then indexed together with
+    ``ReferenceIndex.create_or_update_for_objects``.
+    """
+    pks_by_model = defaultdict(set)
+    for app_label, model_name, pk in objects:
+        pks_by_model[apps.get_model(app_label, model_name)].add(pk)
+
+    instances = []
+    while pks_by_model:
+        parent_pks_by_model = defaultdict(set)
+        for model, pks in pks_by_model.items():
+            parental_key = _get_parental_key(model)
+            for instance in model.objects.filter(pk__in=pks):
+                if parental_key is None:
+                    instances.append(instance)
+                    continue
+
+                # Index the parent instead of the child object, unless the parent
+                # is null, in which case there is no valid object to record
+                # references against
+                parent_pk = getattr(instance, parental_key.attname)
+                if parent_pk is not None:
+                    parent_pks_by_model[parental_key.related_model].add(parent_pk)
+
+        pks_by_model = parent_pks_by_model
+
+    instances = [
+        instance
+        for instance in instances
+        if ReferenceIndex.is_indexed(instance._meta.model)
+    ]
+    if instances:
+        with transaction.atomic():
+            ReferenceIndex.create_or_update_for_objects(instances)
+
+
 @task()
 def delete_file_from_storage_task(deconstructed_storage, path):
     storage_module, storage_args, storage_kwargs = deconstructed_storage
     storage = import_string(storage_module)(*storage_args, **storage_kwargs)
 
     storage.delete(path)
+
+
+@task()
+def update_api_token_last_used_task(last_used):
+    """
+    Update the ``last_used_at`` time of a batch of API tokens, given as a list
+    of ``[token_id, ISO 8601 timestamp]`` items, in a single query.
+    """
+    api_tokens = []
+    for pk, used_at in last_used:
+        used_at = Value(parse_datetime(used_at), output_field=DateTimeField())
+        # Other processes may have written a later use of the token already
+        api_tokens.append(
+            APIToken(
+                pk=pk,
+                last_used_at=Greatest(Coalesce("last_used_at", used_at), used_at),
+            )
+        )
+    APIToken.objects.bulk_update(api_tokens, ["last_used_at"])
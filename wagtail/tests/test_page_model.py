@@ -1,7 +1,7 @@
 import datetime
 import json
 import unittest
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 import swapper
 from asgiref.sync import async_to_sync
@@ -530,6 +530,47 @@ class TestRouting(PageFixturesMixin, TestCase):
         self.assertIsNone(homepage.full_url)
         self.assertIsNone(homepage.url)
 
+    def test_get_urls_in_bulk(self):
+        pages = Page.objects.specific()
+
+        self.assertEqual(
+            Page.get_urls_in_bulk(pages), {page.pk: page.get_url() for page in pages}
+        )
+        self.assertEqual(
+            Page.get_urls_in_bulk(pages, full_url=True),
+            {page.pk: page.get_full_url() for page in pages},
+        )
+
+    @override_settings(ALLOWED_HOSTS=["localhost", "events.example.com"])
+    def test_get_urls_in_bulk_with_multiple_sites(self):
+        events_site = Site.objects.create(
+            hostname="events.example.com",
+            root_page=Page.objects.get(url_path="/home/events/"),
+        )
+        pages = Page.objects.specific()
+
+        for request in (None, get_dummy_request(site=events_site)):
+            with self.subTest(request=request):
+                self.assertEqual(
+                    Page.get_urls_in_bulk(pages, request=request),
+                    {page.pk: page.get_url(request=request) for page in pages},
+                )
+
+    def test_get_urls_in_bulk_reverses_once(self):
+        pages = list(Page.objects.all())
+
+        with patch("wagtail.models.pages.reverse", wraps=reverse) as mock_reverse:
+            urls = Page.get_urls_in_bulk(pages)
+
+        self.assertGreater(len(urls), 1)
+        mock_reverse.assert_called_once()
+
+    @override_settings(ROOT_URLCONF="wagtail.test.headless_urls")
+    def test_get_urls_in_bulk_headless(self):
+        homepage = Page.objects.get(url_path="/home/")
+
+        self.assertEqual(Page.get_urls_in_bulk([homepage]), {homepage.pk: None})
+
     def test_request_routing(self):
         homepage = Page.objects.get(url_path="/home/")
         christmas_page = EventPage.objects.get(url_path="/home/events/christmas/")
@@ -564,6 +605,56 @@ class TestRouting(PageFixturesMixin, TestCase):
         with self.assertRaises(Http404):
             homepage.route(request, ["events", "tentative-unpublished-event"])
 
+    def test_route_by_url_path(self):
+        homepage = Page.objects.get(url_path="/home/")
+        steal_underpants = EventPage.objects.get(
+            url_path="/home/secret-plans/steal-underpants/"
+        )
+
+        request = get_dummy_request(path="/secret-plans/steal-underpants/")
+        # One query for the chain of pages, one for the specific page
+        with self.assertNumQueries(2):
+            page, args, kwargs = homepage._route_by_url_path(
+                request, ["secret-plans", "steal-underpants"]
+            )
+        self.assertEqual(page, steal_underpants)
+        self.assertIsInstance(page, EventPage)
+        self.assertEqual((args, kwargs), ([], {}))
+        self.assertEqual(page.get_parent().url_path, "/home/secret-plans/")
+
+    def test_route_by_url_path_to_unknown_page_returns_404(self):
+        homepage = Page.objects.get(url_path="/home/")
+
+        request = get_dummy_request(path="/secret-plans/quinquagesima/")
+        with self.assertRaises(Http404):
+            homepage._route_by_url_path(request, ["secret-plans", "quinquagesima"])
+        with self.assertRaises(Http404):
+            homepage._route_by_url_path(request, ["quinquagesima", "secret-plans"])
+
+    def test_route_by_url_path_to_unpublished_page_returns_404(self):
+        homepage = Page.objects.get(url_path="/home/")
+
+        request = get_dummy_request(path="/events/tentative-unpublished-event/")
+        with self.assertRaises(Http404):
+            homepage._route_by_url_path(
+                request, ["events", "tentative-unpublished-event"]
+            )
+
+    def test_route_by_url_path_delegates_to_custom_route(self):
+        homepage = Page.objects.get(url_path="/home/")
+
+        # EventIndex overrides route() to handle pagination
+        request = get_dummy_request(path="/events/2/")
+        response = homepage._route_by_url_path(request, ["events", "2"])
+        self.assertEqual(response.status_code, 200)
+
+        # SingleEventPage overrides route() to handle a URL suffix
+        request = get_dummy_request(path="/events/saint-patrick/pointless-suffix/")
+        page, args, kwargs = homepage._route_by_url_path(
+            request, ["events", "saint-patrick", "pointless-suffix"]
+        )
+        self.assertEqual(page.url_path, "/home/events/saint-patrick/")
+
     # Override CACHES so we don't generate any cache-related SQL queries (tests use DatabaseCache
     # otherwise) and so cache.get will always return None.
     @override_settings(
@@ -10,6 +10,7 @@ from django.db.models import Count, Q
 from django.test import TestCase, TransactionTestCase, tag
 
 from wagtail.models import Locale, PageViewRestriction, Site, Workflow
+from wagtail.search.backends import get_search_backend
 from wagtail.search.query import MATCH_ALL
 from wagtail.signals import page_unpublished
 from wagtail.test.testapp.models import (
@@ -514,6 +515,73 @@ class TestPageQuerySet(PageFixturesMixin, TestCase):
             # Check that the event is in the results
             self.assertTrue(pages.filter(id=event.id).exists())
 
+    def test_private_with_multiple_private_sections(self):
+        restricted_pages = [
+            Page.objects.get(url_path="/home/events/"),
+            # Within another private section
+            Page.objects.get(url_path="/home/events/christmas/"),
+            # At the same depth as another private section
+            Page.objects.get(url_path="/home/about-us/"),
+            Page.objects.get(url_path="/home/contact-us/"),
+            Page.objects.get(url_path="/home/secret-plans/steal-underpants/"),
+        ]
+        for page in restricted_pages:
+            PageViewRestriction.objects.create(page=page, password="hello")
+
+        expected_private_ids = set()
+        for restriction in PageViewRestriction.objects.all():
+            expected_private_ids.update(
+                Page.objects.descendant_of(
+                    restriction.page, inclusive=True
+                ).values_list("id", flat=True)
+            )
+
+        self.assertEqual(
+            set(Page.objects.private().values_list("id", flat=True)),
+            expected_private_ids,
+        )
+        self.assertEqual(
+            set(Page.objects.public().values_list("id", flat=True)),
+            set(Page.objects.values_list("id", flat=True)) - expected_private_ids,
+        )
+
+    def test_public_search_with_multiple_private_sections(self):
+        about_us_page = Page.objects.get(url_path="/home/about-us/")
+        PageViewRestriction.objects.create(page=about_us_page, password="hello")
+        PageViewRestriction.objects.create(
+            page=Page.objects.get(url_path="/home/contact-us/"), password="hello"
+        )
+
+        results = Page.objects.public().search("About us")
+        self.assertNotIn(about_us_page, list(results))
+
+    def test_public_queryset_passed_to_search_backend(self):
+        about_us_page = Page.objects.get(url_path="/home/about-us/")
+        PageViewRestriction.objects.create(page=about_us_page, password="hello")
+        PageViewRestriction.objects.create(
+            page=Page.objects.get(url_path="/home/contact-us/"), password="hello"
+        )
+
+        backend = get_search_backend()
+        results = backend.search("About us", Page.objects.live().public())
+        self.assertNotIn(about_us_page, list(results))
+        results = backend.search("About us", Page.objects.private())
+        self.assertIn(about_us_page, list(results))
+
+    def test_descendant_of_paths_q(self):
+        self.assertEqual(
+            Page.objects.descendant_of_paths_q(
+                ["00010002", "000100020001", "00010001", "00010004", "00010005"]
+            ),
+            Q(path__gte="00010001", path__lt="00010003")
+            | Q(path__gte="00010004", path__lt="00010006"),
+        )
+        self.assertEqual(
+            Page.objects.descendant_of_paths_q(["00010001", "000100030001"]),
+            Q(path__startswith="00010001") | Q(path__startswith="000100030001"),
+        )
+        self.assertEqual(Page.objects.descendant_of_paths_q([]), Q(pk__in=[]))
+
     def test_private_with_no_private_page(self):
         PageViewRestriction.objects.all().delete()
 
@@ -1010,6 +1078,25 @@ class TestSpecificQuery(PageFixturesMixin, WagtailTestUtils, TestCase):
                 self.assertTrue(page.feed_image)
                 self.assertFalse(page.feed_image.renditions.all())
 
+    def test_transform_specific_subqueries(self):
+        models = []
+
+        def transform(queryset):
+            models.append(queryset.model)
+            return queryset.select_related("feed_image")
+
+        with self.assertNumQueries(2):
+            pages = list(
+                Page.objects.type(EventPage)
+                .specific()
+                .transform_specific_subqueries(transform)
+            )
+        self.assertEqual(models, [EventPage])
+        self.assertEqual(len(pages), 4)
+        with self.assertNumQueries(0):
+            for page in pages:
+                self.assertTrue(page.feed_image)
+
     def test_specific_query_with_alias(self):
         """
         Ensure alias() works with specific() queries.
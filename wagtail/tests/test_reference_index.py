@@ -1,11 +1,15 @@
+import multiprocessing
 from io import StringIO
 from unittest import mock
 
 from django.contrib.contenttypes.models import ContentType
 from django.core import management
+from django.core.cache import cache
 from django.core.exceptions import FieldDoesNotExist
-from django.db import models
-from django.test import TestCase
+from django.core.management.base import CommandError
+from django.db import connection, connections, models, transaction
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.utils.functional import SimpleLazyObject, lazystr
 
 from wagtail.blocks import StreamValue, StructValue
@@ -13,8 +17,10 @@ from wagtail.documents import get_document_model
 from wagtail.documents.tests.utils import get_test_document_file
 from wagtail.images import get_image_model
 from wagtail.images.tests.utils import get_test_image_file
+from wagtail.management.commands import rebuild_references_index
 from wagtail.models import ReferenceIndex
 from wagtail.rich_text import RichText
+from wagtail.tasks import update_reference_index_batch_task
 from wagtail.test.testapp.models import (
     Advert,
     AdvertWithCustomUUIDPrimaryKey,
@@ -270,6 +276,204 @@ class TestCreateOrUpdateForObject(TestCase):
         refs = ReferenceIndex.get_references_to(self.event_page)
         self.assertEqual(refs.count(), 1)
 
+    def test_create_or_update_for_objects(self):
+        other_event_page = EventPage(
+            title="Other event page",
+            slug="other-event-page",
+            location="the moon",
+            audience="public",
+            cost="free",
+            date_from="2001-01-01",
+            feed_image=self.test_image_2,
+        )
+        self.root_page.add_child(instance=other_event_page)
+        ReferenceIndex.objects.all().delete()
+
+        ReferenceIndex.create_or_update_for_objects(
+            [self.event_page, other_event_page, self.test_image_1]
+        )
+
+        self.assertSetEqual(
+            set(
+                ReferenceIndex.get_references_for_object(self.event_page).values_list(
+                    "to_content_type", "to_object_id", "model_path", "content_path"
+                )
+            ),
+            self.expected_references,
+        )
+        self.assertSetEqual(
+            set(
+                ReferenceIndex.get_references_for_object(other_event_page).values_list(
+                    "to_object_id", "model_path"
+                )
+            ),
+            {(str(self.test_image_2.pk), "feed_image")},
+        )
+
+        # Reindexing unchanged objects looks up the existing references with a
+        # single query, and makes no writes to the index
+        with CaptureQueriesContext(connection) as queries:
+            ReferenceIndex.create_or_update_for_objects(
+                [self.event_page, other_event_page]
+            )
+        self.assertEqual(
+            [
+                query["sql"]
+                for query in queries.captured_queries
+                if "wagtailcore_referenceindex" in query["sql"]
+            ],
+            [queries.captured_queries[0]["sql"]],
+        )
+
+    def test_rebuild_references_index(self):
+        stale_reference = ReferenceIndex.objects.create(
+            base_content_type=ReferenceIndex._get_base_content_type(self.event_page),
+            content_type=ContentType.objects.get_for_model(self.event_page),
+            object_id="999999",  # Page doesn't exist
+            to_content_type=self.image_content_type,
+            to_object_id=self.test_image_1.pk,
+            model_path="feed_image",
+            content_path="feed_image",
+            content_path_hash=ReferenceIndex._get_content_path_hash("feed_image"),
+        )
+        ReferenceIndex.get_references_for_object(self.event_page).delete()
+
+        management.call_command(
+            "rebuild_references_index", chunk_size=1, stdout=StringIO()
+        )
+
+        self.assertFalse(ReferenceIndex.objects.filter(id=stale_reference.id).exists())
+        self.assertSetEqual(
+            set(
+                ReferenceIndex.get_references_for_object(self.event_page).values_list(
+                    "to_content_type", "to_object_id", "model_path", "content_path"
+                )
+            ),
+            self.expected_references,
+        )
+
+    def test_rebuild_references_index_resume(self):
+        ReferenceIndex.get_references_for_object(self.event_page).delete()
+        cache.set(
+            rebuild_references_index.RUN_CACHE_KEY,
+            {
+                "run_id": "interrupted",
+                "tasks": [
+                    ("wagtailcore.Page", None, None),
+                    ("tests.EventPage", None, None),
+                ],
+            },
+        )
+        # Only the EventPage task remains, and it stopped before the event page
+        cache.set(
+            rebuild_references_index.get_checkpoint_key("interrupted", 0),
+            {"after_pk": self.event_page.pk, "done": True},
+        )
+        cache.set(
+            rebuild_references_index.get_checkpoint_key("interrupted", 1),
+            {"after_pk": self.event_page.pk - 1, "done": False},
+        )
+
+        stdout = StringIO()
+        management.call_command("rebuild_references_index", resume=True, stdout=stdout)
+
+        self.assertIn("Resuming run interrupted", stdout.getvalue())
+        self.assertIn("Indexed 1 objects", stdout.getvalue())
+        self.assertSetEqual(
+            set(
+                ReferenceIndex.get_references_for_object(self.event_page).values_list(
+                    "to_content_type", "to_object_id", "model_path", "content_path"
+                )
+            ),
+            self.expected_references,
+        )
+        self.assertIsNone(cache.get(rebuild_references_index.RUN_CACHE_KEY))
+
+    @override_settings(
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+    )
+    def test_rebuild_references_index_resume_requires_shared_cache(self):
+        with self.assertRaisesMessage(
+            CommandError, "--resume requires a default cache that is shared"
+        ):
+            management.call_command(
+                "rebuild_references_index", resume=True, stdout=StringIO()
+            )
+
+    @override_settings(
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+    )
+    def test_rebuild_references_index_without_shared_cache(self):
+        ReferenceIndex.get_references_for_object(self.event_page).delete()
+
+        with mock.patch.object(
+            rebuild_references_index,
+            "iter_index_model_range",
+            wraps=rebuild_references_index.iter_index_model_range,
+        ) as iter_index_model_range:
+            management.call_command("rebuild_references_index", stdout=StringIO())
+
+        # Checkpoints can't be read by a later run, so aren't stored
+        self.assertTrue(iter_index_model_range.call_args_list)
+        for call in iter_index_model_range.call_args_list:
+            self.assertIsNone(call.args[4])
+        self.assertSetEqual(
+            set(
+                ReferenceIndex.get_references_for_object(self.event_page).values_list(
+                    "to_content_type", "to_object_id", "model_path", "content_path"
+                )
+            ),
+            self.expected_references,
+        )
+
+    def test_rebuild_references_index_progress(self):
+        stdout = StringIO()
+        management.call_command("rebuild_references_index", chunk_size=1, stdout=stdout)
+
+        # Each model is listed, with a dot for each chunk indexed
+        self.assertIn(f"{EventPage}\n.", stdout.getvalue())
+
+    def test_rebuild_references_index_with_workers(self):
+        if multiprocessing.current_process().daemon:
+            self.skipTest("Daemonic processes (as used by --parallel) can't fork")
+
+        single_stdout = StringIO()
+        management.call_command("rebuild_references_index", stdout=single_stdout)
+
+        stdout = StringIO()
+        with mock.patch.object(
+            connections, "close_all", wraps=connections.close_all
+        ) as close_all:
+            management.call_command(
+                "rebuild_references_index", workers=2, stdout=stdout
+            )
+
+        # The connections are closed before the worker processes are forked
+        close_all.assert_called_once()
+        # Each primary key range of a model is reported as it is indexed
+        self.assertEqual(stdout.getvalue().count(f"{Page} ("), 2)
+        self.assertEqual(
+            stdout.getvalue().splitlines()[-2],
+            single_stdout.getvalue().splitlines()[-2],
+        )
+
+    def test_rebuild_references_index_tasks_split_by_workers(self):
+        command = rebuild_references_index.Command()
+        page_ids = list(Page.objects.order_by("pk").values_list("pk", flat=True))
+        tasks = [
+            task
+            for task in command.get_tasks(workers=2)
+            if task[0] == "wagtailcore.Page"
+        ]
+        midpoint = page_ids[0] + (page_ids[-1] - page_ids[0]) // 2
+        self.assertEqual(
+            tasks,
+            [
+                ("wagtailcore.Page", None, midpoint),
+                ("wagtailcore.Page", midpoint, None),
+            ],
+        )
+
     def test_rebuild_references_index_no_verbosity(self):
         stdout = StringIO()
         management.call_command(
@@ -313,6 +517,79 @@ class TestCreateOrUpdateForObject(TestCase):
         refs = ReferenceIndex.get_references_to(related_page)
         self.assertEqual(refs.count(), 1)
 
+    @override_settings(WAGTAIL_REFERENCE_INDEX_BATCH_UPDATES=True)
+    def test_batch_updates(self):
+        ReferenceIndex.objects.all().delete()
+
+        with mock.patch(
+            "wagtail.signal_handlers.update_reference_index_batch_task"
+        ) as batch_task:
+            with self.captureOnCommitCallbacks(execute=True):
+                carousel_item = EventPageCarouselItem.objects.create(
+                    page=self.event_page, image=self.test_image_2, sort_order=4
+                )
+                self.event_page.save()
+                advert = AdvertWithCustomUUIDPrimaryKey.objects.create(
+                    text="An advertisement", page=self.event_page
+                )
+
+                # Nothing is enqueued until the transaction is committed
+                batch_task.enqueue.assert_not_called()
+
+        batch_task.enqueue.assert_called_once()
+        objects = batch_task.enqueue.call_args.args[0]
+        self.assertCountEqual(
+            objects,
+            [
+                ["tests", "eventpagecarouselitem", str(carousel_item.pk)],
+                ["tests", "eventpage", str(self.event_page.pk)],
+                ["tests", "advertwithcustomuuidprimarykey", str(advert.pk)],
+            ],
+        )
+
+        update_reference_index_batch_task.call(objects)
+
+        self.assertSetEqual(
+            set(
+                ReferenceIndex.get_references_for_object(self.event_page).values_list(
+                    "to_content_type", "to_object_id", "model_path", "content_path"
+                )
+            ),
+            self.expected_references
+            | {
+                (
+                    self.image_content_type.id,
+                    str(self.test_image_2.pk),
+                    "carousel_items.item.image",
+                    f"carousel_items.{carousel_item.pk}.image",
+                )
+            },
+        )
+        self.assertEqual(ReferenceIndex.get_references_to(self.event_page).count(), 1)
+
+    @override_settings(WAGTAIL_REFERENCE_INDEX_BATCH_UPDATES=True)
+    def test_batch_updates_after_rollback(self):
+        with mock.patch(
+            "wagtail.signal_handlers.update_reference_index_batch_task"
+        ) as batch_task:
+            with self.captureOnCommitCallbacks(execute=True):
+                try:
+                    with transaction.atomic():
+                        AdvertWithCustomUUIDPrimaryKey.objects.create(
+                            text="A rolled back advertisement", page=self.event_page
+                        )
+                        raise ValueError
+                except ValueError:
+                    pass
+
+                advert = AdvertWithCustomUUIDPrimaryKey.objects.create(
+                    text="An advertisement", page=self.event_page
+                )
+
+        batch_task.enqueue.assert_called_once_with(
+            [["tests", "advertwithcustomuuidprimarykey", str(advert.pk)]]
+        )
+
 
 class TestDescribeOnDelete(PageFixturesMixin, TestCase):
     fixtures = ["test.json"]
@@ -0,0 +1,149 @@
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+
+from wagtail.coreutils import get_dummy_request
+from wagtail.models import Site
+from wagtail.test.routablepage.models import RoutablePageTest
+from wagtail.test.testapp.models import SimplePage
+from wagtail.test.utils import Page
+
+
+@override_settings(
+    WAGTAIL_ROUTE_CACHE="routes",
+    CACHES={
+        "default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+        "routes": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "wagtail-route-cache-tests",
+        },
+    },
+)
+class TestRouteCache(TestCase):
+    def setUp(self):
+        caches["routes"].clear()
+        self.site = Site.objects.get(is_default_site=True)
+        self.home_page = self.site.root_page
+        self.section = self.home_page.add_child(
+            instance=SimplePage(title="Section", slug="section", content="hello")
+        )
+        self.article = self.section.add_child(
+            instance=SimplePage(title="Article", slug="article", content="hello")
+        )
+
+    def get_request(self, path):
+        request = get_dummy_request(path=path, site=self.site)
+        # Resolve the site up-front so that it isn't counted in query counts
+        Site.find_for_request(request)
+        return request
+
+    def route(self, path):
+        return Page.route_for_request(self.get_request(path), path)
+
+    def test_route_is_cached(self):
+        request = self.get_request("/section/article/")
+        with self.assertNumQueries(2):
+            page, args, kwargs = Page.route_for_request(request, request.path)
+        self.assertEqual(page, self.article)
+        self.assertIsInstance(page, SimplePage)
+
+        # Only the page itself needs to be fetched
+        request = self.get_request("/section/article/")
+        with self.assertNumQueries(1):
+            page, args, kwargs = Page.route_for_request(request, request.path)
+        self.assertEqual(page, self.article)
+        self.assertIsInstance(page, SimplePage)
+        self.assertEqual((args, kwargs), ([], {}))
+
+    def test_404_is_cached(self):
+        self.assertIsNone(self.route("/section/does-not-exist/"))
+
+        request = self.get_request("/section/does-not-exist/")
+        with self.assertNumQueries(0):
+            self.assertIsNone(Page.route_for_request(request, request.path))
+
+    def test_publish_invalidates_404(self):
+        draft = self.section.add_child(
+            instance=SimplePage(
+                title="Draft", slug="draft", content="hello", live=False
+            )
+        )
+        self.assertIsNone(self.route("/section/draft/"))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            draft.save_revision().publish()
+
+        self.assertEqual(self.route("/section/draft/")[0], draft)
+
+    def test_unpublish_invalidates_route(self):
+        self.assertEqual(self.route("/section/article/")[0], self.article)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.article.unpublish(user=None)
+
+        self.assertIsNone(self.route("/section/article/"))
+
+    def test_move_invalidates_route(self):
+        other_section = self.home_page.add_child(
+            instance=SimplePage(title="Other", slug="other", content="hello")
+        )
+        self.assertEqual(self.route("/section/article/")[0], self.article)
+        self.assertIsNone(self.route("/other/article/"))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.article.move(other_section, pos="last-child")
+
+        self.assertIsNone(self.route("/section/article/"))
+        self.assertEqual(self.route("/other/article/")[0], self.article)
+
+    def test_delete_invalidates_route(self):
+        self.assertEqual(self.route("/section/article/")[0], self.article)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.section.delete()
+
+        self.assertIsNone(self.route("/section/article/"))
+
+    def test_stale_entry_is_disregarded(self):
+        self.assertEqual(self.route("/section/article/")[0], self.article)
+
+        # Change the slug without triggering any signals
+        Page.objects.filter(pk=self.article.pk).update(
+            slug="renamed", url_path="/home/section/renamed/"
+        )
+
+        self.assertIsNone(self.route("/section/article/"))
+        self.assertEqual(self.route("/section/renamed/")[0], self.article)
+
+    def test_site_change_clears_cache(self):
+        self.assertEqual(self.route("/article/"), None)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.site.root_page = self.section
+            self.site.save()
+
+        self.assertEqual(self.route("/article/")[0], self.article)
+
+    def test_routable_page(self):
+        routable_page = self.section.add_child(
+            instance=RoutablePageTest(title="Routable", slug="routable")
+        )
+
+        page, args, kwargs = self.route("/section/routable/archive/year/2014/")
+        self.assertEqual(page, routable_page)
+        view, view_args, view_kwargs = args
+        self.assertEqual(view.__func__, RoutablePageTest.archive_by_year)
+        self.assertEqual((view_args, view_kwargs), (("2014",), {}))
+
+        # The remaining path components are passed on to the page's route()
+        # method from the cached entry
+        request = self.get_request("/section/routable/archive/year/2014/")
+        with self.assertNumQueries(1):
+            page, args, kwargs = Page.route_for_request(request, request.path)
+        self.assertEqual(page, routable_page)
+        view, view_args, view_kwargs = args
+        self.assertEqual(view.__func__, RoutablePageTest.archive_by_year)
+        self.assertEqual((view_args, view_kwargs), (("2014",), {}))
+        self.assertEqual(
+            request.routable_resolver_match.func.__func__,
+            RoutablePageTest.archive_by_year,
+        )
@@ -288,3 +288,76 @@ class TestGetSiteRootPaths(TestCase):
         # Followed by entries for others in 'host' alphabetical order
         self.assertEqual(result[1][0], self.abc_site.id)
         self.assertEqual(result[2][0], self.def_site.id)
+
+
+@override_settings(WAGTAIL_SITE_RESOLUTION_CACHE=True)
+class TestSiteResolutionCache(TestCase):
+    def setUp(self):
+        self.default_site = Site.objects.get()
+        self.events_site = Site.objects.create(
+            hostname="events.example.com", root_page=Page.objects.get(pk=2)
+        )
+        self.alternate_port_events_site = Site.objects.create(
+            hostname="events.example.com", port=8765, root_page=Page.objects.get(pk=2)
+        )
+        self.about_site = Site.objects.create(
+            hostname="about.example.com", root_page=Page.objects.get(pk=2)
+        )
+
+    def find_site(self, hostname, port):
+        request = get_dummy_request()
+        request.META.update({"SERVER_NAME": hostname, "SERVER_PORT": port})
+        return Site.find_for_request(request)
+
+    def test_precedence(self):
+        self.assertEqual(self.find_site("events.example.com", 80), self.events_site)
+        self.assertEqual(
+            self.find_site("events.example.com", 8765),
+            self.alternate_port_events_site,
+        )
+        # Unrecognised port on an ambiguous hostname falls back to the default site
+        self.assertEqual(self.find_site("events.example.com", 8000), self.default_site)
+        # Unrecognised port on an unambiguous hostname routes to that hostname
+        self.assertEqual(self.find_site("about.example.com", 8000), self.about_site)
+        self.assertEqual(self.find_site("unknown.example.com", 80), self.default_site)
+        self.assertEqual(
+            self.find_site(self.default_site.hostname, 8000), self.default_site
+        )
+
+    def test_matches_database_lookup(self):
+        for hostname in ["events.example.com", "about.example.com", "unknown.com"]:
+            for port in [80, 8000, 8765]:
+                with self.subTest(hostname=hostname, port=port):
+                    with self.settings(WAGTAIL_SITE_RESOLUTION_CACHE=False):
+                        expected = self.find_site(hostname, port)
+                    self.assertEqual(self.find_site(hostname, port), expected)
+
+    def test_no_site_queries_once_built(self):
+        self.find_site("events.example.com", 80)
+        with self.assertNumQueries(1):
+            # Only the shared generation token is fetched from the cache
+            self.assertEqual(self.find_site("about.example.com", 80), self.about_site)
+
+    def test_no_default_site(self):
+        self.default_site.delete()
+        self.assertIsNone(self.find_site("unknown.example.com", 80))
+        # Ambiguous hostname matches without a default site cannot be resolved
+        self.assertIsNone(self.find_site("events.example.com", 8000))
+        self.assertEqual(self.find_site("about.example.com", 8000), self.about_site)
+
+    def test_invalidated_on_site_save(self):
+        self.assertEqual(self.find_site("new.example.com", 80), self.default_site)
+        new_site = Site.objects.create(
+            hostname="new.example.com", root_page=Page.objects.get(pk=2)
+        )
+        self.assertEqual(self.find_site("new.example.com", 80), new_site)
+
+        new_site.hostname = "renamed.example.com"
+        new_site.save()
+        self.assertEqual(self.find_site("new.example.com", 80), self.default_site)
+        self.assertEqual(self.find_site("renamed.example.com", 80), new_site)
+
+    def test_invalidated_on_site_delete(self):
+        self.assertEqual(self.find_site("about.example.com", 80), self.about_site)
+        self.about_site.delete()
+        self.assertEqual(self.find_site("about.example.com", 80), self.default_site)
@@ -182,6 +182,66 @@ class TestLazyStreamField(TestCase):
             with self.assertNumQueries(1):
                 instance.save()
 
+    def test_bulk_prefetch_blocks(self):
+        """
+        StreamValue.bulk_prefetch_blocks should fetch the images for all of
+        the given values in a single query
+        """
+        with self.assertNumQueries(1):
+            instances = list(self.model.objects.order_by("pk"))
+
+        with self.assertNumQueries(1):
+            StreamValue.bulk_prefetch_blocks([instance.body for instance in instances])
+
+        with self.assertNumQueries(0):
+            self.assertEqual(instances[0].body[0].value, self.image)
+            self.assertEqual(instances[0].body[1].value, "foo")
+            self.assertEqual(instances[1].body[0].value, "foo")
+            self.assertEqual(instances[2].body[1].value, self.image)
+            self.assertEqual(instances[2].body[2].value, "bar")
+            # Each stream should get its own instance of the image
+            self.assertIsNot(instances[0].body[0].value, instances[2].body[1].value)
+
+    def test_bulk_prefetch_blocks_skips_bound_blocks(self):
+        instance = self.model.objects.get(pk=self.three_items.pk)
+        instance.body[1] = ("image", None)
+
+        with self.assertNumQueries(0):
+            StreamValue.bulk_prefetch_blocks([instance.body, None])
+
+        self.assertIsNone(instance.body[1].value)
+        self.assertEqual(instance.body[2].value, "bar")
+
+    def test_prefetch_streamfield_references(self):
+        home_page = Page.objects.get(url_path="/home/")
+        for i in range(3):
+            home_page.add_child(
+                instance=StreamPage(
+                    title=f"Stream page {i}",
+                    body=[("image", self.image), ("text", f"Page {i}")],
+                )
+            )
+
+        pages = (
+            home_page.get_children().specific().prefetch_streamfield_references("body")
+        )
+
+        # One query for the pages, one for the specific StreamPages,
+        # and one for the images referenced by all of the pages
+        with self.assertNumQueries(3):
+            pages = list(pages)
+
+        with self.assertNumQueries(0):
+            for i, page in enumerate(pages):
+                self.assertEqual(page.body[0].value, self.image)
+                self.assertEqual(page.body[1].value, f"Page {i}")
+
+    def test_prefetch_streamfield_references_cleared(self):
+        queryset = Page.objects.prefetch_streamfield_references("body", "content")
+        self.assertEqual(queryset._prefetch_streamfield_names, ("body", "content"))
+        queryset = queryset.prefetch_streamfield_references(None)
+        self.assertEqual(queryset._prefetch_streamfield_names, ())
+
 
 class TestSystemCheck(TestCase):
     def tearDown(self):
@@ -4,11 +4,13 @@ import pickle
 import tempfile
 import unittest
 from io import BytesIO
+from unittest import mock
 
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ImproperlyConfigured, SuspiciousOperation
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import transaction
 from django.test import SimpleTestCase, TestCase, override_settings
 from django.utils.text import slugify
 from django.utils.translation import _trans
@@ -25,6 +27,7 @@ from wagtail.coreutils import (
     get_dummy_request,
     get_supported_content_language_variant,
     multigetattr,
+    on_commit_once,
     safe_snake_case,
     string_to_ascii,
 )
@@ -491,6 +494,43 @@ class TestGetDummyRequest(TestCase):
             self.assertEqual(request.get_host(), "example.com")
 
 
+class TestOnCommitOnce(TestCase):
+    def test_called_once_per_transaction(self):
+        callback = mock.Mock()
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self.assertIs(on_commit_once("test", callback), True)
+            self.assertIs(on_commit_once("test", callback), False)
+            self.assertIs(on_commit_once("other", callback), True)
+
+        self.assertEqual(len(callbacks), 2)
+        self.assertEqual(callback.call_count, 2)
+
+        # The next transaction registers the callback again
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self.assertIs(on_commit_once("test", callback), True)
+
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(callback.call_count, 3)
+
+    def test_registered_again_after_rollback(self):
+        callback = mock.Mock()
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            try:
+                with transaction.atomic():
+                    self.assertIs(on_commit_once("test", callback), True)
+                    raise ValueError
+            except ValueError:
+                pass
+
+            self.assertIs(on_commit_once("test", callback), True)
+            self.assertIs(on_commit_once("test", callback), False)
+
+        self.assertEqual(len(callbacks), 1)
+        callback.assert_called_once()
+
+
 class TestDeepUpdate(TestCase):
     def test_deep_update(self):
         val = {
@@ -0,0 +1,231 @@
+from unittest import mock
+
+from django.contrib.auth.models import Group
+from django.test import TestCase, override_settings
+
+from wagtail import view_restriction_table
+from wagtail.coreutils import pending_on_commit_once
+from wagtail.models import PageViewRestriction
+from wagtail.test.utils import Page
+from wagtail.tests import test_page_privacy
+from wagtail.view_restriction_table import get_view_restriction_table
+
+
+@override_settings(WAGTAIL_VIEW_RESTRICTION_CACHE=True)
+class TestPagePrivacyWithViewRestrictionCache(test_page_privacy.TestPagePrivacy):
+    def test_unrestricted_page_has_no_restriction_queries(self):
+        page = Page.objects.get(url_path="/home/events/")
+        get_view_restriction_table()
+
+        # Only the version of the table is fetched from the cache
+        with self.assertNumQueries(1):
+            self.assertEqual(get_view_restriction_table().get_restrictions(page), [])
+
+
+@override_settings(WAGTAIL_VIEW_RESTRICTION_CACHE=True)
+class TestViewRestrictionTable(TestCase):
+    fixtures = ["test.json"]
+
+    def setUp(self):
+        # The invalidation queued while loading the fixtures is never committed
+        pending_on_commit_once.callbacks = {}
+
+        self.secret_plans_page = Page.objects.get(url_path="/home/secret-plans/")
+        self.underpants_page = Page.objects.get(
+            url_path="/home/secret-plans/steal-underpants/"
+        )
+        self.events_page = Page.objects.get(url_path="/home/events/")
+        self.view_restriction = PageViewRestriction.objects.get(
+            page=self.secret_plans_page
+        )
+
+    def assertRestrictionsMatch(self, page):
+        self.assertEqual(
+            get_view_restriction_table().get_restrictions(page),
+            list(page.get_view_restrictions().order_by("pk")),
+        )
+
+    def test_get_restrictions(self):
+        table = get_view_restriction_table()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(
+                table.get_restrictions(self.secret_plans_page),
+                [self.view_restriction],
+            )
+            self.assertEqual(
+                table.get_restrictions(self.underpants_page), [self.view_restriction]
+            )
+            self.assertEqual(table.get_restrictions(self.events_page), [])
+
+    def test_get_restrictions_with_groups(self):
+        page = Page.objects.get(url_path="/home/secret-event-editor-plans/")
+        group = Group.objects.get(name="Event editors")
+        (restriction,) = get_view_restriction_table().get_restrictions(page)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(list(restriction.groups.all()), [group])
+
+    def test_get_restrictions_of_nested_restrictions(self):
+        restriction = PageViewRestriction.objects.create(
+            page=self.underpants_page, restriction_type=PageViewRestriction.LOGIN
+        )
+
+        self.assertEqual(
+            get_view_restriction_table().get_restrictions(self.underpants_page),
+            [self.view_restriction, restriction],
+        )
+        self.assertRestrictionsMatch(self.underpants_page)
+
+    def test_get_restrictions_of_aliases(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            alias_page = self.secret_plans_page.create_alias(update_slug="alias")
+            alias_page = Page.objects.get(pk=alias_page.pk)
+            alias_of_alias_page = alias_page.create_alias(update_slug="alias-of-alias")
+            underpants_alias_page = self.underpants_page.create_alias(parent=alias_page)
+            # Restrictions on an alias page are ignored
+            PageViewRestriction.objects.create(
+                page=alias_page, restriction_type=PageViewRestriction.LOGIN
+            )
+
+        for page in [alias_page, alias_of_alias_page, underpants_alias_page]:
+            with self.subTest(page=page):
+                self.assertEqual(
+                    get_view_restriction_table().get_restrictions(page),
+                    [self.view_restriction],
+                )
+                self.assertRestrictionsMatch(page)
+
+    def test_get_view_restrictions_of_alias_of_alias(self):
+        alias_page = self.secret_plans_page.create_alias(update_slug="alias")
+        alias_of_alias_page = alias_page.create_alias(update_slug="alias-of-alias")
+        underpants_alias_page = self.underpants_page.create_alias(
+            parent=alias_of_alias_page
+        )
+
+        # One query for the ancestors, then one per level of aliasing
+        with self.assertNumQueries(3):
+            restrictions = underpants_alias_page.get_view_restrictions()
+        self.assertEqual(list(restrictions), [self.view_restriction])
+
+    def test_create_restriction_invalidates_table(self):
+        get_view_restriction_table()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            restriction = PageViewRestriction.objects.create(
+                page=self.events_page, restriction_type=PageViewRestriction.LOGIN
+            )
+
+        self.assertEqual(
+            get_view_restriction_table().get_restrictions(self.events_page),
+            [restriction],
+        )
+
+    def test_delete_restriction_invalidates_table(self):
+        get_view_restriction_table()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.view_restriction.delete()
+
+        self.assertEqual(
+            get_view_restriction_table().get_restrictions(self.underpants_page), []
+        )
+
+    def test_change_groups_invalidates_table(self):
+        restriction = PageViewRestriction.objects.get(
+            page__url_path="/home/secret-event-editor-plans/"
+        )
+        group = Group.objects.create(name="Plotters")
+        get_view_restriction_table()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            restriction.groups.add(group)
+
+        (cached_restriction,) = get_view_restriction_table().get_restrictions(
+            restriction.page
+        )
+        self.assertIn(group, cached_restriction.groups.all())
+
+    def test_move_invalidates_table(self):
+        get_view_restriction_table()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.events_page.move(self.secret_plans_page, pos="last-child")
+
+        self.events_page.refresh_from_db()
+        self.assertEqual(
+            get_view_restriction_table().get_restrictions(self.events_page),
+            [self.view_restriction],
+        )
+
+    def test_create_alias_invalidates_table(self):
+        get_view_restriction_table()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            alias_page = self.secret_plans_page.create_alias(update_slug="alias")
+
+        self.assertEqual(
+            get_view_restriction_table().get_restrictions(alias_page),
+            [self.view_restriction],
+        )
+
+    def test_convert_alias_invalidates_table(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            alias_page = self.secret_plans_page.create_alias(update_slug="alias")
+        get_view_restriction_table()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            alias_page.alias_of = None
+            alias_page.save()
+
+        # The restrictions copied to the alias now apply instead
+        self.assertEqual(
+            get_view_restriction_table().get_restrictions(alias_page),
+            list(alias_page.view_restrictions.all()),
+        )
+        self.assertRestrictionsMatch(alias_page)
+
+    def test_save_unrestricted_page_does_not_invalidate_table(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            events_alias_page = self.events_page.create_alias(update_slug="alias")
+        table = get_view_restriction_table()
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self.events_page.save()
+            events_alias_page.save()
+            self.secret_plans_page.save()
+
+        self.assertEqual(callbacks, [])
+        self.assertIs(get_view_restriction_table(), table)
+
+    def test_invalidation_once_per_transaction(self):
+        version = view_restriction_table.get_view_restriction_version()
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self.view_restriction.save()
+            self.view_restriction.save()
+
+        self.assertEqual(len(callbacks), 1)
+        self.assertNotEqual(
+            view_restriction_table.get_view_restriction_version(), version
+        )
+
+    @override_settings(WAGTAIL_VIEW_RESTRICTION_CACHE=False)
+    def test_disabled(self):
+        with mock.patch.object(
+            view_restriction_table, "ViewRestrictionTable"
+        ) as table_class:
+            self.client.get("/secret-plans/")
+            self.secret_plans_page.create_alias(update_slug="alias")
+
+        table_class.assert_not_called()
+
+    @override_settings(WAGTAIL_VIEW_RESTRICTION_CACHE=False)
+    def test_restriction_changes_dont_invalidate_table_when_disabled(self):
+        version = view_restriction_table.get_view_restriction_version()
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self.view_restriction.delete()
+
+        self.assertEqual(callbacks, [])
+        self.assertEqual(view_restriction_table.get_view_restriction_version(), version)
@@ -1,3 +1,10 @@
+import hashlib
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+
+
 class RouteResult:
     """
     An object to be returned from Page.route, which encapsulates
@@ -14,3 +21,131 @@ class RouteResult:
 
     def __getitem__(self, index):
         return (self.page, self.args, self.kwargs)[index]
+
+
+class RouteCache:
+    """
+    A shared cache of page routes, mapping a (site, root page, path) triple to
+    the page that handles it, or to a 404. Where the page handling the path
+    implements its own ``route()`` method (such as ``RoutablePageMixin``), the
+    remaining path components are stored so that they can be passed to it.
+
+    Entries are invalidated by ``url_path`` subtree: each entry records a
+    generation token for every prefix of the ``url_path`` it resolved to, and
+    is discarded when any of those tokens has changed since it was stored.
+    Invalidating the ``"/"`` prefix therefore invalidates every entry.
+    """
+
+    ROUTE_KEY_PREFIX = "wagtail-route-"
+    GENERATION_KEY_PREFIX = "wagtail-route-generation-"
+
+    def __init__(self, cache):
+        self.cache = cache
+
+    @classmethod
+    def get_for_settings(cls):
+        """
+        Return a ``RouteCache`` for the cache alias configured in the
+        ``WAGTAIL_ROUTE_CACHE`` setting, or ``None`` if it is not configured.
+        """
+        alias = getattr(settings, "WAGTAIL_ROUTE_CACHE", None)
+        if not alias:
+            return None
+        return cls(caches[alias])
+
+    @staticmethod
+    def _hash(value):
+        return hashlib.sha1(value.encode(), usedforsecurity=False).hexdigest()
+
+    def get_route_key(self, site_id, root_page_id, path_components):
+        path = "/".join(path_components)
+        return self.ROUTE_KEY_PREFIX + self._hash(f"{site_id}:{root_page_id}:{path}")
+
+    def get_generation_keys(self, url_path):
+        """
+        Return the generation cache keys for every prefix of the given
+        ``url_path``, starting with ``"/"``.
+        """
+        keys = [self.GENERATION_KEY_PREFIX + self._hash("/")]
+        prefix = "/"
+        for component in url_path.strip("/").split("/"):
+            if component:
+                prefix += component + "/"
+                keys.append(self.GENERATION_KEY_PREFIX + self._hash(prefix))
+        return keys
+
+    def get_generations(self, url_path):
+        """
+        Return the current generation tokens for every prefix of the given
+        ``url_path``, creating any that are missing.
+        """
+        keys = self.get_generation_keys(url_path)
+        generations = self.cache.get_many(keys)
+        for key in keys:
+            if key not in generations:
+                token = uuid.uuid4().hex
+                if not self.cache.add(key, token, None):
+                    token = self.cache.get(key, token)
+                generations[key] = token
+        return tuple(generations[key] for key in keys)
+
+    def get(self, site_id, root_page_id, path_components):
+        """
+        Return the cached entry for the given path as a
+        ``(page_id, content_type_id, url_path, remaining_components)`` tuple,
+        where ``page_id`` is ``None`` if the path is known to resolve to a 404.
+        Returns ``None`` if there is no valid entry for the path.
+        """
+        entry = self.cache.get(
+            self.get_route_key(site_id, root_page_id, path_components)
+        )
+        if entry is None:
+            return None
+
+        page_id, content_type_id, url_path, remaining_components, generations = entry
+        keys = self.get_generation_keys(url_path)
+        current_generations = self.cache.get_many(keys)
+        if generations != tuple(current_generations.get(key) for key in keys):
+            return None
+
+        return page_id, content_type_id, url_path, remaining_components
+
+    def set(
+        self,
+        site_id,
+        root_page_id,
+        path_components,
+        url_path,
+        page_id=None,
+        content_type_id=None,
+        remaining_components=(),
+    ):
+        """
+        Store the route for the given path. ``url_path`` is the ``url_path``
+        of the page that the path resolved to, or that it would have resolved
+        to in the case of a 404 (where ``page_id`` is ``None``).
+        """
+        self.cache.set(
+            self.get_route_key(site_id, root_page_id, path_components),
+            (
+                page_id,
+                content_type_id,
+                url_path,
+                tuple(remaining_components),
+                self.get_generations(url_path),
+            ),
+        )
+
+    def invalidate(self, url_path):
+        """
+        Invalidate all cached routes to the given ``url_path`` and its
+        descendants.
+        """
+        key = self.get_generation_keys(url_path)[-1]
+        self.cache.set(key, uuid.uuid4().hex, None)
+
+    def clear(self):
+        """
+        Invalidate all cached routes.
+        """
+        self.invalidate("/")
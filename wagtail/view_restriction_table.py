@@ -0,0 +1,134 @@
+import threading
+import uuid
+from collections import defaultdict
+
+from django.core.cache import cache
+
+from wagtail.coreutils import on_commit_once
+
+# Cache key for the version of the page view restrictions, which is changed
+# whenever a restriction is changed or a page is moved or deleted
+VERSION_CACHE_KEY = "wagtail-view-restriction-table-version"
+
+
+class ViewRestrictionTable:
+    """
+    All page view restrictions held in memory, keyed by the path of the page
+    they apply to, so that the restrictions for a page can be found from its
+    path without querying the database.
+
+    As with ``Page.get_view_restrictions``, an alias page uses the
+    restrictions of its source page (and any restrictions on the alias page
+    itself are ignored), so each alias of a restricted page is also included
+    under its own path.
+
+    Every restriction is also listed in ``restricted_page_paths`` along with
+    the path of the page it is defined on, whether or not that page is an
+    alias.
+    """
+
+    def __init__(self, version):
+        from wagtail.models import Page, PageViewRestriction
+
+        self.version = version
+
+        restrictions_by_page_id = defaultdict(list)
+        for restriction in PageViewRestriction.objects.prefetch_related("groups"):
+            restrictions_by_page_id[restriction.page_id].append(restriction)
+
+        self.restricted_page_paths = []
+        self.restrictions_by_path = {}
+        # The ids of the pages in restrictions_by_path
+        self.page_ids = set()
+        # The pages in restrictions_by_path that are aliases, mapped to the id
+        # of the page they are an alias of
+        self.alias_of_ids_by_path = {}
+
+        # Pages to find aliases of, mapped to the id of their source page
+        source_page_ids = {}
+        for page_id, alias_of_id, path in Page.objects.filter(
+            id__in=restrictions_by_page_id
+        ).values_list("id", "alias_of_id", "path"):
+            for restriction in restrictions_by_page_id[page_id]:
+                self.restricted_page_paths.append((restriction, path))
+
+            if alias_of_id is None:
+                self.restrictions_by_path[path] = restrictions_by_page_id[page_id]
+                self.page_ids.add(page_id)
+                source_page_ids[page_id] = page_id
+
+        # Aliases may themselves have aliases, so repeat until none are left
+        while source_page_ids:
+            alias_source_page_ids = {}
+            for page_id, alias_of_id, path in Page.objects.filter(
+                alias_of_id__in=source_page_ids
+            ).values_list("id", "alias_of_id", "path"):
+                if path in self.restrictions_by_path:
+                    continue
+                source_page_id = source_page_ids[alias_of_id]
+                self.restrictions_by_path[path] = restrictions_by_page_id[
+                    source_page_id
+                ]
+                self.page_ids.add(page_id)
+                self.alias_of_ids_by_path[path] = alias_of_id
+                alias_source_page_ids[page_id] = source_page_id
+            source_page_ids = alias_source_page_ids
+
+    def get_restrictions(self, page):
+        """
+        Return a list of the view restrictions that apply to the given page,
+        from the page itself and each of its ancestors.
+        """
+        if not self.restrictions_by_path:
+            return []
+
+        restrictions = {}
+        for end in range(page.steplen, len(page.path) + 1, page.steplen):
+            for restriction in self.restrictions_by_path.get(page.path[:end], ()):
+                restrictions[restriction.pk] = restriction
+        return [restrictions[pk] for pk in sorted(restrictions)]
+
+
+_view_restriction_table = None
+_view_restriction_table_lock = threading.Lock()
+
+
+def get_view_restriction_version():
+    version = cache.get(VERSION_CACHE_KEY)
+    if version is None:
+        version = uuid.uuid4().hex
+        if not cache.add(VERSION_CACHE_KEY, version, None):
+            # Another process has just set the version
+            version = cache.get(VERSION_CACHE_KEY, version)
+    return version
+
+
+def get_view_restriction_table():
+    """
+    Return the ``ViewRestrictionTable`` for the current version of the page
+    view restrictions, loading it if they have changed since it was last
+    loaded by this process.
+    """
+    global _view_restriction_table
+
+    version = get_view_restriction_version()
+    table = _view_restriction_table
+    if table is None or table.version != version:
+        with _view_restriction_table_lock:
+            table = _view_restriction_table
+            if table is None or table.version != version:
+                table = _view_restriction_table = ViewRestrictionTable(version)
+    return table
+
+
+def invalidate_view_restriction_table():
+    """
+    Change the version of the page view restrictions once the current
+    transaction is committed, so that each process reloads its
+    ``ViewRestrictionTable``.
+    """
+    on_commit_once("wagtail-view-restriction-table-invalidation", _set_new_version)
+
+
+def _set_new_version():
+    cache.set(VERSION_CACHE_KEY, uuid.uuid4().hex, None)
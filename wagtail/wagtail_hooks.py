@@ -18,6 +18,7 @@ from wagtail.log_actions import LogFormatter
 from wagtail.models import ModelLogEntry, PageLogEntry, PageViewRestriction
 from wagtail.rich_text.pages import PageLinkHandler
 from wagtail.utils.timestamps import parse_datetime_localized, render_timestamp
+from wagtail.view_restriction_table import get_view_restriction_table
 
 if TYPE_CHECKING:
     from django.http import HttpRequest
@@ -42,7 +43,10 @@ def check_view_restrictions(callback):
         include a password / login form that will allow them to proceed). If
         there are no such restrictions, return None
         """
-        restrictions = page.get_view_restrictions()
+        if getattr(settings, "WAGTAIL_VIEW_RESTRICTION_CACHE", False):
+            restrictions = get_view_restriction_table().get_restrictions(page)
+        else:
+            restrictions = page.get_view_restrictions()
         response = None
         for restriction in restrictions:
             if not restriction.accept_request(request):